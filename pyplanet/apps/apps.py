@@ -3,9 +3,11 @@ import logging
 
 from collections import OrderedDict
 
+from pyplanet.conf import settings
 from pyplanet.utils.toposort import toposort
 from pyplanet.apps.config import AppConfig, AppState
 from pyplanet.core.exceptions import ImproperlyConfigured
+from pyplanet.core.startup import run_graph
 
 
 class Apps:
@@ -29,6 +31,11 @@ class Apps:
 		self.apps = OrderedDict()
 		self.unloaded_apps = OrderedDict()
 
+		# Dependencies of the apps, used to start the apps concurrently when they don't depend on each other. The apps
+		# populated in order (the core apps) depend on the app before, all other apps depend on the last ordered app.
+		self.dependencies = dict()
+		self._last_ordered = None
+
 		# Set ready states.
 		self.apps_ready = self.ready = False
 
@@ -75,11 +82,15 @@ class Apps:
 			# Add to the list so it can get ordered by dependencies. (not if in_order is true).
 			if in_order:
 				self.apps[app.label] = app
+				if app.label not in self.dependencies:
+					self.dependencies[app.label] = [self._last_ordered] if self._last_ordered else []
+					self._last_ordered = app.label
 			else:
 				populated_apps[app.label] = app
 
 				# Add nodes of dependencies.
 				dep_dict[app.label] = deps
+				self.dependencies[app.label] = deps + ([self._last_ordered] if self._last_ordered else [])
 
 		if in_order:
 			return
@@ -177,18 +188,50 @@ class Apps:
 		for label, app in self.apps.items():
 			await app.on_init()
 
+	def get_dependency_graph(self):
+		"""
+		Get the dependency graph of the loaded apps. Dependencies on apps that aren't loaded (anymore) are replaced by the
+		dependencies of that app, so the order between the remaining apps is kept.
+
+		:return: Ordered adjacency dict with the app labels.
+		:rtype: collections.OrderedDict
+		"""
+		def resolve(label, seen):
+			if label in self.apps:
+				return {label}
+			if label in seen:
+				return set()
+			seen.add(label)
+			resolved = set()
+			for dependency in self.dependencies.get(label, list()):
+				resolved |= resolve(dependency, seen)
+			return resolved
+
+		graph = OrderedDict()
+		for label in self.apps:
+			graph[label] = list()
+			for dependency in self.dependencies.get(label, list()):
+				graph[label].extend(resolve(dependency, set()) - {label})
+		return graph
+
 	async def start(self):
 		"""
-		This method will start all apps that are previously initiated.
+		This method will start all apps that are previously initiated. Apps that don't depend on each other are started
+		concurrently (unless disabled with the ``CONCURRENT_STARTUP`` setting).
 		"""
 		if self.apps_ready:
 			raise Exception('Apps are not yet ordered!')
 
-		# The apps are in order, lets loop over them.
-		for label, app in self.apps.items():
+		async def start_app(label):
+			app = self.apps[label]
 			await app.on_start()
 			app.state = AppState.LOADED
 			logging.debug('App is ready: {}'.format(label))
+
+		await run_graph(
+			self.get_dependency_graph(), start_app, concurrent=settings.CONCURRENT_STARTUP,
+			timeline=self.instance.startup_timeline, prefix='apps.'
+		)
 		logging.info('Apps successfully started!')
 
 	async def stop(self):
@@ -198,6 +241,7 @@ class Apps:
 		for label, app in reversed(self.apps.items()):
 			if app.state == AppState.LOADED:
 				await app.on_stop()
+				app.context.scheduler.cancel_all()
 				logging.debug('Stopped app {}'.format(label))
 		logging.info('Apps successfully stopped!')
 
@@ -4,6 +4,7 @@ import logging
 import os
 
 from pyplanet.core.exceptions import ImproperlyConfigured, InvalidAppModule
+from pyplanet.core.scheduler import AppScheduler
 
 
 class _AppContext:
@@ -34,9 +35,16 @@ class _AppContext:
 		Signal manager. See :doc:`Signal Manager </api/core_events>`.
 		"""
 
+		self.scheduler = AppScheduler(app.instance, app)
+		"""
+		Scheduler of the delayed and recurring jobs of the app, the jobs are cancelled when the app stops.
+		See :doc:`Scheduler </api/core_scheduler>`.
+		"""
+
 	async def on_destroy(self):
 		await self.ui.on_destroy()
 		await self.signals.on_destroy()
+		await self.scheduler.on_destroy()
 
 
 class AppState:
@@ -26,7 +26,7 @@ class Ads(AppConfig):
 		self.discord_join_url = None
 		self.discord_server_id = None
 
-		self.random_future = None
+		self.random_job = None
 		self.random_last_message = None
 
 		# Initiate settings.
@@ -93,12 +93,9 @@ class Ads(AppConfig):
 			self.setting_random_messages_interval,
 		)
 
-		# Force reload of settings.
+		# Force reload of settings (and schedule the random messages).
 		await self.reload_settings()
 
-		# Random Messages Loop.
-		self.random_future = asyncio.ensure_future(self.random_messages_loop())
-
 		# Call the display method.
 		await self.display()
 
@@ -158,23 +155,29 @@ class Ads(AppConfig):
 		await self.hide_all()
 		await self.display()
 
-	async def random_messages_loop(self):
-		while True:
-			sleep_interval = abs(await self.setting_random_messages_interval.get_value())
-			if sleep_interval == 0:
-				sleep_interval = 1
+		await self.schedule_random_messages()
 
-			logging.getLogger(__name__).debug('Random Messages, sleeping for {} seconds'.format(sleep_interval))
-			await asyncio.sleep(sleep_interval)
+	async def schedule_random_messages(self):
+		if self.random_job:
+			self.random_job.cancel()
+			self.random_job = None
 
-			# Ignore when empty
-			if not await self.setting_random_messages.get_value():
-				continue
+		# Don't schedule when empty.
+		if not await self.setting_random_messages.get_value():
+			return
 
-			try:
-				await self.send_random_message()
-			except Exception as e:
-				logging.getLogger(__name__).error('Error sending random message: ', str(e))
+		interval = abs(await self.setting_random_messages_interval.get_value())
+		if interval == 0:
+			interval = 1
+
+		logging.getLogger(__name__).debug('Random Messages, sending every {} seconds'.format(interval))
+		self.random_job = self.context.scheduler.call_every(interval, self.random_message)
+
+	async def random_message(self):
+		try:
+			await self.send_random_message()
+		except Exception as e:
+			logging.getLogger(__name__).error('Error sending random message: {}'.format(str(e)))
 
 	async def send_random_message(self):
 		messages = await self.setting_random_messages.get_value()
@@ -3,6 +3,7 @@ import asyncio
 from pyplanet.apps.config import AppConfig
 from pyplanet.apps.core.maniaplanet import callbacks as mp_signals
 from pyplanet.apps.core.trackmania import callbacks as tm_signals
+from pyplanet.utils.checkpoints import CheckpointTable
 
 from .view import BestCpTimesWidget
 from .view import CpTimesListView
@@ -13,12 +14,10 @@ class BestCpTimes(AppConfig):
 	app_dependencies = ['core.maniaplanet', 'core.trackmania']
 	# mode_dependencies = ['TimeAttack']
 
-	best_cp_times = []
-
 	def __init__(self, *args, **kwargs):
 		super().__init__(*args, **kwargs)
 		self.number_of_checkpoints = None
-		self.best_cp_times = []  # List of PlayerCP Objects
+		self.best_cp_times = CheckpointTable(sort_key=lambda pcp: pcp.cp)  # PlayerCP objects by cp, ordered by cp.
 		self.widget = None
 
 	async def on_start(self):
@@ -39,23 +38,11 @@ class BestCpTimes(AppConfig):
 		if laptime == 0:
 			return
 
-		pcp = PlayerCP(player, cpnm + 1, laptime)
-		if not self.best_cp_times:
-			self.best_cp_times.append(pcp)
-		else:
-			added = False
-			for idx, current_cp in enumerate(self.best_cp_times):
-				if pcp.cp < current_cp.cp:
-					self.best_cp_times.insert(idx, pcp)
-					added = True
-					break
-				elif pcp.cp == current_cp.cp:
-					if laptime < current_cp.time:
-						self.best_cp_times[idx] = pcp
-					added = True
-					break
-			if not added:
-				self.best_cp_times.append(pcp)
+		# Only the improvements of the best time change the table (lookup by cp and ordered insert).
+		current_cp = self.best_cp_times.get(cpnm + 1)
+		if current_cp is not None and laptime >= current_cp.time:
+			return
+		self.best_cp_times[cpnm + 1] = PlayerCP(player, cpnm + 1, laptime)
 		await self.widget.display()
 
 	# When the map starts
@@ -28,7 +28,9 @@ class Clock(AppConfig):
         await self.widget.display()
 
     async def on_after_start(self, *args, **kwargs):
-        await asyncio.sleep(1)
-        asyncio.ensure_future(asyncio.gather(*[
+        self.context.scheduler.call_later(1, self.display_online)
+
+    async def display_online(self):
+        await asyncio.gather(*[
             self.player_connect(p) for p in self.instance.player_manager.online
-        ]))
+        ])
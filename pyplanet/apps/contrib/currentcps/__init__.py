@@ -3,6 +3,7 @@ import logging
 from pyplanet.apps.config import AppConfig
 from pyplanet.apps.core.trackmania import callbacks as tm_signals
 from pyplanet.apps.core.maniaplanet import callbacks as mp_signals
+from pyplanet.utils.checkpoints import CheckpointTable
 
 from .view import CPWidgetView
 
@@ -14,9 +15,10 @@ class CurrentCPs(AppConfig):
 	def __init__(self, *args, **kwargs):
 		super().__init__(*args, **kwargs)
 
-		self.current_cps = {}  # Maps a player login to a PlayerCP object
+		# Maps a player login to a PlayerCP object, ordered by 1. finished (always on top), 2. the CP and 3. the time.
+		# The widget displays the PlayerCP objects in this order.
+		self.current_cps = CheckpointTable(sort_key=lambda pcp: (1 if pcp.cp == -1 else 2, -pcp.cp, pcp.time))
 		self.widget = None
-		self.player_cps = []  # Holds the sorted PlayerCP objects (these get displayed by the widget)
 
 		self.dedimania_enabled = False
 
@@ -71,10 +73,10 @@ class CurrentCPs(AppConfig):
 	async def player_cp(self, player, race_time, raw, *args, **kwargs):
 		cp = int(raw['checkpointinrace'])  # Have to use raw to get the current CP
 		# Create new PlayerCP object if there is no PlayerCP object for that player yet
-		if player.login not in self.current_cps:
-			self.current_cps[player.login] = PlayerCP(player)
-		self.current_cps[player.login].cp = cp + 1  # +1 because checkpointinrace starts at 0
-		self.current_cps[player.login].time = race_time
+		pcp = self.current_cps.get(player.login) or PlayerCP(player)
+		pcp.cp = cp + 1  # +1 because checkpointinrace starts at 0
+		pcp.time = race_time
+		self.current_cps[player.login] = pcp  # (Re)insert at the new position.
 		await self.update_view()
 
 	# When a player starts the race
@@ -86,16 +88,16 @@ class CurrentCPs(AppConfig):
 	# When a player passes the finish line
 	async def player_finish(self, player, race_time, race_cps, is_end_race, raw, *args, **kwargs):
 		# Create new PlayerCP object if there is no PlayerCP object for that player yet
-		if player.login not in self.current_cps:
-			self.current_cps[player.login] = PlayerCP(player)
+		pcp = self.current_cps.get(player.login) or PlayerCP(player)
 
 		# Set the current CP to -1 (signals finished) when a player finishes the race
 		if is_end_race:
-			self.current_cps[player.login].cp = -1
+			pcp.cp = -1
 		else:
-			self.current_cps[player.login].cp = int(raw['checkpointinrace']) + 1  # Otherwise just update the current cp
+			pcp.cp = int(raw['checkpointinrace']) + 1  # Otherwise just update the current cp
 			# logging.debug(raw)
-		self.current_cps[player.login].time = race_time
+		pcp.time = race_time
+		self.current_cps[player.login] = pcp  # (Re)insert at the new position.
 		await self.update_view()
 
 	# When a player connects
@@ -121,24 +123,15 @@ class CurrentCPs(AppConfig):
 		self.current_cps.clear()  # Clear the current CPs when the map ends
 		await self.update_view()
 
+	@property
+	def player_cps(self):
+		"""
+		The sorted PlayerCP objects (these get displayed by the widget).
+		"""
+		return self.current_cps
+
 	# Update the view for all players
 	async def update_view(self):
-		# Used for sorting the PlayerCP objects by the 1. CP and 2. the time (Finished players are always on top)
-		def keyfunc(key):
-			lpcp = self.current_cps[key]
-			return 1 if lpcp.cp == -1 else 2, -lpcp.cp, lpcp.time
-
-		self.player_cps.clear()
-
-		# Sort the PlayerCP objects by using the key function above and copy them into the player_cps-list
-		for login in sorted(self.current_cps, key=lambda x: keyfunc(x)):
-			pcp = self.current_cps[login]
-			cp = pcp.cp
-			cpstr = str(cp)
-			if cp == -1:
-				cpstr = "fin"
-			self.player_cps.append(pcp)
-
 		await self.widget.display()  # Update the widget for all players
 
 	async def spec_player(self, player, target_login):
@@ -18,6 +18,7 @@ from pyplanet.apps.contrib.dedimania.exceptions import (
 from pyplanet.contrib.command import Command
 from pyplanet.contrib.setting import Setting
 from pyplanet.utils import times
+from pyplanet.utils.checkpoints import CheckpointIndex
 from pyplanet.utils.log import handle_exception
 
 from .views import DedimaniaRecordsWidget, DedimaniaRecordsListView
@@ -37,6 +38,7 @@ class Dedimania(AppConfig):
 
 		self.lock = asyncio.Lock()
 		self.current_records = []
+		self.checkpoint_index = CheckpointIndex()
 		self.current_script = None
 		self.player_info = dict()
 
@@ -233,6 +235,7 @@ class Dedimania(AppConfig):
 			self.v_replay_checks = None
 			self.ghost_replay = None
 			self.current_records = list()
+			self.checkpoint_index.clear()
 		if self.ready:
 			await self.widget.display()
 
@@ -355,6 +358,9 @@ class Dedimania(AppConfig):
 				players=player_list,
 				server_login=self.instance.game.server_player_login
 			)
+			self.checkpoint_index.load(self.instance.map_manager.current_map.uid, [
+				(record.login, record.score, record.cps, record) for record in self.current_records
+			])
 			self.ready = True
 		except DedimaniaNotSupportedException as e:
 			self.ready = False
@@ -386,12 +392,14 @@ class Dedimania(AppConfig):
 			logger.error('Dedimania gave an Fault: {}'.format(str(e)))
 
 			self.current_records = list()
+			self.checkpoint_index.clear()
 			return
 		except Exception as e:
 			self.ready = False
 			handle_exception(e, module_name=__name__, func_name='refresh_records')
 			logger.exception(e)
 			self.current_records = list()
+			self.checkpoint_index.clear()
 			return
 
 		for info in player_infos:
@@ -447,7 +455,8 @@ class Dedimania(AppConfig):
 			return
 		player_info = self.player_info[player.login]
 		chat_announce = await self.setting_chat_announce.get_value()
-		current_records = [x for x in self.current_records if x.login == player.login]
+		indexed_record = self.checkpoint_index.get(player.login)
+		current_records = [indexed_record.record] if indexed_record else []
 		score = lap_time
 		if len(current_records) > 0:
 			current_record = current_records[0]
@@ -478,6 +487,7 @@ class Dedimania(AppConfig):
 					current_record.score = score
 					current_record.cps = lap_cps
 					self.current_records.sort(key=lambda x: x.score)
+					self.checkpoint_index.update(player.login, score, lap_cps, record=current_record)
 
 				if new_rank < previous_index:
 					message = '$fff{}$z$s$0b3 gained the $fff{}.$0b3 Dedimania Record: $fff\uf017 {}$0b3 ($fff{}.$0b3 $fff-{}$0b3).'.format(
@@ -496,6 +506,8 @@ class Dedimania(AppConfig):
 					coros.append(self.instance.chat(message))
 				elif chat_announce != 0:
 					coros.append(self.instance.chat(message, player))
+				if 'sector_times' in self.instance.apps.apps:
+					coros.append(self.instance.apps.apps['sector_times'].refresh_player(player))
 				await asyncio.gather(*coros)
 
 			elif score == current_record.score:
@@ -533,6 +545,7 @@ class Dedimania(AppConfig):
 			async with self.lock:
 				self.current_records.append(new_record)
 				self.current_records.sort(key=lambda x: x.score)
+				self.checkpoint_index.update(player.login, score, lap_cps, record=new_record)
 				new_index = self.current_records.index(new_record) + 1
 			message = '$fff{}$z$s$0b3 drove the $fff{}.$0b3 Dedimania Record: $fff\uf017 {}$0b3.'.format(
 				player.nickname, new_index, times.format_time(score)
@@ -543,10 +556,10 @@ class Dedimania(AppConfig):
 			else:
 				chat_await = self.instance.chat(message, player)
 
-			await asyncio.gather(
-				chat_await,
-				self.widget.display(),
-			)
+			coros = [chat_await, self.widget.display()]
+			if 'sector_times' in self.instance.apps.apps:
+				coros.append(self.instance.apps.apps['sector_times'].refresh_player(player))
+			await asyncio.gather(*coros)
 
 	async def get_v_replay(self, login):
 		try:
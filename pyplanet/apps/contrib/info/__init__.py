@@ -16,7 +16,7 @@ class Info(AppConfig):
 		self.map_widget = None
 		self.server_widget = None
 
-		self.update_pending = False
+		self.update_job = None
 
 	async def on_start(self):
 		self.context.signals.listen(mp_signals.map.map_begin, self.map_begin)
@@ -38,18 +38,16 @@ class Info(AppConfig):
 		asyncio.ensure_future(self.map_widget.display())
 		asyncio.ensure_future(self.server_widget.display())
 
-		# Update server widget.
-		asyncio.ensure_future(self.server_update_loop())
+	def schedule_update(self):
+		# Update the server widget at most once per 5 seconds, only when something changed.
+		if self.update_job is None or not self.update_job.pending:
+			self.update_job = self.context.scheduler.call_later(5, self.server_update)
 
-	async def server_update_loop(self):
-		while True:
-			await asyncio.sleep(5)
-			try:
-				if self.update_pending:
-					await self.server_widget.display()
-					self.update_pending = False
-			except:
-				pass
+	async def server_update(self):
+		try:
+			await self.server_widget.display()
+		except:
+			pass
 
 	async def map_begin(self, map):
 		await asyncio.gather(
@@ -62,7 +60,7 @@ class Info(AppConfig):
 			self.map_widget.display(player=player),
 			self.server_widget.display(player=player)
 		)
-		self.update_pending = True
+		self.schedule_update()
 
 	async def any_change(self, **kwargs):
-		self.update_pending = True
+		self.schedule_update()
@@ -4,9 +4,11 @@ from xmlrpc.client import Fault
 from pyplanet.apps.config import AppConfig
 from pyplanet.apps.contrib.jukebox.views import MapListView, JukeboxListView, FolderListView, AddToFolderView
 from pyplanet.apps.contrib.jukebox.folders import FolderManager
+from pyplanet.apps.contrib.jukebox.rows import MapRowStore
 from pyplanet.contrib.command import Command
 
 from pyplanet.apps.core.maniaplanet import callbacks as mp_signals
+from pyplanet.contrib.map.signals import map_list_changed
 from pyplanet.contrib.setting import Setting
 from pyplanet.views.generics.alert import show_alert
 
@@ -22,6 +24,7 @@ class Jukebox(AppConfig):
 		self.lock = asyncio.Lock()
 		self.jukebox = []
 		self.folder_manager = FolderManager(self)
+		self.map_rows = MapRowStore(self)
 
 		# Settings.
 		self.setting_newest_days_range = Setting(
@@ -67,6 +70,8 @@ class Jukebox(AppConfig):
 
 		# Register callback.
 		self.context.signals.listen(mp_signals.flow.podium_start, self.podium_start)
+		self.context.signals.listen(mp_signals.player.player_disconnect, self.player_disconnect)
+		self.context.signals.listen(map_list_changed, self.map_list_changed)
 
 		# Add button to the map list for adding to a folder.
 		MapListView.add_action(self.add_to_folder, 'Add to folder', '&#xf07b;', order=-50)
@@ -74,6 +79,29 @@ class Jukebox(AppConfig):
 		# Fetch all folders.
 		await self.folder_manager.on_start()
 
+	def update_map(self, map):
+		"""
+		Update the folder index and list row of the given map. Called when the local records or karma of a map changed.
+
+		:param map: Map instance.
+		"""
+		self.folder_manager.update_map_index(map)
+		self.map_rows.update_map(map)
+
+	def update_maps(self):
+		"""
+		Rebuild the folder index and list rows of all maps. Called after the local records or karma of all maps are loaded.
+		"""
+		self.folder_manager.refresh_index()
+		self.map_rows.refresh()
+
+	async def map_list_changed(self, maps, **kwargs):
+		self.folder_manager.invalidate_index()
+		self.map_rows.invalidate()
+
+	async def player_disconnect(self, player, **kwargs):
+		self.map_rows.forget_player(player.login)
+
 	def insert_map(self, player, map):
 		self.jukebox.insert(0, {'player': player, 'map': map})
 
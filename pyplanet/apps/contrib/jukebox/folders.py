@@ -1,6 +1,7 @@
+import bisect
 import datetime
 
-from pyplanet.apps.core.maniaplanet.models import Player, Map
+from pyplanet.apps.core.maniaplanet.models import Player
 from pyplanet.apps.contrib.jukebox.views import FolderListView, FolderMapListView
 from pyplanet.contrib.setting import Setting
 
@@ -15,6 +16,15 @@ class FolderManager:
 		self.auto_folders = list()
 		self.public_folders = list()
 
+		# Folder membership indexes. The folder index contains the set of map ids per folder id (auto and database
+		# folders), the map index contains the auto folder ids per map id so a single map can be updated cheaply.
+		self.folder_index = dict()
+		self.map_index = dict()
+		self.maps_by_id = dict()
+		self.map_positions = dict()
+		self.maps_by_created = list()
+		self._index_stale = True
+
 	async def on_start(self):
 		"""
 		Called after startup of PyPlanet so it can investigate the automatic folders.
@@ -48,6 +58,109 @@ class FolderManager:
 			self.auto_folders.append({'id': 'karma_undecided', 'name': 'Map karma: undecided', 'owner': 'PyPlanet', 'type': 'auto'})
 			self.auto_folders.append({'id': 'karma_positive', 'name': 'Map karma: positive', 'owner': 'PyPlanet', 'type': 'auto'})
 
+		self.refresh_index()
+
+	def refresh_index(self):
+		"""
+		Rebuild the auto-folder membership index for all maps in the current map list.
+		"""
+		maps = self.app.instance.map_manager.maps
+		self._index_stale = False
+		self.maps_by_id = {m.id: m for m in maps}
+		self.map_positions = {m.id: position for position, m in enumerate(maps)}
+		self.maps_by_created = sorted((m.created_at, m.id) for m in maps if m.created_at)
+
+		for folder in self.auto_folders:
+			self.folder_index[folder['id']] = set()
+		self.map_index = dict()
+
+		for map in maps:
+			self.update_map_index(map)
+
+	def invalidate_index(self):
+		"""
+		Mark the index as stale, it's rebuilt when a folder is displayed. Should be called when the map list changed.
+		"""
+		self._index_stale = True
+
+	def update_map_index(self, map):
+		"""
+		Update the auto-folder membership of a single map, should be called after the local records or karma of the map
+		changed.
+
+		:param map: Map instance.
+		"""
+		# Always classify the instance from the map list, that one holds the local and karma information.
+		map = self.maps_by_id.get(map.id)
+		if map is None:
+			return
+
+		old_folders = self.map_index.get(map.id, set())
+		new_folders = self.get_auto_folder_ids(map)
+
+		for folder_id in old_folders - new_folders:
+			self.folder_index[folder_id].discard(map.id)
+		for folder_id in new_folders - old_folders:
+			self.folder_index.setdefault(folder_id, set()).add(map.id)
+		self.map_index[map.id] = new_folders
+
+	def get_auto_folder_ids(self, map):
+		"""
+		Get the identifiers of the auto folders the given map belongs to (except the newest folder).
+
+		:param map: Map instance.
+		:return: Set with folder ids.
+		"""
+		folder_ids = set()
+
+		if hasattr(map, 'local'):
+			first_record = map.local['first_record']
+			if map.local['record_count'] == 0:
+				folder_ids.add('local_none')
+			if first_record is not None and first_record.score < 30000:
+				folder_ids.add('length_shorter_30s')
+			if first_record is not None and first_record.score > 60000:
+				folder_ids.add('length_longer_60s')
+
+		if hasattr(map, 'karma'):
+			if map.karma['vote_count'] == 0:
+				folder_ids.add('karma_none')
+			if map.karma['map_karma'] < 0:
+				folder_ids.add('karma_negative')
+			elif map.karma['map_karma'] == 0:
+				folder_ids.add('karma_undecided')
+			else:
+				folder_ids.add('karma_positive')
+
+		return folder_ids
+
+	def get_indexed_maps(self, map_ids):
+		"""
+		Get the map instances of the given map ids, in the order of the current map list.
+
+		:param map_ids: Iterable with map ids.
+		:return: List of map instances.
+		"""
+		return [
+			self.maps_by_id[map_id]
+			for map_id in sorted((i for i in map_ids if i in self.maps_by_id), key=self.map_positions.get)
+		]
+
+	async def get_database_folder_maps(self, folder_id):
+		"""
+		Get the (cached) set of map ids in the given database folder.
+
+		:param folder_id: Folder identifier (database primary key).
+		:return: Set with map ids.
+		"""
+		index_key = 'database_{}'.format(folder_id)
+		if index_key not in self.folder_index:
+			rows = await MapInFolder.execute(
+				MapInFolder.select(MapInFolder.map).where(MapInFolder.folder == folder_id)
+			)
+			self.folder_index[index_key] = set(row.map_id for row in rows)
+		return self.folder_index[index_key]
+
 	async def get_folders(self, player):
 		"""
 		Get the folders, as combined object, for the specific player.
@@ -156,6 +269,8 @@ class FolderManager:
 		if existing:
 			return False
 
+		self.folder_index.get('database_{}'.format(folder_id), set()).add(int(map_id))
+
 		# Add map to folder.
 		map_in_folder = MapInFolder(
 			map_id=map_id,
@@ -176,6 +291,23 @@ class FolderManager:
 			MapInFolder.delete()
 				.where((MapInFolder.map_id == map_id) & (MapInFolder.folder_id == folder_id))
 		)
+		self.folder_index.get('database_{}'.format(folder_id), set()).discard(int(map_id))
+
+	async def remove_folder(self, folder_id):
+		"""
+		Removes the provided folder and the maps in it.
+
+		:param folder_id: folder identifier to remove
+		"""
+		await MapInFolder.execute(
+			MapInFolder.delete()
+				.where(MapInFolder.folder == folder_id)
+		)
+		await Folders.execute(
+			Folders.delete()
+				.where(Folders.id == folder_id)
+		)
+		self.folder_index.pop('database_{}'.format(folder_id), None)
 
 	async def get_folders_containing_map(self, map_id):
 		"""
@@ -206,36 +338,24 @@ class FolderManager:
 		fields = []
 		folder_instance = None
 
+		# Rebuild the index when the map list has changed since the last build.
+		if self._index_stale:
+			self.refresh_index()
+
 		if folder['id'] == 'newest':
 			days_ago = await self.app.setting_newest_days_range.get_value()
 			filter_from = datetime.datetime.now() - datetime.timedelta(days=days_ago)
-			map_list = [m for m in self.app.instance.map_manager.maps if m.created_at > filter_from]
-		elif folder['id'] == 'local_none':
-			map_list = [m for m in self.app.instance.map_manager.maps if hasattr(m, 'local') and m.local['record_count'] == 0]
-		elif folder['id'] == 'length_shorter_30s':
-			map_list = [m for m in self.app.instance.map_manager.maps if hasattr(m, 'local') and m.local['first_record'] is not None and m.local['first_record'].score < 30000]
-		elif folder['id'] == 'length_longer_60s':
-			map_list = [m for m in self.app.instance.map_manager.maps if hasattr(m, 'local') and m.local['first_record'] is not None and m.local['first_record'].score > 60000]
-		elif folder['id'] == 'karma_none':
-			map_list = [m for m in self.app.instance.map_manager.maps if hasattr(m, 'karma') and m.karma['vote_count'] == 0]
-		elif folder['id'] == 'karma_negative':
-			map_list = [m for m in self.app.instance.map_manager.maps if hasattr(m, 'karma') and m.karma['map_karma'] < 0]
-		elif folder['id'] == 'karma_undecided':
-			map_list = [m for m in self.app.instance.map_manager.maps if hasattr(m, 'karma') and m.karma['map_karma'] == 0]
-		elif folder['id'] == 'karma_positive':
-			map_list = [m for m in self.app.instance.map_manager.maps if hasattr(m, 'karma') and m.karma['map_karma'] > 0]
+			start = bisect.bisect_right(self.maps_by_created, (filter_from, float('inf')))
+			map_list = self.get_indexed_maps(map_id for _, map_id in self.maps_by_created[start:])
 		elif folder['id'].startswith('database_'):
 			# Get the real folder model instance.
-			folder_instance = await Folders.get(id=int(folder['id'].replace('database_', '')))
+			folder_id = int(folder['id'].replace('database_', ''))
+			folder_instance = await Folders.get(id=folder_id)
 
 			# Personal folder from database
-			maps_in_folder = [m.map.uid for m in await MapInFolder.objects.execute(
-				MapInFolder.select(MapInFolder, Map)
-					.join(Map)
-					.where(MapInFolder.folder == int(folder['id'].replace('database_', '')))
-			)]
-
-			map_list = [m for m in self.app.instance.map_manager.maps if m.uid in maps_in_folder]
+			map_list = self.get_indexed_maps(await self.get_database_folder_maps(folder_id))
+		elif folder['id'] in self.folder_index:
+			map_list = self.get_indexed_maps(self.folder_index[folder['id']])
 
 		if folder['id'].startswith('length_') or folder['id'].startswith('database_'):
 			fields.append({
@@ -0,0 +1,180 @@
+from playhouse.shortcuts import model_to_dict
+
+from pyplanet.utils import style, times
+
+
+class MapRowStore:
+	"""
+	The map row store holds the list rows of all maps on the server, shared by all map list views. Rows are built once
+	and updated when the map list, local records or karma of a map changes. Personal columns (like the local record rank)
+	are fetched lazily per player and overlaid on top of the shared rows. When the records of a map change, only the
+	personal rows of that map are fetched again.
+	"""
+
+	def __init__(self, app):
+		"""
+		Initiate the store.
+
+		:param app: Jukebox app instance.
+		:type app: pyplanet.apps.contrib.jukebox.Jukebox
+		"""
+		self.app = app
+
+		self.rows = dict()
+		self.player_rows = dict()
+		self.stale_maps = dict()
+		self._row_list = None
+		self._positions = dict()
+		self._stale = True
+
+	def refresh(self):
+		"""
+		Rebuild the rows of all maps in the current map list.
+		"""
+		maps = self.app.instance.map_manager.maps
+		self._stale = False
+		self.rows = {m.id: self.map_to_row(m) for m in maps}
+		self.player_rows.clear()
+		self.stale_maps.clear()
+		self._row_list = None
+
+	def invalidate(self):
+		"""
+		Mark the rows as stale, they are rebuilt on the next use. Should be called when the map list changed.
+		"""
+		self._stale = True
+
+	def update_map(self, map):
+		"""
+		Update the row of a single map, should be called after the local records or karma of the map changed.
+
+		:param map: Map instance.
+		"""
+		if map.id not in self.rows:
+			return
+
+		list_map = self.app.folder_manager.maps_by_id.get(map.id, map)
+		self.rows[map.id].update(self.get_map_stats(list_map))
+
+		# Personal ranks on the map could have been changed by the update, fetch them again on the next display.
+		for login in self.player_rows:
+			self.stale_maps.setdefault(login, set()).add(map.id)
+
+	def forget_player(self, login):
+		"""
+		Drop the personal overlay of the given player.
+
+		:param login: Player login.
+		"""
+		self.player_rows.pop(login, None)
+		self.stale_maps.pop(login, None)
+
+	def get_rows(self):
+		"""
+		Get the (shared) list of map rows, in the order of the map list. The rows should not be modified!
+
+		:return: List with row dictionaries.
+		"""
+		if self._stale:
+			self.refresh()
+
+		if self._row_list is None:
+			self._row_list = [self.rows[m.id] for m in self.app.instance.map_manager.maps if m.id in self.rows]
+			self._positions = {row['id']: position for position, row in enumerate(self._row_list)}
+		return self._row_list
+
+	def get_map_rows(self, maps):
+		"""
+		Get the rows of the given maps.
+
+		:param maps: List of map instances.
+		:return: List with row dictionaries.
+		"""
+		self.get_rows()
+		return [self.rows[m.id] if m.id in self.rows else self.map_to_row(m) for m in maps]
+
+	async def get_player_rows(self, player):
+		"""
+		Get the map rows, including the personal local record columns of the given player.
+
+		:param player: Player instance.
+		:type player: pyplanet.apps.core.maniaplanet.models.Player
+		:return: List with row dictionaries.
+		"""
+		rows = self.get_rows()
+		if 'local_records' not in self.app.instance.apps.apps:
+			return rows
+
+		local_records = self.app.instance.apps.apps['local_records']
+		if player.login not in self.player_rows:
+			self.stale_maps.pop(player.login, None)
+			records = await local_records.get_player_records_and_ranks(player)
+			self.player_rows[player.login] = [self.player_row(row, records.get(row['id'])) for row in rows]
+
+		elif player.login in self.stale_maps:
+			player_rows = self.player_rows[player.login]
+			map_ids = self.stale_maps.pop(player.login)
+			records = await local_records.get_player_records_and_ranks(player, maps=map_ids)
+
+			# Skip when the rows have been rebuilt in the meantime.
+			if self.player_rows.get(player.login) is player_rows:
+				for map_id in map_ids:
+					position = self._positions.get(map_id)
+					if position is not None:
+						player_rows[position] = self.player_row(rows[position], records.get(map_id))
+
+		return self.player_rows.get(player.login, rows)
+
+	def player_row(self, row, record=None):
+		"""
+		Get the row with the personal local record columns.
+
+		:param row: Shared row dictionary.
+		:param record: Tuple with the rank and score of the local record of the player, or None.
+		:return: Row dictionary.
+		"""
+		rank, score = record or (None, None)
+		first_score = row['local_record_first_score']
+		return dict(
+			row,
+			local_record_rank=rank,
+			local_record_score=score,
+			local_record_diff=score - first_score if score is not None and first_score is not None else None,
+		)
+
+	def get_map_stats(self, map):
+		"""
+		Get the columns that depend on the local records or karma of the map.
+
+		:param map: Map instance.
+		:return: Dictionary with columns.
+		"""
+		first_record = map.local['first_record'] if hasattr(map, 'local') else None
+		return dict(
+			karma=map.karma['map_karma'] if hasattr(map, 'karma') else None,
+			local_record=times.format_time(first_record.score if first_record else 0),
+			local_record_first_score=first_record.score if first_record else None,
+		)
+
+	def map_to_row(self, map):
+		"""
+		Convert the map to a list row.
+
+		:param map: Map instance.
+		:return: Row dictionary.
+		"""
+		row = model_to_dict(map)
+
+		# Use custom field for author to allow for searching on both login and nickname (depending on what's shown).
+		row['author'] = row['author_nickname'] if row.get('author_nickname') else row['author_login']
+
+		# Precomputed lowercase and style stripped columns for searching and sorting.
+		row['search_name'] = style.style_strip(str(row['name']).lower())
+		row['search_author'] = style.style_strip(str(row['author']).lower())
+
+		row['local_record_rank'] = None
+		row['local_record_score'] = None
+		row['local_record_diff'] = None
+		row['local_record_diff_direction'] = None
+		row.update(self.get_map_stats(map))
+		return row
@@ -1,9 +1,7 @@
 import asyncio
 import math
 
-from playhouse.shortcuts import model_to_dict
-
-from pyplanet.apps.contrib.jukebox.models import MapFolder, MapInFolder
+from pyplanet.apps.contrib.jukebox.models import MapFolder
 from pyplanet.apps.core.maniaplanet.models import Map
 from pyplanet.views import TemplateView
 from pyplanet.views.generics.alert import show_alert, ask_confirmation, ask_input
@@ -85,59 +83,11 @@ class MapListView(ManualListView):
 		self.manager = app.context.ui
 		self.player = player
 		self.advanced = False
-		self.cache = list()
-		self.cache_advanced = False
 
 	async def get_data(self):
-		if self.cache and self.advanced == self.cache_advanced:
-			return self.cache
-
-		data = list()
-
-		local_app_installed = 'local_records' in self.app.instance.apps.apps
-		karma_app_installed = 'karma' in self.app.instance.apps.apps
-
-		for m in self.app.instance.map_manager.maps:
-			map_dict = model_to_dict(m)
-			map_dict['local_record_rank'] = None
-			map_dict['local_record_score'] = None
-			map_dict['local_record_diff'] = None
-			map_dict['local_record_diff_direction'] = None
-			map_dict['karma'] = None
-
-			# Use custom field for author to allow for searching on both login and nickname (depending on what's shown).
-			map_dict['author'] = (
-				map_dict['author_nickname']
-				if 'author_nickname' in map_dict and map_dict['author_nickname']
-				else map_dict['author_login']
-			)
-
-			# Skip if in performance mode or advanced is not enabled.
-			if self.app.instance.performance_mode or not self.advanced:
-				data.append(map_dict)
-				continue
-
-			if local_app_installed:
-				# Get personal local record of the user.
-				map_locals = await self.app.instance.apps.apps['local_records'].get_map_record(m)
-				rank, record = await self.app.instance.apps.apps['local_records'].get_player_record_and_rank_for_map(m, self.player)
-
-				if isinstance(rank, int) and rank >= 1:
-					map_dict['local_record_rank'] = int(rank)
-				if record:
-					map_dict['local_record_score'] = record.score
-				if map_locals['first_record'] and record:
-					map_dict['local_record_diff'] = record.score - map_locals['first_record'].score
-
-			# TODO: Convert to new relation styles.
-			if karma_app_installed and hasattr(m, 'karma'):
-				map_dict['karma'] = m.karma['map_karma']
-
-			data.append(map_dict)
-
-		self.cache = data
-		self.cache_advanced = self.advanced
-		return self.cache
+		if self.advanced and not self.app.instance.performance_mode:
+			return await self.app.map_rows.get_player_rows(self.player)
+		return self.app.map_rows.get_rows()
 
 	async def get_fields(self):
 		fields = [
@@ -146,7 +96,8 @@ class MapListView(ManualListView):
 				'index': 'name',
 				'sorting': True,
 				'searching': True,
-				'search_strip_styles': True,
+				'search_index': 'search_name',
+				'sort_index': 'search_name',
 				'width': 90,
 				'type': 'label',
 				'action': self.action_jukebox
@@ -156,7 +107,8 @@ class MapListView(ManualListView):
 				'index': 'author',
 				'sorting': True,
 				'searching': True,
-				'search_strip_styles': True,
+				'search_index': 'search_author',
+				'sort_index': 'search_author',
 				'type': 'label',
 				'width': 45,
 			},
@@ -267,20 +219,7 @@ class MapListView(ManualListView):
 		await self.app.folder_manager.display_folder_list(player)
 
 	async def action_advanced(self, player, values, **kwargs):
-		if len(self.app.instance.map_manager.maps) > 500:
-			if self.player.level == 0:
-				await self.app.instance.chat(
-					'This server contains 500+ maps. Advanced map list only activated for admins!', self.player
-				)
-				return
-
-		if self.advanced:
-			self.advanced = False
-		else:
-			self.advanced = True
-			await self.app.instance.chat(
-				'Please wait... Loading advanced map list, this can take some time on large servers', self.player
-			)
+		self.advanced = not self.advanced
 		await self.refresh(player=self.player)
 
 	@classmethod
@@ -304,14 +243,6 @@ class MapListView(ManualListView):
 			if custom['action'] == target:
 				del cls.custom_actions[idx]
 
-	async def destroy(self):
-		await super().destroy()
-		self.cache = list()
-
-	def destroy_sync(self):
-		super().destroy_sync()
-		self.cache = list()
-
 
 class FolderMapListView(MapListView):
 	supports_advanced = False
@@ -343,20 +274,12 @@ class FolderMapListView(MapListView):
 		return fields
 
 	async def get_data(self):
-		if self.cache and self.advanced == self.cache_advanced:
-			return self.cache
-
 		self.fields, self.map_list, self.folder_info, self.folder_instance = \
 			await self.folder_manager.get_folder_code_contents(self.folder_code)
 
 		self.title = 'Folder: ' + self.folder_info['name']
 
-		items = []
-		for item in self.map_list:
-			items.append(await self.map_to_dict(item))
-
-		self.cache = items
-		return self.cache
+		return self.app.map_rows.get_map_rows(self.map_list)
 
 	async def remove_from_folder(self, player, values, map_dictionary, view, **kwargs):
 		# Check permission on folder.
@@ -375,11 +298,6 @@ class FolderMapListView(MapListView):
 		# Remove from folder.
 		await self.folder_manager.remove_map_from_folder(self.folder_instance.id, map_dictionary['id'])
 
-		# Remove from the cache.
-		for item in self.cache:
-			if item['id'] == map_dictionary['id']:
-				self.cache.remove(item)
-
 		# Refresh list.
 		await self.refresh(player)
 
@@ -428,15 +346,7 @@ class FolderMapListView(MapListView):
 			return
 
 		# Add map to folder.
-		map_in_folder = MapInFolder(
-			map_id=self.app.instance.map_manager.current_map.id,
-			folder=self.folder_instance
-		)
-		await map_in_folder.save()
-
-		# Add the map to the cache to show it on refresh.
-		if self.cache:
-			self.cache.append(await self.map_to_dict(self.app.instance.map_manager.current_map))
+		await self.folder_manager.add_map_to_folder(self.folder_instance.id, self.app.instance.map_manager.current_map.id)
 
 		await show_alert(player, 'Map has been added to the folder!', 'sm')
 		await self.refresh(player)
@@ -455,22 +365,6 @@ class FolderMapListView(MapListView):
 
 		await self.display(player)
 
-	async def map_to_dict(self, map):
-		dict_item = model_to_dict(map)
-		if any(f['index'] == "local_record" for f in self.fields):
-			dict_item['local_record'] = times.format_time((map.local['first_record'].score if hasattr(map, 'local') and map.local['first_record'] else 0))
-		if any(f['index'] == "karma" for f in self.fields) and 'karma' in self.app.instance.apps.apps:
-			dict_item['karma'] = (await self.app.instance.apps.apps['karma'].get_map_karma(map))['map_karma']
-
-		# Use custom field for author to allow for searching on both login and nickname (depending on what's shown).
-		dict_item['author'] = (
-			dict_item['author_nickname']
-			if 'author_nickname' in dict_item and dict_item['author_nickname']
-			else dict_item['author_login']
-		)
-
-		return dict_item
-
 
 class FolderListView(ManualListView):
 	title = 'Maplist folders'
@@ -580,17 +474,8 @@ class FolderListView(ManualListView):
 		if cancel is True:
 			return
 
-		# Remove maps from folder.
-		await MapInFolder.execute(
-			MapInFolder.delete()
-				.where(MapInFolder.folder == folder_dictionary['id'].replace('database_', ''))
-		)
-
-		# Remove folder.
-		await MapFolder.execute(
-			MapFolder.delete()
-				.where(MapFolder.id == folder_dictionary['id'].replace('database_', ''))
-		)
+		# Remove folder and the maps in it.
+		await self.folder_manager.remove_folder(int(folder_dictionary['id'].replace('database_', '')))
 
 		# Refresh list.
 		await self.refresh(player)
@@ -1,5 +1,7 @@
 import asyncio
 
+from peewee import fn
+
 from pyplanet.apps.config import AppConfig
 from pyplanet.apps.contrib.karma.views import KarmaListView
 from pyplanet.contrib.command import Command
@@ -12,6 +14,7 @@ from pyplanet.apps.contrib.karma.views import KarmaWidget
 from pyplanet.apps.contrib.karma.mxkarma import MXKarma
 
 from .models import Karma as KarmaModel
+from .stats import MapKarma
 
 
 class Karma(AppConfig):
@@ -24,6 +27,7 @@ class Karma(AppConfig):
 		self.lock = asyncio.Lock()
 
 		self.current_votes = []
+		self.map_stats = dict()
 		self.current_karma = 0.0
 		self.current_karma_percentage = 0.0
 		self.current_karma_positive = 0.0
@@ -73,43 +77,76 @@ class Karma(AppConfig):
 		await self.mx_karma.on_stop()
 
 	async def load_map_votes(self, map=None):
+		"""
+		Set the karma statistics on the given map, or all maps on the server. Statistics are aggregated by the database
+		only for maps that are not yet in the statistics cache.
+
+		:param map: Map instance, or None for all maps in the map list.
+		"""
 		if map:
-			map.karma = await self.get_map_karma(map)
-		else:
-			maps = {m.id: m for m in self.instance.map_manager.maps}
-			map_karmas = dict()
-
-			# Fetch all.
-			rows = await KarmaModel.execute(
-				KarmaModel.select().where(
-					KarmaModel.map_id << list(maps.keys())
-				)
+			await self.get_map_stats(map)
+			self.update_map_karma(map)
+			return
+
+		maps = {m.id: m for m in self.instance.map_manager.maps}
+		missing = [map_id for map_id in maps if map_id not in self.map_stats]
+		if missing:
+			self.map_stats.update(await self.aggregate_map_stats(missing))
+
+		for map_id, map_instance in maps.items():
+			map_instance.karma = self.map_stats[map_id].as_dict()
+
+		if 'jukebox' in self.instance.apps.apps:
+			self.instance.apps.apps['jukebox'].update_maps()
+
+	async def aggregate_map_stats(self, map_ids):
+		"""
+		Aggregate the karma statistics of the given maps with a single grouped query.
+
+		:param map_ids: List of map ids.
+		:return: Dictionary with map id as key and MapKarma instance as value.
+		"""
+		stats = {map_id: MapKarma() for map_id in map_ids}
+		rows = await KarmaModel.execute(
+			KarmaModel.select(
+				KarmaModel.map, KarmaModel.score, KarmaModel.expanded_score, fn.COUNT(KarmaModel.id).alias('vote_count')
+			).where(
+				KarmaModel.map_id << list(map_ids)
+			).group_by(
+				KarmaModel.map, KarmaModel.score, KarmaModel.expanded_score
 			)
+		)
 
-			# Group by map.
-			# Make sure all maps have an entry in the dictionary.
-			for list_map_id in maps:
-				map_karmas[list_map_id] = list()
+		for row in rows:
+			stats[row.map_id].add(MapKarma.vote_score(row), row.vote_count)
+		return stats
 
-			for row in rows:
-				map_karmas[row.map_id].append(row)
+	async def get_map_stats(self, map):
+		"""
+		Get the (cached) karma statistics of a map.
 
-			# Map karma stats.
-			for map_id, karma_list in map_karmas.items():
-				total_score = 0.0
-				for vote in karma_list:
-					if vote.expanded_score is not None:
-						total_score += vote.expanded_score
-					else:
-						total_score += vote.score
+		:param map: Map instance.
+		:return: MapKarma instance.
+		"""
+		map_id = map.get_id()
+		if map_id not in self.map_stats:
+			self.map_stats.update(await self.aggregate_map_stats([map_id]))
+		return self.map_stats[map_id]
 
-				maps[map_id].karma = dict(
-					vote_count=len(karma_list),
-					map_karma=total_score
-				)
+	def update_map_karma(self, map):
+		"""
+		Refresh the karma dictionary on the given map and the matching instance in the map list from the cache.
 
-			del map_karmas
-			del maps
+		:param map: Map instance.
+		"""
+		karma = self.map_stats[map.get_id()].as_dict()
+		map.karma = karma
+		list_map = next((m for m in self.instance.map_manager.maps if m.uid == map.uid), None)
+		if list_map is not None:
+			list_map.karma = karma
+
+		if 'jukebox' in self.instance.apps.apps:
+			self.instance.apps.apps['jukebox'].update_map(map)
 
 	async def show_map_list(self, player, map=None, **kwargs):
 		"""
@@ -174,15 +211,15 @@ class Karma(AppConfig):
 				player_votes = [x for x in self.current_votes if x.player_id == player.get_id()]
 				if len(player_votes) > 0:
 					player_vote = player_votes[0]
-					if (player_vote.expanded_score is not None and player_vote.expanded_score != score) or \
-						(player_vote.expanded_score is None and player_vote.score != score):
+					old_score = MapKarma.vote_score(player_vote)
+					if old_score != score:
 						player_vote.score = normal_score
 						player_vote.expanded_score = score
 						await player_vote.save()
 
-						map = next((m for m in self.instance.map_manager.maps if m.uid == self.instance.map_manager.current_map.uid), None)
-						if map is not None:
-							map.karma = await self.get_map_karma(self.instance.map_manager.current_map)
+						current_map = self.instance.map_manager.current_map
+						(await self.get_map_stats(current_map)).change(old_score, score)
+						self.update_map_karma(current_map)
 
 						message = '$ff0Successfully changed your karma vote to $fff{}$ff0{}!'.format(text,
 							(' (same as $fff{}$ff0)'.format(text[:2]) if text == '+++' or text == '---' else '')
@@ -200,12 +237,11 @@ class Karma(AppConfig):
 					await new_vote.save()
 
 					self.current_votes.append(new_vote)
+					current_map = self.instance.map_manager.current_map
+					(await self.get_map_stats(current_map)).add(score)
+					self.update_map_karma(current_map)
 					await self.calculate_karma()
 
-					map = next((m for m in self.instance.map_manager.maps if m.uid == self.instance.map_manager.current_map.uid), None)
-					if map is not None:
-						map.karma = await self.get_map_karma(self.instance.map_manager.current_map)
-
 					message = '$ff0Successfully voted $fff{}$ff0{}!'.format(text,
 						(' (same as $fff{}$ff0)'.format(text[:2]) if text == '+++' or text == '---' else '')
 					)
@@ -214,49 +250,27 @@ class Karma(AppConfig):
 						self.widget.display()
 					)
 
-				# Reload map referenced information
-				asyncio.ensure_future(self.load_map_votes(map=self.instance.map_manager.current_map))
-
 	async def get_map_karma(self, map):
-		vote_list = await KarmaModel.objects.execute(KarmaModel.select().where(KarmaModel.map_id == map.get_id()))
-
-		total_score = 0.0
-		for vote in vote_list:
-			if vote.expanded_score is not None:
-				total_score += vote.expanded_score
-			else:
-				total_score += vote.score
-
-		return dict(
-			vote_count=len(vote_list),
-			map_karma=total_score
-		)
+		return (await self.get_map_stats(map)).as_dict()
 
 	async def get_votes_list(self, map):
 		vote_list = await KarmaModel.objects.execute(KarmaModel.select(KarmaModel, Player).join(Player).where(KarmaModel.map_id == map.get_id()))
 		self.current_votes = list(vote_list)
 
+		# Rebuild the statistics of the map from the fetched votes, so the cache is in sync with the database.
+		stats = MapKarma()
+		for vote in self.current_votes:
+			stats.add(MapKarma.vote_score(vote))
+		self.map_stats[map.get_id()] = stats
+		self.update_map_karma(map)
+
 	async def calculate_karma(self):
-		total_score = 0.0
-		total_abs = 0.0
-		self.current_karma_positive = 0.0
-		self.current_karma_negative = 0.0
+		stats = await self.get_map_stats(self.instance.map_manager.current_map)
 
-		for vote in self.current_votes:
-			score = vote.score
-			if vote.expanded_score is not None:
-				score = vote.expanded_score
-
-			total_score += score
-			total_abs += abs(score)
-			if score > 0:
-				self.current_karma_positive += score
-
-		self.current_karma_negative = (total_abs - self.current_karma_positive)
-		self.current_karma = total_score
-		self.current_karma_percentage = 0
-		if self.current_karma_positive > 0:
-			self.current_karma_percentage = (self.current_karma_positive / total_abs)
+		self.current_karma = stats.map_karma
+		self.current_karma_positive = stats.positive
+		self.current_karma_negative = stats.negative
+		self.current_karma_percentage = stats.percentage
 
 	async def chat_current_karma(self):
 		mx_karma = ''
@@ -0,0 +1,89 @@
+"""
+Aggregated karma statistics, kept per map and updated incrementally on votes.
+"""
+
+
+class MapKarma:
+	"""
+	Karma statistics of a single map. Holds the distribution of vote values (score -> count) and derives all
+	aggregates (count, sum, positive and negative totals) from it, so updating is constant time.
+	"""
+
+	def __init__(self, distribution=None):
+		self.distribution = dict()
+		if distribution:
+			for score, count in distribution.items():
+				self.add(score, count)
+
+	@staticmethod
+	def vote_score(vote):
+		"""
+		Get the effective score of a vote (expanded score when given, otherwise the normal score).
+
+		:param vote: Karma model instance.
+		:return: Score as float.
+		"""
+		if vote.expanded_score is not None:
+			return float(vote.expanded_score)
+		return float(vote.score)
+
+	def add(self, score, count=1):
+		score = float(score)
+		self.distribution[score] = self.distribution.get(score, 0) + count
+
+	def remove(self, score, count=1):
+		score = float(score)
+		remaining = self.distribution.get(score, 0) - count
+		if remaining > 0:
+			self.distribution[score] = remaining
+		else:
+			self.distribution.pop(score, None)
+
+	def change(self, old_score, new_score):
+		self.remove(old_score)
+		self.add(new_score)
+
+	@property
+	def vote_count(self):
+		return sum(self.distribution.values())
+
+	@property
+	def map_karma(self):
+		return sum(score * count for score, count in self.distribution.items())
+
+	@property
+	def positive_count(self):
+		return sum(count for score, count in self.distribution.items() if score > 0)
+
+	@property
+	def negative_count(self):
+		return sum(count for score, count in self.distribution.items() if score < 0)
+
+	@property
+	def positive(self):
+		return sum(score * count for score, count in self.distribution.items() if score > 0)
+
+	@property
+	def negative(self):
+		return sum(abs(score) * count for score, count in self.distribution.items() if score < 0)
+
+	@property
+	def percentage(self):
+		total_abs = self.positive + self.negative
+		if self.positive > 0:
+			return self.positive / total_abs
+		return 0
+
+	def as_dict(self):
+		"""
+		Get the statistics as dictionary, as being set on the map instances (``map.karma``).
+
+		:return: Dictionary with the vote_count, map_karma, positive_count, negative_count and distribution.
+		"""
+		return dict(
+			vote_count=self.vote_count,
+			map_karma=self.map_karma,
+			positive_count=self.positive_count,
+			negative_count=self.negative_count,
+			distribution=dict(self.distribution),
+		)
@@ -1,5 +1,7 @@
 import asyncio
 
+from peewee import fn
+
 from pyplanet.apps.config import AppConfig
 from pyplanet.apps.contrib.local_records.views import LocalRecordsListView, LocalRecordsWidget
 from pyplanet.apps.core.maniaplanet.models import Player
@@ -10,6 +12,7 @@ from pyplanet.apps.core.trackmania import callbacks as tm_signals
 from pyplanet.apps.core.maniaplanet import callbacks as mp_signals
 
 from pyplanet.utils import times
+from pyplanet.utils.checkpoints import CheckpointIndex
 from pyplanet.utils.log import handle_exception
 
 from .models import LocalRecord
@@ -24,6 +27,7 @@ class LocalRecords(AppConfig):
 		self.lock = asyncio.Lock()
 
 		self.current_records = []
+		self.checkpoint_index = CheckpointIndex()
 		self.widget = None
 
 		self.setting_chat_announce = Setting(
@@ -71,6 +75,13 @@ class LocalRecords(AppConfig):
 	async def load_map_locals(self, map=None):
 		if map:
 			map.local = await self.get_map_record(map)
+
+			list_map = next((m for m in self.instance.map_manager.maps if m.uid == map.uid), None)
+			if list_map is not None:
+				list_map.local = map.local
+
+			if 'jukebox' in self.instance.apps.apps:
+				self.instance.apps.apps['jukebox'].update_map(map)
 		else:
 			maps = {m.id: m for m in self.instance.map_manager.maps}
 			map_locals = dict()
@@ -100,6 +111,9 @@ class LocalRecords(AppConfig):
 			del map_locals
 			del maps
 
+			if 'jukebox' in self.instance.apps.apps:
+				self.instance.apps.apps['jukebox'].update_maps()
+
 	async def get_map_record(self, map=None):
 		if not map:
 			map = self.instance.map_manager.current_map
@@ -108,7 +122,7 @@ class LocalRecords(AppConfig):
 			LocalRecord.select(LocalRecord, Player)
 				.join(Player)
 				.where(LocalRecord.map_id == map.get_id())
-				.order_by(LocalRecord.score.asc())
+				.order_by(LocalRecord.score.asc(), LocalRecord.id.asc())
 		)
 
 		return {
@@ -130,7 +144,7 @@ class LocalRecords(AppConfig):
 			LocalRecord.select(LocalRecord, Player)
 				.join(Player)
 				.where(LocalRecord.map_id == map.get_id())
-				.order_by(LocalRecord.score.asc())
+				.order_by(LocalRecord.score.asc(), LocalRecord.id.asc())
 		)
 
 		rank = 1
@@ -140,6 +154,30 @@ class LocalRecords(AppConfig):
 			rank += 1
 		return None, None
 
+	async def get_player_records_and_ranks(self, player, maps=None):
+		"""
+		Get the local record and rank of the player on all maps (or the given maps) with a single query. The rank is the
+		position in the record list, equal scores are ordered by the record id (like the record list).
+
+		:param player: Player instance.
+		:param maps: List of map ids, all maps when not given.
+		:return: Dictionary with map id as key and a tuple with the rank and record score as value.
+		"""
+		own_record = LocalRecord.alias()
+		query = LocalRecord.select(
+			own_record.map, own_record.score, fn.COUNT(LocalRecord.id).alias('rank')
+		).join(
+			own_record, on=((own_record.map == LocalRecord.map) & (own_record.player == player.get_id()))
+		).where(
+			(LocalRecord.score < own_record.score) |
+			((LocalRecord.score == own_record.score) & (LocalRecord.id <= own_record.id))
+		)
+		if maps is not None:
+			query = query.where(own_record.map << list(maps))
+		rows = await LocalRecord.execute(query.group_by(own_record.map, own_record.score).tuples())
+
+		return {map_id: (rank, score) for map_id, score, rank in rows}
+
 	async def get_local(self, id):
 		return await LocalRecord.get(id=id)
 
@@ -158,9 +196,12 @@ class LocalRecords(AppConfig):
 			LocalRecord.select(LocalRecord, Player)
 				.join(Player)
 				.where(LocalRecord.map_id == self.instance.map_manager.current_map.get_id())
-				.order_by(LocalRecord.score.asc())
+				.order_by(LocalRecord.score.asc(), LocalRecord.id.asc())
 		)
 		self.current_records = list(record_list)
+		self.checkpoint_index.load(self.instance.map_manager.current_map.uid, [
+			(record.player.login, record.score, record.checkpoints, record) for record in self.current_records
+		])
 
 	async def show_records_list(self, player, data = None, **kwargs):
 		"""
@@ -200,7 +241,8 @@ class LocalRecords(AppConfig):
 		record_limit = await self.setting_record_limit.get_value()
 		chat_announce = await self.setting_chat_announce.get_value()
 		async with self.lock:
-			current_records = [x for x in self.current_records if x.player.login == player.login]
+			indexed_record = self.checkpoint_index.get(player.login)
+			current_records = [indexed_record.record] if indexed_record else []
 			score = lap_time
 
 			previous_index = None
@@ -238,8 +280,9 @@ class LocalRecords(AppConfig):
 			current_record.checkpoints = ','.join([str(cp) for cp in cps])
 
 			# Add to list when it's a new record!
-			if current_record.get_id() is None:
+			if not current_records:
 				self.current_records.append(current_record)
+			self.checkpoint_index.update(player.login, score, current_record.checkpoints, record=current_record)
 
 			# (Re)sort the record list.
 			self.current_records.sort(key=lambda x: x.score)
@@ -286,6 +329,8 @@ class LocalRecords(AppConfig):
 				coros.append(self.instance.chat(message))
 			elif chat_announce != 0:
 				coros.append(self.instance.chat(message, player))
+		if 'sector_times' in self.instance.apps.apps:
+			coros.append(self.instance.apps.apps['sector_times'].refresh_player(player))
 		await asyncio.gather(*coros)
 
 		# Reload map referenced information
@@ -340,7 +385,8 @@ class LocalRecords(AppConfig):
 		:return:
 		"""
 		async with self.lock:
-			record = [x for x in self.current_records if x.player_id == player.get_id()]
+			indexed_record = self.checkpoint_index.get(player.login)
+			record = [indexed_record.record] if indexed_record else []
 
 			if data.record > len(self.current_records):
 				message = '$0b3There is no record for rank {}!'.format(data.record)
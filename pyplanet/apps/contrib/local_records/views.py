@@ -36,14 +36,17 @@ class LocalRecordsWidget(TimesWidgetView):
 			current_records = self.app.current_records
 		widget_times = dict()
 
+		# Positions of the records, the record of the player is looked up in the checkpoint index.
+		positions = {id(record): position for position, record in enumerate(current_records)}
+
 		for player in self.app.instance.player_manager.online:
 			list_records = list()
 
-			player_record = [x for x in current_records if x.player_id == player.get_id()]
+			indexed_record = self.app.checkpoint_index.get(player.login)
 			player_index = (len(current_records) + 1)
-			if len(player_record) > 0:
+			if indexed_record and id(indexed_record.record) in positions:
 				# Set player index if there is a record
-				player_index = (current_records.index(player_record[0]) + 1)
+				player_index = (positions[id(indexed_record.record)] + 1)
 
 			records = list(current_records[:self.top_entries])
 			custom_start_index = None
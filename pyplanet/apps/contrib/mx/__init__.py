@@ -100,7 +100,7 @@ class MX(AppConfig):  # pragma: no cover
 				self.award_widget.mx_id = mx_info[0][0]
 
 				# Only display the award widget to the playing players.
-				play_logins = [p.login for p in self.instance.player_manager.online if not p.flow.is_spectator]
+				play_logins = list(self.instance.player_manager.player_logins)
 				await self.award_widget.display(player_logins=play_logins)
 
 	async def podium_end(self, **kwargs):
@@ -209,14 +209,14 @@ class Queue(AppConfig):
 			)
 
 		# Make sure the widgets are updated for all other spectators.
-		logins = [p.login for p in self.instance.player_manager.online if p.flow.is_spectator]
+		logins = list(self.instance.player_manager.spectator_logins)
 		await self.widget.display(player_logins=logins)
 
 	async def change_hook(self, action=None, entity=None, *args, **kwargs):
 		# Check the action of the event.
 		if action in ['push', 'pop', 'remove', 'clear', 'shuffle']:
 			# Reload the widget to all the players that should see it (all spectators).
-			logins = [p.login for p in self.instance.player_manager.online if p.flow.is_spectator]
+			logins = list(self.instance.player_manager.spectator_logins)
 			await self.widget.display(player_logins=logins)
 
 	async def enter_queue(self, player):
@@ -7,6 +7,8 @@ from pyplanet.apps.config import AppConfig
 from pyplanet.apps.contrib.sector_times.views import SectorTimesWidget, CheckpointDiffWidget, GearIndicatorView
 from pyplanet.apps.core.maniaplanet import callbacks as mp_signals
 from pyplanet.contrib.setting import Setting
+from pyplanet.core.ui.audience import player_and_spectators
+from pyplanet.core.ui.signals import spectator_target_changed
 from pyplanet.core.signals import pyplanet_start_after
 
 
@@ -33,6 +35,7 @@ class SectorTimes(AppConfig):
 		)
 
 		self.context.signals.listen(mp_signals.player.player_connect, self.player_connect)
+		self.context.signals.listen(spectator_target_changed, self.spectator_target_changed)
 		self.context.signals.listen(mp_signals.map.map_start, self.map_start)
 		self.context.signals.listen(mp_signals.flow.podium_start, self.podium_start)
 
@@ -49,10 +52,12 @@ class SectorTimes(AppConfig):
 		return mode != 'Trackmania/TM_RoyalTimeAttack_Online'
 
 	async def on_after_start(self, *args, **kwargs):
-		await asyncio.sleep(1)
-		asyncio.ensure_future(asyncio.gather(*[
+		self.context.scheduler.call_later(1, self.display_online)
+
+	async def display_online(self):
+		await asyncio.gather(*[
 			self.player_connect(p) for p in self.instance.player_manager.online
-		]))
+		])
 
 	async def player_connect(self, player, **kwargs):
 		await self.sector_widget.display(player)
@@ -60,6 +65,35 @@ class SectorTimes(AppConfig):
 		if self.gear_view_possible and await self.setting_enable_gear_indicator.get_value():
 			await self.gear_view.display(player.login)
 
+	async def spectator_target_changed(self, player_login, target_login, **kwargs):
+		# The widgets of a spectator compare with the record of the spectated player.
+		await asyncio.gather(
+			self.sector_widget.display(audience=[player_login]),
+			self.cp_widget.display(audience=[player_login]),
+		)
+
+	def get_record_login(self, login):
+		"""
+		Get the login of the player to compare the times with, the spectated player for spectators.
+
+		:param login: Login of the player.
+		:return: Login.
+		"""
+		return self.instance.ui_manager.spectators.get_target(login) or login
+
+	async def refresh_player(self, player):
+		"""
+		Update the widgets after a new or improved record of the player, only for the player and the spectators of the
+		player.
+
+		:param player: Player instance.
+		"""
+		audience = player_and_spectators(player)
+		await asyncio.gather(
+			self.sector_widget.display(audience=audience),
+			self.cp_widget.display(audience=audience),
+		)
+
 	async def map_start(self, *args, **kwargs):
 		await asyncio.sleep(2)
 		await self.sector_widget.display()
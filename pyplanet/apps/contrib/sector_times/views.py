@@ -2,6 +2,34 @@ from pyplanet.views import TemplateView
 from pyplanet.views.generics.widget import WidgetView
 
 
+def get_fastest_record(app, login):
+	"""
+	Get the fastest record of the player, the dedimania or the local record. Looked up in the checkpoint indexes of the
+	record apps (by login), instead of the record lists.
+
+	:param app: App instance.
+	:param login: Login of the player.
+	:return: Tuple with the score (0 without record), the comma separated checkpoint times and the source.
+	:type app: pyplanet.apps.contrib.sector_times.SectorTimes
+	"""
+	dedi_record = None
+	local_record = None
+	if 'dedimania' in app.instance.apps.apps:
+		dedi_record = app.instance.apps.apps['dedimania'].checkpoint_index.get(login)
+	if 'local_records' in app.instance.apps.apps:
+		local_record = app.instance.apps.apps['local_records'].checkpoint_index.get(login)
+
+	dedi_score = dedi_record.score if dedi_record and dedi_record.score else 0
+	local_score = local_record.score if local_record and local_record.score else 0
+
+	# Get fastest score, source and checkpoint scores.
+	if dedi_score > 0 and (local_score <= 0 or dedi_score < local_score):
+		return dedi_score, ','.join([str(c) for c in dedi_record.checkpoints]), 'Dedi'
+	elif local_score > 0 and (dedi_score <= 0 or local_score <= dedi_score):
+		return local_score, ','.join([str(c) for c in local_record.checkpoints]), 'Local'
+	return 0, '', ''
+
+
 class SectorTimesWidget(WidgetView):
 	# widget_x = 20
 	widget_y = -70
@@ -26,45 +54,7 @@ class SectorTimesWidget(WidgetView):
 		return 20
 
 	async def get_per_player_data(self, login):
-		dedi_score = 0
-		dedi_record = None
-		local_score = 0
-		local_record = None
-		if 'dedimania' in self.app.instance.apps.apps:
-			try:
-				dedi_record = [x for x in self.app.instance.apps.apps['dedimania'].current_records if x.login == login]
-				if len(dedi_record) > 0:
-					dedi_record = dedi_record[0]
-			except:
-				pass
-		if 'local_records' in self.app.instance.apps.apps:
-			try:
-				local_record = [x for x in self.app.instance.apps.apps['local_records'].current_records if x.player.login == login]
-				if len(local_record) > 0:
-					local_record = local_record[0]
-			except:
-				pass
-
-		if dedi_record and hasattr(dedi_record, 'score'):
-			dedi_score = dedi_record.score
-		if local_record and hasattr(local_record, 'score'):
-			local_score = local_record.score
-
-		# Get fastest score, source and checkpoint scores.
-		fastest_score = 0
-		fastest_source = ''
-		fastest_cps = list()
-		if dedi_score > 0 and (local_score <= 0 or dedi_score < local_score):
-			fastest_score = dedi_score
-			fastest_cps = dedi_record.cps
-			fastest_source = 'Dedi'
-		elif local_score > 0 and (dedi_score <= 0 or local_score <= dedi_score):
-			fastest_score = local_score
-			fastest_cps = local_record.checkpoints
-			fastest_source = 'Local'
-
-		if isinstance(fastest_cps, list):
-			fastest_cps = ','.join([str(c) for c in fastest_cps])
+		fastest_score, fastest_cps, fastest_source = get_fastest_record(self.app, self.app.get_record_login(login))
 
 		context = await super().get_per_player_data(login)
 		context['record_sector_times'] = fastest_cps
@@ -93,43 +83,8 @@ class CheckpointDiffWidget(WidgetView):
 		self.id = 'pyplanet__widgets_cp_diff'
 
 	async def get_per_player_data(self, login):
-		dedi_score = 0
-		dedi_record = None
-		local_score = 0
-		local_record = None
-		if 'dedimania' in self.app.instance.apps.apps:
-			try:
-				dedi_record = [x for x in self.app.instance.apps.apps['dedimania'].current_records if x.login == login]
-				if len(dedi_record) > 0:
-					dedi_record = dedi_record[0]
-			except:
-				pass
-		if 'local_records' in self.app.instance.apps.apps:
-			try:
-				local_record = [x for x in self.app.instance.apps.apps['local_records'].current_records if x.player.login == login]
-				if len(local_record) > 0:
-					local_record = local_record[0]
-			except:
-				pass
-
-		if dedi_record and hasattr(dedi_record, 'score'):
-			dedi_score = dedi_record.score
-		if local_record and hasattr(local_record, 'score'):
-			local_score = local_record.score
-
-		# Get fastest score, source and checkpoint scores.
-		fastest_score = 0
+		fastest_score, fastest_cps, _ = get_fastest_record(self.app, self.app.get_record_login(login))
 		fastest_source = 'PB'
-		fastest_cps = list()
-		if dedi_score > 0 and (local_score <= 0 or dedi_score < local_score):
-			fastest_score = dedi_score
-			fastest_cps = dedi_record.cps
-		elif local_score > 0 and (dedi_score <= 0 or local_score <= dedi_score):
-			fastest_score = local_score
-			fastest_cps = local_record.checkpoints
-
-		if isinstance(fastest_cps, list):
-			fastest_cps = ','.join([str(c) for c in fastest_cps])
 
 		context = await super().get_per_player_data(login)
 		context['record_sector_times'] = fastest_cps
@@ -1,4 +1,3 @@
-import asyncio
 import datetime
 import logging
 import math
@@ -30,6 +29,7 @@ class Voting(AppConfig):
 		super().__init__(*args, **kwargs)
 
 		self.current_vote = None
+		self.current_vote_jobs = list()
 		self.widget = None
 		self.podium_stage = False
 		self.extend_current_count = 0
@@ -731,47 +731,40 @@ class Voting(AppConfig):
 
 	async def vote_reminder(self, vote):
 		"""
-		Called in a loop to keep informing players via the chat that a vote is open.
+		Called by the scheduler every reminder interval to keep informing players via the chat that a vote is open.
 
 		:param vote: vote that is currently open
 		"""
 
-		await asyncio.sleep(await self.setting_remind_interval.get_value())
-
-		if self.current_vote is not None:
-			required_votes = (self.current_vote.votes_required - len(self.current_vote.votes_current))
-			current_required_votes = (vote.votes_required - len(vote.votes_current))
-			if self.current_vote.action == vote.action and current_required_votes == required_votes:
-				message = '$0cfThere are $fff{}$0cf more {} needed to $fff{}$0cf (use $fffF5$0cf to vote){}.'.format(
-					current_required_votes, ('votes' if current_required_votes > 1 else 'vote'),
-					self.current_vote.action,
-					(' ($fff{}$0cf seconds left)'.format(int(round((
-																		   self.current_vote.time_limit - datetime.datetime.now()).total_seconds()))) if self.current_vote.time_limit is not None else '')
-				)
-				await self.instance.chat(message)
+		if self.current_vote is not vote:
+			return
 
-				asyncio.ensure_future(self.vote_reminder(vote))
+		required_votes = (vote.votes_required - len(vote.votes_current))
+		message = '$0cfThere are $fff{}$0cf more {} needed to $fff{}$0cf (use $fffF5$0cf to vote){}.'.format(
+			required_votes, ('votes' if required_votes > 1 else 'vote'),
+			vote.action,
+			(' ($fff{}$0cf seconds left)'.format(int(round((
+																   vote.time_limit - datetime.datetime.now()).total_seconds()))) if vote.time_limit is not None else '')
+		)
+		await self.instance.chat(message)
 
 	async def vote_canceller(self, vote):
 		"""
-		Called in a loop to keep checking whether the current vote should be cancelled because the time limit is passed.
+		Called by the scheduler when the time limit of the vote is passed, cancels the vote.
 
 		:param vote: vote that is currently open
 		"""
 
-		await asyncio.sleep(1)
+		if self.current_vote is not vote:
+			return
 
-		if self.current_vote is not None and self.current_vote.time_limit is not None:
-			if datetime.datetime.now() > self.current_vote.time_limit:
-				message = '$0cfVote to $fff{}$0cf has timed out after $fff{}$0cf seconds.'.format(
-					self.current_vote.action, await self.setting_voting_timeout.get_value()
-				)
-				await self.instance.chat(message)
+		message = '$0cfVote to $fff{}$0cf has timed out after $fff{}$0cf seconds.'.format(
+			vote.action, await self.setting_voting_timeout.get_value()
+		)
+		await self.instance.chat(message)
 
-				# Hide the voting widget and reset the current vote
-				await self.reset_vote()
-			else:
-				asyncio.ensure_future(self.vote_canceller(vote))
+		# Hide the voting widget and reset the current vote
+		await self.reset_vote()
 
 	async def create_vote(self, action, player, passed_event):
 		"""
@@ -797,12 +790,19 @@ class Voting(AppConfig):
 		new_vote.vote_removed = self.vote_removed
 		new_vote.vote_passed = passed_event
 
+		# Cancel the jobs of a previous vote, if any are left.
+		for job in self.current_vote_jobs:
+			job.cancel()
+		self.current_vote_jobs = list()
+
 		time_limit = await self.setting_voting_timeout.get_value()
 		if time_limit > 0:
 			new_vote.time_limit = datetime.datetime.now() + datetime.timedelta(0, time_limit)
-			asyncio.ensure_future(self.vote_canceller(new_vote))
+			self.current_vote_jobs.append(self.context.scheduler.call_later(time_limit, self.vote_canceller, new_vote))
 
-		asyncio.ensure_future(self.vote_reminder(new_vote))
+		remind_interval = await self.setting_remind_interval.get_value()
+		if remind_interval > 0:
+			self.current_vote_jobs.append(self.context.scheduler.call_every(remind_interval, self.vote_reminder, new_vote))
 
 		# Set the current vote here, so the widget can access it.
 		self.current_vote = new_vote
@@ -820,5 +820,10 @@ class Voting(AppConfig):
 		Called to reset the current vote - will hide the widget and reset the variable.
 		"""
 
+		# Cancel the timeout and reminder of the vote.
+		for job in self.current_vote_jobs:
+			job.cancel()
+		self.current_vote_jobs = list()
+
 		await self.widget.hide()
 		self.current_vote = None
@@ -37,6 +37,7 @@ map_begin = Callback(
 	namespace='maniaplanet',
 	code='map_begin',
 	target=handle_map_begin,
+	ui_batch=True,
 )
 """
 :Signal:
@@ -100,7 +101,8 @@ map_start = Callback(
 	call='Script.Maniaplanet.StartMap_Start',
 	namespace='maniaplanet',
 	code='map_start',
-	target=handle_map_start
+	target=handle_map_start,
+	ui_batch=True,
 )
 """
 :Signal:
@@ -93,6 +93,7 @@ player_connect = Callback(
 	namespace='maniaplanet',
 	code='player_connect',
 	target=handle_player_connect,
+	ui_batch=lambda source: [source[0]],
 )
 """
 :Signal:
@@ -1,11 +1,134 @@
 """
 Maniaplanet Core Models. This models are used in several apps and should be considered as very stable.
 """
+from collections import OrderedDict
+
 from peewee import *
 from pyplanet.core.db import TimedModel
 from pyplanet.utils.functional import empty
 
 
+class PlayerCache:
+	"""
+	Size-bounded cache of the player instances by login. When the cache is full, the least recently used players are evicted,
+	except the pinned players. The player manager pins the players while they are online.
+
+	The maximum size is set by the ``PLAYER_CACHE_SIZE`` setting, None or 0 disables the limit.
+	"""
+	DEFAULT_SIZE = 1000
+
+	def __init__(self, max_size=DEFAULT_SIZE):
+		self.max_size = max_size
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+		self._pins = set()
+		self._pinned = dict()
+		self._recent = OrderedDict()
+
+	def __contains__(self, login):
+		return login in self._pinned or login in self._recent
+
+	def __len__(self):
+		return len(self._pinned) + len(self._recent)
+
+	def __iter__(self):
+		yield from list(self._pinned)
+		yield from list(self._recent)
+
+	def __getitem__(self, login):
+		player = self.get(login)
+		if player is None:
+			raise KeyError(login)
+		return player
+
+	def __setitem__(self, login, player):
+		if login in self._pins:
+			self._pinned[login] = player
+			return
+		self._recent[login] = player
+		self._recent.move_to_end(login)
+		self.evict()
+
+	def __delitem__(self, login):
+		if login in self._pinned:
+			del self._pinned[login]
+		else:
+			del self._recent[login]
+
+	def get(self, login, default=None):
+		"""
+		Get the player and mark it as recently used.
+
+		:param login: Login.
+		:param default: Default when the player isn't in the cache.
+		:return: Player instance or the default.
+		"""
+		player = self._pinned.get(login)
+		if player is None:
+			player = self._recent.get(login)
+			if player is None:
+				self.misses += 1
+				return default
+			self._recent.move_to_end(login)
+		self.hits += 1
+		return player
+
+	def pop(self, login, default=None):
+		player = self._pinned.pop(login, None)
+		if player is None:
+			player = self._recent.pop(login, default)
+		return player
+
+	def pin(self, login, player=None):
+		"""
+		Pin the player, pinned players are never evicted.
+
+		:param login: Login.
+		:param player: Player instance to cache, optional when the player is already in the cache.
+		"""
+		self._pins.add(login)
+		if login in self._recent:
+			self._pinned[login] = self._recent.pop(login)
+		if player is not None:
+			self._pinned[login] = player
+
+	def unpin(self, login):
+		"""
+		Unpin the player, the player is kept as the most recently used player until it gets evicted.
+
+		:param login: Login.
+		"""
+		self._pins.discard(login)
+		if login in self._pinned:
+			self._recent[login] = self._pinned.pop(login)
+			self.evict()
+
+	def evict(self):
+		if not self.max_size:
+			return
+		while self._recent and len(self) > self.max_size:
+			self._recent.popitem(last=False)
+			self.evictions += 1
+
+	def clear(self):
+		self._pinned.clear()
+		self._recent.clear()
+
+	@property
+	def stats(self):
+		"""
+		Statistics of the cache.
+
+		:return: Dictionary with the size, number of pinned players, maximum size, hits, misses and evictions.
+		"""
+		return dict(
+			size=len(self), pinned=len(self._pinned), max_size=self.max_size, hits=self.hits, misses=self.misses,
+			evictions=self.evictions,
+		)
+
+
 class Player(TimedModel):
 	LEVEL_PLAYER = 0
 	LEVEL_OPERATOR = 1
@@ -59,14 +182,18 @@ class Player(TimedModel):
 	the name of the level.
 	"""
 
-	CACHE = dict()
+	CACHE = PlayerCache()
+	"""
+	Cache of the player instances by login, see :class:`pyplanet.apps.core.maniaplanet.models.player.PlayerCache`.
+	"""
 
 	def __str__(self):
 		return self.login
 
 	def __init__(self, *args, **kwargs):
-		self.__flow = PlayerFlow()
-		self.__attributes = PlayerAttributes()
+		# The flow and attributes are only created when used, most player instances (from queries) never use them.
+		self.__flow = None
+		self.__attributes = None
 		super().__init__(*args, **kwargs)
 
 	@property
@@ -77,18 +204,23 @@ class Player(TimedModel):
 		:return: flow object
 		:rtype: pyplanet.apps.core.maniaplanet.models.player.PlayerFlow
 		"""
+		if self.__flow is None:
+			self.__flow = PlayerFlow()
 		return self.__flow
 
 	@property
 	def attributes(self):
+		if self.__attributes is None:
+			self.__attributes = PlayerAttributes()
 		return self.__attributes
 
 	async def save(self, *args, **kwargs):
 		res = await super().save(*args, **kwargs)
-		if self.login not in self.CACHE or (self.login in self.CACHE and id(self) != id(self.CACHE[self.login])):
-			if self.login in self.CACHE and id(self) != id(self.CACHE[self.login]):
-				self.__flow = self.CACHE[self.login].flow
-				self.__attributes = self.CACHE[self.login].attributes
+		cached = self.CACHE.get(self.login)
+		if cached is not self:
+			if cached is not None:
+				self.__flow = cached.__flow
+				self.__attributes = cached.__attributes
 			self.CACHE[self.login] = self
 		return res
 
@@ -102,8 +234,9 @@ class Player(TimedModel):
 		:return: Player instance
 		:rtype: pyplanet.apps.core.maniaplanet.models.player.Player
 		"""
-		if login in cls.CACHE:
-			return cls.CACHE[login]
+		player = cls.CACHE.get(login)
+		if player is not None:
+			return player
 		try:
 			cls.CACHE[login] = player = await cls.get(login=login)
 		except DoesNotExist:
@@ -120,6 +253,14 @@ class Player(TimedModel):
 
 
 class PlayerFlow:
+	__slots__ = (
+		'in_run', 'player_id', 'team_id', 'is_player', 'is_spectator', 'is_temp_spectator', 'is_pure_spectator',
+		'spectator_target', 'force_spectator', 'is_referee', 'is_podium_ready', 'is_using_stereoscopy',
+		'is_managed_by_other_server', 'is_server', 'has_player_slot', 'is_broadcasting', 'has_joined_game', 'zone',
+		'joined_at', 'auto_target', 'target_id', 'flags', 'spectator_status', 'player_login',
+		'royal_server_start_time', 'royal_total_time', 'royal_section_time', 'royal_times', 'royal_block_ids', 'other',
+	)
+
 	def __init__(self):
 		self.in_run = False
 		self.player_id = None
@@ -140,6 +281,11 @@ class PlayerFlow:
 		self.has_joined_game = None
 		self.zone = None
 		self.joined_at = None
+		self.auto_target = None
+		self.target_id = None
+		self.flags = None
+		self.spectator_status = None
+		self.player_login = None
 
 		self.royal_server_start_time = 0
 		self.royal_total_time = 0
@@ -201,8 +347,21 @@ class PlayerFlow:
 		self.spectator_target = data.pop('target')
 		self.team_id = data.pop('team_id')
 
+		# The player itself isn't kept, it would create a reference cycle.
+		data.pop('player', None)
+
 		for key, value in data.items():
-			setattr(self, key, value)
+			if key in self.__slots__:
+				setattr(self, key, value)
+			else:
+				self.other[key] = value
+
+	def __getattr__(self, item):
+		# Unknown state fields are kept in the other dictionary.
+		try:
+			return object.__getattribute__(self, 'other')[item]
+		except (AttributeError, KeyError):
+			raise AttributeError(item)
 
 	def reset_state(self):
 		self.is_player = None
@@ -224,6 +383,8 @@ class PlayerAttributes:
 	"""
 	Hold custom attributes by keys used in several apps.
 	"""
+	__slots__ = ('__attributes',)
+
 	def __init__(self):
 		self.__attributes = dict()
 
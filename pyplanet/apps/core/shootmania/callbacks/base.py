@@ -109,10 +109,12 @@ async def handle_player_request_action_change(source, signal, **kwargs):
 	return dict(time=source['time'], player=player, action_change=source['actionchange'])
 
 async def handle_scores(source, signal, **kwargs):
-	async def get_player_scores(data):
-		player = await _get_player(login=data['login'])
+	# Resolve all the players of the scores at once.
+	players = await Controller.instance.player_manager.get_players([d['login'] for d in source['players']])
+
+	def get_player_scores(data):
 		return dict(
-			player=player, rank=data['rank'], round_points=data['roundpoints'], map_points=data['mappoints'],
+			player=players.get(data['login']), rank=data['rank'], round_points=data['roundpoints'], map_points=data['mappoints'],
 			match_points=data['matchpoints'],
 		)
 	async def get_team_scores(data):
@@ -121,9 +123,9 @@ async def handle_scores(source, signal, **kwargs):
 			map_points=data['mappoints'], match_points=data['matchpoints'],
 		)
 
-	player_scores = await asyncio.gather(*[
+	player_scores = [
 		get_player_scores(d) for d in source['players']
-	])
+	]
 	team_scores = await asyncio.gather(*[
 		get_team_scores(d) for d in source['teams']
 	])
@@ -1,6 +1,6 @@
-import asyncio
 import logging
 
+from pyplanet.contrib.player.exceptions import PlayerNotFound
 from pyplanet.core import Controller
 from pyplanet.core.events import Callback, Signal, handle_generic
 from pyplanet.core.exceptions import SignalGlueStop
@@ -93,8 +93,13 @@ async def handle_respawn(source, signal, **kwargs):
 
 
 async def handle_scores(source, signal, **kwargs):
-	async def get_player_scores(data):
-		player = await Controller.instance.player_manager.get_player(login=data['login'])
+	# Resolve all the players of the scores at once.
+	players = await Controller.instance.player_manager.get_players([d['login'] for d in source['players']])
+
+	def get_player_scores(data):
+		if data['login'] not in players:
+			raise PlayerNotFound('Player not found.')
+		player = players[data['login']]
 		return dict(
 			player=player,
 			best_lap_checkpoints=data['bestlapcheckpoints'],
@@ -123,9 +128,9 @@ async def handle_scores(source, signal, **kwargs):
 			round_points=data['roundpoints'],
 		)
 
-	player_scores = await asyncio.gather(*[
+	player_scores = [
 		get_player_scores(d) for d in source['players']
-	])
+	]
 	team_scores = [
 		get_team_scores(d) for d in source['teams']
 	]
@@ -23,6 +23,38 @@ ROOT_PATH = None
 # This should ALWAYS be overridden by the local settings.
 TMP_PATH = None
 
+# Cache the compiled templates on disk (in the TEMPLATE_CACHE_PATH, defaults to a 'templates' folder in the TMP_PATH), so
+# they don't have to be compiled again after a restart. With TEMPLATE_WARMUP, all templates are compiled in the background
+# during the startup instead of when they are displayed for the first time.
+TEMPLATE_CACHE = True
+TEMPLATE_CACHE_PATH = None
+TEMPLATE_WARMUP = True
+
+# The views displayed to one player (lists, alerts and prompts) are owned by the player, and destroyed when the player
+# disconnects. A player can have UI_MAX_PLAYER_VIEWS views (0 for no limit), the least recently used view is destroyed
+# when the player opens another one. Views without display or action in UI_VIEW_IDLE_TIMEOUT seconds are destroyed as
+# well (0 to disable).
+UI_MAX_PLAYER_VIEWS = 10
+UI_VIEW_IDLE_TIMEOUT = 1800
+
+# The UI updates of all apps while handling a player connect (for the player) or a map begin are collected and sent with
+# one multicall. The batch is flushed when all apps are done, or at the latest after UI_BATCH_DEADLINE seconds (0 to
+# disable the batching).
+UI_BATCH_DEADLINE = 0.5
+
+# The callbacks of the dedicated server are handled in order per player, with at most GBX_CALLBACK_CONCURRENCY handlers
+# running at the same time. When GBX_CALLBACK_QUEUE_SIZE callbacks are waiting, the reading of the socket waits for space,
+# the callbacks with the 'drop' policy are dropped. Callbacks with the 'coalesce' policy replace the previous callback of
+# the same player (or family) that is still waiting.
+GBX_CALLBACK_QUEUE_SIZE = 10000
+GBX_CALLBACK_CONCURRENCY = 50
+GBX_CALLBACK_POLICIES = {
+	'ManiaPlanet.PlayerInfoChanged': 'coalesce',
+	'Script.Trackmania.WarmUp.Status': 'coalesce',
+	'Script.Shootmania.Event.OnShoot': 'drop',
+	'Script.Shootmania.Event.OnNearMiss': 'drop',
+}
+
 # Add your pools (the controller instances per dedicated here) or leave as it is to use a single instance only.
 POOLS = [
 	'default'
@@ -34,6 +66,29 @@ SELF_UPGRADE = True
 # Allow changing the server slots (max players/spectators).
 ALLOW_SLOTS_CHANGE = True
 
+# Start the core components and apps that don't depend on each other concurrently. Disable to start everything one
+# after another (for example when debugging apps that depend on each other without declaring it).
+CONCURRENT_STARTUP = True
+
+# Collect metrics (GBX calls, callbacks, signals, UI queue, database queries and storage operations). The metrics of all
+# pools are exposed in the Prometheus text format on the HTTP endpoint when a port is given, and are readable with the
+# 'metrics' management command. The metrics path defaults to a 'metrics' folder in the TMP_PATH.
+METRICS_ENABLED = False
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = None
+METRICS_PATH = None
+METRICS_INTERVAL = 10
+
+# Event loop policy of the pool processes: 'asyncio', 'uvloop' (requires uvloop to be installed) or 'auto' (uvloop when
+# installed, asyncio otherwise).
+EVENT_LOOP_POLICY = 'asyncio'
+
+# The lag monitor samples the event loop every interval (seconds) and logs the stack of the blocking code when the event
+# loop is blocked longer than the threshold (seconds).
+LAG_MONITOR_ENABLED = True
+LAG_MONITOR_INTERVAL = 0.5
+LAG_MONITOR_THRESHOLD = 0.5
+
 ##########################################
 ################## DB ####################
 ##########################################
@@ -47,6 +102,13 @@ DATABASES = {
 	}
 }
 
+# Log the queries that take longer than the threshold (seconds) with the SQL and the calling app. None to disable.
+DB_SLOW_QUERY_THRESHOLD = 0.5
+
+# Warn when a single signal receiver executes the same query (with other parameters) this many times (N+1 queries).
+# None to disable, mostly useful while developing apps.
+DB_N_PLUS_ONE_THRESHOLD = None
+
 
 ##########################################
 ################ CACHE ###################
@@ -59,6 +121,16 @@ CACHES = {
 	}
 }
 
+# Maximum number of players kept in memory. The online players are always kept, the least recently seen offline players are
+# removed first. Set to None to keep all the players in memory.
+PLAYER_CACHE_SIZE = 1000
+
+# Seconds to remember the logins that are not a known player (bots, server-side entities), to skip the database query.
+PLAYER_NOT_FOUND_TTL = 10
+
+# Maximum seconds to wait for the connect of a player, when a callback is received for a login that is not known yet.
+PLAYER_CONNECT_TIMEOUT = 4
+
 
 ##########################################
 ############### LOGGING ##################
@@ -80,7 +152,10 @@ LOGGING = {
 		},
 		'require_exception': {
 			'()': 'pyplanet.utils.log.RequireException',
-		}
+		},
+		'rate_limit': {
+			'()': 'pyplanet.utils.log.RateLimitFilter',
+		},
 	},
 	'formatters': {
 		'colored': {
@@ -94,13 +169,13 @@ LOGGING = {
 	'handlers': {
 		'console-debug': {
 			'class': 'logging.StreamHandler',
-			'filters': ['require_debug_true'],
+			'filters': ['require_debug_true', 'rate_limit'],
 			'formatter': 'colored',
 			'level': logging.DEBUG,
 		},
 		'console': {
 			'class': 'logging.StreamHandler',
-			'filters': ['require_debug_false'],
+			'filters': ['require_debug_false', 'rate_limit'],
 			'formatter': 'colored',
 			'level': logging.INFO,
 		}
@@ -123,6 +198,12 @@ LOGGING_WRITE_LOGS = False
 LOGGING_ROTATE_LOGS = True
 LOGGING_DIRECTORY = 'logs'
 
+# Rate limit the identical log messages and exception reports (same origin and message). At most LOGGING_RATE_LIMIT
+# messages per LOGGING_RATE_LIMIT_INTERVAL seconds are written, the rest is summarized with a 'repeated N times' message.
+# Set to 0 to disable.
+LOGGING_RATE_LIMIT = 10
+LOGGING_RATE_LIMIT_INTERVAL = 60
+
 # Error reporting
 # See documentation for the options, (docs => privacy).
 # Options:
@@ -1,16 +1,61 @@
+import datetime
+import json
+import os
+import re
+import tempfile
+import time
+
 import pymysql
 import pymysql.cursors
 
+from pyplanet.apps.core.maniaplanet.models import Player, Map
+from pyplanet.conf import settings
+
+
+class StepStats:
+	"""
+	Progress and throughput of one conversion step.
+	"""
+	__slots__ = ('name', 'read', 'inserted', 'skipped', 'missing', 'duration')
+
+	def __init__(self, name):
+		self.name = name
+		self.read = 0
+		self.inserted = 0
+		self.skipped = 0
+		self.missing = 0
+		self.duration = 0.0
+
+	@property
+	def throughput(self):
+		return self.read / self.duration if self.duration else 0.0
+
+	def __str__(self):
+		return '{:<10} {:>10} read {:>10} inserted {:>10} existing {:>8} missing {:>8.1f}s {:>10.0f} rows/s'.format(
+			self.name, self.read, self.inserted, self.skipped, self.missing, self.duration, self.throughput
+		)
+
 
 class BaseConverter:
 	"""
 	Base Converter is the abstract converter class.
 
+	The rows of the source database are streamed in chunks (with a server side cursor). Per chunk, the existing rows are
+	looked up with one query and the new rows are inserted in batches inside of a transaction. The players and maps are
+	mapped to the PyPlanet ids with in-memory tables. After every chunk the progress is saved in the checkpoint file, so
+	an interrupted conversion continues where it stopped when started again. The queries of the steps must have a
+	deterministic order (``ORDER BY`` the primary key), the already processed rows are skipped by their position.
+
 	Please take a look at the other classes bellow.
 	"""
+	INSERT_BATCH_SIZE = 100
+	"""
+	Number of rows per insert query.
+	"""
+
 	def __init__(
 		self, instance, db_type, db_host, db_name, db_user=None, db_password=None, db_port=None, prefix=None,
-		charset='utf8'
+		charset='utf8', chunk_size=500, checkpoint=None, restart=False, **extra
 	):
 		"""
 		Create converter.
@@ -24,6 +69,9 @@ class BaseConverter:
 		:param db_port: Port.
 		:param prefix: Table prefix.
 		:param charset: Charset of source db. Only supporting utf8 now.
+		:param chunk_size: Number of source rows processed at once.
+		:param checkpoint: Path of the checkpoint file, defaults to a file in the TMP_PATH.
+		:param restart: Ignore the progress in the checkpoint file and start from the beginning.
 		:param extra: Any extra parameters given.
 		:type instance: pyplanet.core.instance.Instance
 		"""
@@ -38,6 +86,20 @@ class BaseConverter:
 		self.prefix = prefix or ''
 		self.charset = charset
 
+		self.chunk_size = chunk_size or 500
+		self.checkpoint_path = checkpoint or os.path.join(
+			settings.TMP_PATH or tempfile.gettempdir(),
+			re.sub(r'[^\w.-]+', '_', 'convert-{}-{}-{}-{}-{}.json'.format(
+				self.__class__.__name__.lower(), db_host, db_port or 3306, db_name, self.prefix
+			))
+		)
+		self.progress = dict() if restart else self.load_checkpoint()
+		self.stats = list()
+
+		# Mapping of the player logins and map uids to the ids in the PyPlanet database.
+		self.player_ids = dict()
+		self.map_ids = dict()
+
 		self.connection = None
 
 	async def connect(self):
@@ -50,14 +112,227 @@ class BaseConverter:
 
 		self.connection = pymysql.connect(
 			host=self.db_host, user=self.db_user, password=self.db_password, db=self.db_name, charset=self.charset,
-			port=self.db_port or 3306,
+			port=int(self.db_port or 3306),
 			cursorclass=pymysql.cursors.DictCursor
 		)
 
 	async def start(self):
 		if not self.connection:
 			raise Exception('Please connect first (connect()).')
-		return await self.migrate(self.connection)
+
+		started_at = time.monotonic()
+		await self.load_ids()
+		result = await self.migrate(self.connection)
+
+		print('Conversion finished in {:.1f}s:'.format(time.monotonic() - started_at))
+		for stats in self.stats:
+			print('  {}'.format(stats))
+
+		# Done, the next conversion should start from the beginning.
+		if os.path.exists(self.checkpoint_path):
+			os.remove(self.checkpoint_path)
+		return result
 
 	async def migrate(self, source_connection):
 		raise NotImplementedError
+
+	def load_checkpoint(self):
+		try:
+			with open(self.checkpoint_path, 'r') as fh:
+				progress = json.load(fh)
+			print('Continuing the conversion from the checkpoint \'{}\'.'.format(self.checkpoint_path))
+			return progress
+		except (IOError, ValueError):
+			return dict()
+
+	def save_checkpoint(self):
+		directory = os.path.dirname(self.checkpoint_path)
+		if directory:
+			os.makedirs(directory, exist_ok=True)
+		with open('{}.tmp'.format(self.checkpoint_path), 'w') as fh:
+			json.dump(self.progress, fh)
+		os.replace('{}.tmp'.format(self.checkpoint_path), self.checkpoint_path)
+
+	async def load_ids(self):
+		"""
+		Load the id mapping of all the players and maps in the PyPlanet database, each with one query.
+		"""
+		self.player_ids = dict(await Player.execute(Player.select(Player.login, Player.id).tuples()))
+		self.map_ids = dict(await Map.execute(Map.select(Map.uid, Map.id).tuples()))
+
+	def stream(self, query, skip=0):
+		"""
+		Stream the result of the query from the source database in chunks, with a server side cursor.
+
+		:param query: SQL query.
+		:param skip: Number of rows to skip (already processed).
+		:return: Generator of lists with rows (dictionaries).
+		"""
+		with self.connection.cursor(pymysql.cursors.SSDictCursor) as cursor:
+			cursor.execute(query)
+			while True:
+				rows = cursor.fetchmany(self.chunk_size)
+				if not rows:
+					break
+				if skip >= len(rows):
+					skip -= len(rows)
+					continue
+				yield rows[skip:]
+				skip = 0
+
+	def source_table_exists(self, table):
+		with self.connection.cursor() as cursor:
+			try:
+				cursor.execute('SELECT 1 FROM {} LIMIT 1'.format(table))
+				cursor.fetchall()
+				return True
+			except Exception:
+				return False
+
+	async def insert(self, model, rows):
+		"""
+		Insert the rows in batches, in one transaction.
+
+		:param model: Model class.
+		:param rows: List with dictionaries.
+		"""
+		if not rows:
+			return
+		async with model.objects.atomic():
+			for offset in range(0, len(rows), self.INSERT_BATCH_SIZE):
+				await model.execute(model.insert_many(rows[offset:offset + self.INSERT_BATCH_SIZE]))
+
+	async def run_step(self, name, query, handle_chunk):
+		"""
+		Run a conversion step, process the source rows in chunks and save the progress after every chunk.
+
+		:param name: Name of the step.
+		:param query: SQL query of the source rows, ordered by the primary key.
+		:param handle_chunk: Coroutine function called with the rows and the stats, returns nothing.
+		"""
+		stats = StepStats(name)
+		self.stats.append(stats)
+
+		# The positions of the rows are only valid for the same query.
+		progress = self.progress.get(name)
+		if not progress or progress.get('query') != query:
+			progress = self.progress[name] = dict(rows=0, done=False, query=query)
+		if progress['done']:
+			print('Skipping {}, already converted.'.format(name))
+			return
+
+		print('Migrating {}...'.format(name))
+		started_at = time.monotonic()
+		for rows in self.stream(query, skip=progress['rows']):
+			await handle_chunk(rows, stats)
+			stats.read += len(rows)
+			progress['rows'] += len(rows)
+			self.save_checkpoint()
+
+			stats.duration = time.monotonic() - started_at
+			print('  {} rows ({:.0f} rows/s)'.format(progress['rows'], stats.throughput))
+
+		stats.duration = time.monotonic() - started_at
+		progress['done'] = True
+		self.save_checkpoint()
+
+	async def convert_players(self, query, convert):
+		"""
+		Convert the players.
+
+		:param query: SQL query of the source players, ordered by the primary key.
+		:param convert: Function converting the source row to a dictionary with the player fields (at least login).
+		"""
+		async def handle_chunk(rows, stats):
+			new = dict()
+			for row in rows:
+				data = convert(row)
+				if data['login'] in self.player_ids or data['login'] in new:
+					stats.skipped += 1
+					continue
+				new[data['login']] = dict(data, created_at=datetime.datetime.now(), updated_at=datetime.datetime.now())
+
+			await self.insert(Player, list(new.values()))
+			stats.inserted += len(new)
+			if new:
+				self.player_ids.update(await Player.execute(
+					Player.select(Player.login, Player.id).where(Player.login << list(new.keys())).tuples()
+				))
+
+		await self.run_step('players', query, handle_chunk)
+
+	async def convert_maps(self, query, convert):
+		"""
+		Convert the maps.
+
+		:param query: SQL query of the source maps, ordered by the primary key.
+		:param convert: Function converting the source row to a dictionary with the map fields (at least uid).
+		"""
+		async def handle_chunk(rows, stats):
+			new = dict()
+			for row in rows:
+				data = convert(row)
+				if data['uid'] in self.map_ids or data['uid'] in new:
+					stats.skipped += 1
+					continue
+				new[data['uid']] = dict(data, created_at=datetime.datetime.now(), updated_at=datetime.datetime.now())
+
+			await self.insert(Map, list(new.values()))
+			stats.inserted += len(new)
+			if new:
+				self.map_ids.update(await Map.execute(
+					Map.select(Map.uid, Map.id).where(Map.uid << list(new.keys())).tuples()
+				))
+
+		await self.run_step('maps', query, handle_chunk)
+
+	async def convert_map_player_rows(self, name, model, query, convert, unique=('map', 'player')):
+		"""
+		Convert rows of a model with a map and player relation (records, karma, times).
+
+		:param name: Name of the step.
+		:param model: Model class.
+		:param query: SQL query of the source rows, ordered by the primary key.
+		:param convert: Function converting the source row to a tuple with the map uid, player login and a dictionary with
+						the other fields of the model. Return None to skip the row.
+		:param unique: Fields that identify an existing row, the map and player (ids) and optional other fields.
+		"""
+		def key(data):
+			return tuple(data[field] for field in unique)
+
+		async def handle_chunk(rows, stats):
+			converted = list()
+			for row in rows:
+				result = convert(row)
+				if result is None:
+					stats.skipped += 1
+					continue
+				uid, login, data = result
+				if uid not in self.map_ids or login not in self.player_ids:
+					stats.missing += 1
+					continue
+				converted.append(dict(data, map=self.map_ids[uid], player=self.player_ids[login]))
+			if not converted:
+				return
+
+			# Get the existing rows of the maps and players in the chunk with one query.
+			map_ids = list(set(data['map'] for data in converted))
+			player_ids = list(set(data['player'] for data in converted))
+			existing = set(await model.execute(
+				model.select(*[getattr(model, field) for field in unique]).where(
+					(model.map << map_ids) & (model.player << player_ids)
+				).tuples()
+			))
+
+			new = list()
+			for data in converted:
+				if key(data) in existing:
+					stats.skipped += 1
+					continue
+				existing.add(key(data))
+				new.append(data)
+
+			await self.insert(model, new)
+			stats.inserted += len(new)
+
+		await self.run_step(name, query, handle_chunk)
@@ -2,7 +2,9 @@
 The map contrib will provide map list and information to the apps and core.
 """
 from .manager import MapManager
+from .signals import map_list_changed
 
 __all__ = [
 	'MapManager',
+	'map_list_changed',
 ]
@@ -11,6 +11,7 @@ from pyplanet.apps.core.maniaplanet.models import Map
 from pyplanet.conf import settings
 from pyplanet.contrib import CoreContrib
 from pyplanet.contrib.map.exceptions import MapNotFound, MapException, ModeIncompatible
+from pyplanet.contrib.map.signals import map_list_changed
 from pyplanet.core.exceptions import ImproperlyConfigured
 
 
@@ -200,6 +201,7 @@ class MapManager(CoreContrib):
 
 			async with self.lock:
 				self._maps = ordered_maps
+			await map_list_changed.send_robust({'maps': self._maps})
 
 			# Reload locals for all maps.
 			# TODO: Find better way to remove this and handle it on the folders way.
@@ -238,6 +240,8 @@ class MapManager(CoreContrib):
 						)
 						self._maps.add(map_instance)
 						updated.append(map_instance)
+			if updated:
+				await map_list_changed.send_robust({'maps': self._maps})
 		return updated
 
 	async def get_map_author_nickname(self, map_details):
@@ -450,6 +454,7 @@ class MapManager(CoreContrib):
 						break
 				if the_map:
 					self._maps.remove(the_map)
+					await map_list_changed.send_robust({'maps': self._maps})
 		except Fault as e:
 			if 'unknown' in e.faultString:
 				raise MapNotFound('Dedicated can\'t find map. Already removed?')
@@ -0,0 +1,22 @@
+"""
+This file contains the contrib map signals, related to the map list.
+"""
+from pyplanet.core.events import Signal as _Signal, handle_generic
+from pyplanet.core.events.manager import SignalManager as _SignalManager
+
+
+map_list_changed = _Signal(
+	code='map_list_changed',
+	namespace='contrib.map',
+	process_target=handle_generic
+)
+"""
+Is called after the map list of the map manager has been updated (maps added, removed or the list reloaded). Reporting
+one parameter:
+
+:param maps: The current map list.
+"""
+
+_SignalManager.register_signal([
+	map_list_changed
+])
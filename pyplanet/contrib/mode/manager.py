@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from pyplanet.contrib import CoreContrib
@@ -5,6 +6,91 @@ from pyplanet.contrib.mode.signals import script_mode_changed
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+
+class ModeScriptValues:
+	"""
+	Shadow copy of the mode script settings or variables of the server. Reads are served from the copy, and the updates of
+	all callers within the same loop iteration are merged into one call, only containing the changed keys.
+	"""
+
+	def __init__(self, instance, get_method, set_method):
+		"""
+		:param instance: Instance.
+		:param get_method: Gbx method to retrieve the values.
+		:param set_method: Gbx method to update the values.
+		:type instance: pyplanet.core.instance.Instance
+		"""
+		self._instance = instance
+		self.get_method = get_method
+		self.set_method = set_method
+
+		self.values = None
+		self.pending = dict()
+		self._load_future = None
+		self._write_future = None
+
+	def invalidate(self):
+		"""
+		Drop the copy, the next read retrieves the values from the server.
+		"""
+		self.values = None
+
+	async def get(self, refresh=False):
+		"""
+		Get the values, including the updates that are not yet written.
+
+		:param refresh: Refresh from the server.
+		:return: Copy of the values (dictionary).
+		"""
+		if refresh or self.values is None:
+			# Single flight, concurrent readers wait for the same call.
+			if self._load_future is None:
+				self._load_future = asyncio.ensure_future(self._load())
+			await asyncio.shield(self._load_future)
+
+		values = dict(self.values)
+		values.update(self.pending)
+		return values
+
+	async def update(self, update_dict):
+		"""
+		Update the values, only the changed keys are sent to the server.
+
+		:param update_dict: The dictionary with the partial updated keys and values.
+		"""
+		current = await self.get()
+		changes = {key: value for key, value in update_dict.items() if current.get(key, _MISSING) != value}
+		if not changes:
+			return
+
+		self.pending.update(changes)
+		if self._write_future is None:
+			self._write_future = asyncio.ensure_future(self._write())
+		await asyncio.shield(self._write_future)
+
+	async def _load(self):
+		try:
+			self.values = await self._instance.gbx(self.get_method)
+		finally:
+			self._load_future = None
+
+	async def _write(self):
+		# Give the other callers of this loop iteration the chance to add their changes.
+		await asyncio.sleep(0)
+		changes, self.pending = self.pending, dict()
+		self._write_future = None
+
+		try:
+			await self._instance.gbx(self.set_method, changes)
+		except Exception:
+			# The state of the server is unknown, retrieve it again with the next read.
+			self.invalidate()
+			raise
+		if self.values is not None:
+			self.values.update(changes)
+
 
 class ModeManager(CoreContrib):
 	"""
@@ -32,6 +118,9 @@ class ModeManager(CoreContrib):
 		self._next_settings_update = dict()
 		self._next_variables_update = dict()
 
+		self._settings = ModeScriptValues(instance, 'GetModeScriptSettings', 'SetModeScriptSettings')
+		self._variables = ModeScriptValues(instance, 'GetModeScriptVariables', 'SetModeScriptVariables')
+
 	async def on_start(self):
 		"""
 		Handle startup, just before the apps will start. We will make sure we are ready to get requests for permissions.
@@ -40,8 +129,18 @@ class ModeManager(CoreContrib):
 
 		# Listeners.
 		self._instance.signals.listen('maniaplanet:server_start', self._on_change)
+		self._instance.signals.listen('maniaplanet:map_begin', self._on_map_begin)
+
+	async def _on_map_begin(self, *args, **kwargs):
+		# The match settings can be (re)loaded between the maps.
+		self._settings.invalidate()
+		self._variables.invalidate()
 
 	async def _on_change(self, *args, **kwargs):
+		# The script could be changed, the copies of the settings and variables are outdated.
+		self._settings.invalidate()
+		self._variables.invalidate()
+
 		# Making sure we set the settings + variables.
 		if len(self._next_settings_update.keys()) > 0:
 			logger.debug('Setting mode settings right now!')
@@ -138,22 +237,24 @@ class ModeManager(CoreContrib):
 			name = name.rpartition('\\')[2]
 		self._next_script = name
 
-	async def get_settings(self):
+	async def get_settings(self, refresh=False):
 		"""
-		Get the current mode settings as a dictionary.
+		Get the current mode settings as a dictionary. Served from the copy of the settings, that is refreshed on the
+		script change and the map begin.
+
+		:param refresh: Refresh from server.
 		"""
-		return await self._instance.gbx('GetModeScriptSettings')
+		return await self._settings.get(refresh=refresh)
 
 	async def update_settings(self, update_dict):
 		"""
 		Update the current settings, merges current settings with the provided settings. Replaces by the keys you give
-		if the data already exists.
+		if the data already exists. Only the changed settings are sent, and the updates of multiple callers at the same
+		time are sent together.
 
 		:param update_dict: The dictionary with the partial updated keys and values.
 		"""
-		current_settings = await self.get_settings()
-		current_settings.update(update_dict)
-		await self._instance.gbx('SetModeScriptSettings', current_settings)
+		await self._settings.update(update_dict)
 
 	async def update_next_settings(self, update_dict):
 		"""
@@ -165,22 +266,22 @@ class ModeManager(CoreContrib):
 			self._next_settings_update = dict()
 		self._next_settings_update.update(update_dict)
 
-	async def get_variables(self):
+	async def get_variables(self, refresh=False):
 		"""
 		Get the mode script variables.
+
+		:param refresh: Refresh from server.
 		"""
-		return await self._instance.gbx('GetModeScriptVariables')
+		return await self._variables.get(refresh=refresh)
 
 	async def update_variables(self, update_dict):
 		"""
 		Update the current variables, merges current vars with the provided vars. Replaces by the keys you give
-		if the data already exists.
+		if the data already exists. Only the changed variables are sent.
 
 		:param update_dict: The dictionary with the partial updated keys and values.
 		"""
-		variables = await self.get_variables()
-		variables.update(update_dict)
-		await self._instance.gbx('SetModeScriptVariables', variables)
+		await self._variables.update(update_dict)
 
 	async def update_next_variables(self, update_dict):
 		"""
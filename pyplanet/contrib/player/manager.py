@@ -8,6 +8,8 @@ from pyplanet.apps.core.maniaplanet.models import Player
 from pyplanet.conf import settings
 from pyplanet.contrib import CoreContrib
 from pyplanet.contrib.player.exceptions import PlayerNotFound
+from pyplanet.contrib.player.registry import OnlineRegistry
+from pyplanet.contrib.player.resolver import PlayerResolver
 from pyplanet.contrib.setting.core_settings import performance_mode
 from pyplanet.core.exceptions import ImproperlyConfigured
 from pyplanet.core.signals import pyplanet_performance_mode_begin, pyplanet_performance_mode_end
@@ -45,15 +47,18 @@ class PlayerManager(CoreContrib):
 		self._performance_mode = False
 		# self.lock = asyncio.Lock()
 
-		# Online contains all currently online players.
-		self._online = set()
-		self._online_logins = set()
+		# Indexes of all currently online players.
+		self._online = OnlineRegistry()
+
+		# Limit the cached players, the online players are always kept.
+		Player.CACHE.max_size = settings.PLAYER_CACHE_SIZE
+
+		# Resolves the logins of the callbacks, waits for the connect of unknown logins instead of sleeping.
+		self._resolver = PlayerResolver(
+			missing_ttl=settings.PLAYER_NOT_FOUND_TTL, connect_timeout=settings.PLAYER_CONNECT_TIMEOUT
+		)
 
-		# Counters.
 		self._counter_lock = asyncio.Lock()
-		self._total_count = 0
-		self._players_count = 0
-		self._spectators_count = 0
 
 	@property
 	def performance_mode(self):
@@ -94,39 +99,23 @@ class PlayerManager(CoreContrib):
 
 	async def map_loaded(self, *args, **kwargs):
 		"""
-		Reindex the current number of players and spectators.
+		Resync the spectator state of the online players with the server, in case a player info change has been missed.
 
 		:param args:
 		:param kwargs:
 		:return:
 		"""
-		# Update player and spectator counters.
 		player_list = await self._instance.gbx('GetPlayerList', -1, 0)
 
-		total = 0
-		specs = 0
-		players = 0
-
-		for player in player_list:
-			if self._instance.game.server_is_dedicated and self._instance.game.server_player_login == player['Login']:
+		for info in player_list:
+			player = self._online.get(info['Login'])
+			if not player:
 				continue
-
-			try:
-				info = await self._instance.gbx('GetDetailedPlayerInfo', player['Login'])
-			except:
-				# Player has left during this time.
-				continue
-
-			total += 1
-			if info['IsSpectator']:
-				specs += 1
-			else:
-				players += 1
-
-		async with self._counter_lock:
-			self._total_count = total
-			self._spectators_count = specs
-			self._players_count = players
+			player.flow.is_spectator = bool(info['SpectatorStatus'] % 10)
+			player.flow.is_player = not player.flow.is_spectator
+			player.flow.team_id = info['TeamId']
+			player.flow.player_id = info['PlayerId']
+			self._online.update(player)
 
 	async def handle_connect(self, login):
 		"""
@@ -170,22 +159,16 @@ class PlayerManager(CoreContrib):
 		# Set the join time.
 		player.flow.joined_at = datetime.datetime.now()
 
-		# Update counter and state.
-		async with self._counter_lock:
-			player.flow.player_id = info['PlayerId']
-			player.flow.team_id = info['TeamId']
-			player.flow.is_spectator = bool(info['IsSpectator'])
-			player.flow.is_player = not bool(info['IsSpectator'])
-			player.flow.zone = parse_path(info['Path'])
-
-			self._total_count += 1
-			if player.flow.is_spectator:
-				self._spectators_count += 1
-			else:
-				self._players_count += 1
+		# Update state and indexes.
+		player.flow.player_id = info['PlayerId']
+		player.flow.team_id = info['TeamId']
+		player.flow.is_spectator = bool(info['IsSpectator'])
+		player.flow.is_player = not bool(info['IsSpectator'])
+		player.flow.zone = parse_path(info['Path'])
 
 		self._online.add(player)
-		self._online_logins.add(login)
+		Player.CACHE.pin(login, player)
+		self._resolver.connected(login, player)
 		self.performance_mode = len(self._online) >= await performance_mode.get_value()
 
 		return player
@@ -194,33 +177,19 @@ class PlayerManager(CoreContrib):
 		if not player:
 			return
 
-		if player not in self._online:
+		if self._online.get(player.login) is not player:
 			return
 
 		async with self._counter_lock:
 			if player.flow.is_spectator is True and not is_spectator:
-				self._spectators_count -= 1
-				self._players_count += 1
-
 				await self._instance.signals.get_signal('maniaplanet:player_enter_player_slot').send_robust(dict(
 					player=player,
 				), raw=True)
 			elif player.flow.is_player is True and is_spectator:
-				self._spectators_count += 1
-				self._players_count -= 1
-
 				await self._instance.signals.get_signal('maniaplanet:player_enter_spectator_slot').send_robust(dict(
 					player=player,
 				), raw=True)
 
-			# This is in case of desync happens. Not nice to fix, but currently one of the only options.
-			if self._players_count < 0:
-				self._players_count = 0
-			if self._spectators_count < 0:
-				self._spectators_count = 0
-			if self._total_count < 0:
-				self._total_count = 0
-
 		# Update flow state.
 		payload = kwargs.copy()
 		payload.update(dict(
@@ -228,6 +197,7 @@ class PlayerManager(CoreContrib):
 			target=target, team_id=team_id
 		))
 		player.flow.update_state(**payload)
+		self._online.update(player)
 
 	async def handle_disconnect(self, login):
 		"""
@@ -242,36 +212,22 @@ class PlayerManager(CoreContrib):
 		except:
 			return
 
-		# Update counters.
-		async with self._counter_lock:
-			self._total_count -= 1
-			if player.flow.is_player:
-				self._players_count -= 1
-			else:
-				self._spectators_count -= 1
-
-		if player in self._online:
-			self._online.remove(player)
-		if login in self._online_logins:
-			self._online_logins.remove(login)
+		self._online.remove(login)
 
 		# Calculate the number of seconds on the server and update the total time on server.
 		if player.flow.joined_at:
 			time_on_server = datetime.datetime.now() - player.flow.joined_at
 			player.total_playtime += int(time_on_server.total_seconds())
 
-		try:
-			del Player.CACHE[login]
-		except:
-			pass
 		player.last_seen = datetime.datetime.now()
 		await player.save()
+		Player.CACHE.unpin(login)
 
 		# Clear player/spec state.
 		player.flow.reset_state()
 
 		# Update performance mode status.
-		self.performance_mode = self._total_count >= await performance_mode.get_value()
+		self.performance_mode = len(self._online) >= await performance_mode.get_value()
 
 		return player
 
@@ -281,23 +237,32 @@ class PlayerManager(CoreContrib):
 
 		:param login: Login.
 		:param pk: Primary Key identifier.
-		:param lock: Lock for a sec when receiving.
+		:param lock: Wait for the connect of the player when the login is unknown (``PLAYER_CONNECT_TIMEOUT`` setting).
 		:return: Player or exception if not found
 		:rtype: pyplanet.apps.core.maniaplanet.models.Player
 		"""
-		try:
-			if login:
-				return await Player.get_by_login(login)
-			elif pk:
-				return await Player.get(pk=pk)
-			else:
+		if login:
+			player = await self._resolver.get(login, wait=lock)
+			if player is None:
 				raise PlayerNotFound('Player not found.')
-		except DoesNotExist:
-			if lock:
-				await asyncio.sleep(4)
-				return await self.get_player(login=login, pk=pk, lock=False)
-			else:
+			return player
+		elif pk:
+			try:
+				return await Player.get(pk=pk)
+			except DoesNotExist:
 				raise PlayerNotFound('Player not found.')
+		raise PlayerNotFound('Player not found.')
+
+	async def get_players(self, logins, lock=True):
+		"""
+		Get the players by login, with a single query for all the players that aren't in memory. Use it to resolve all the
+		logins of a scores callback at once.
+
+		:param logins: Logins.
+		:param lock: Wait for the connect of the players when logins are unknown (``PLAYER_CONNECT_TIMEOUT`` setting).
+		:return: Dictionary with the players by login, the unknown logins are left out.
+		"""
+		return await self._resolver.get_many([login for login in logins if login], wait=lock)
 
 	async def get_player_by_id(self, identifier):
 		"""
@@ -306,10 +271,17 @@ class PlayerManager(CoreContrib):
 		:param identifier: Identifier.
 		:return: Player object or None
 		"""
-		for player in self._online:
-			if player.flow.player_id == identifier:
-				return player
-		return None
+		return self._online.get_by_id(identifier)
+
+	def get_online_player(self, login):
+		"""
+		Get the online player by login, without a database query.
+
+		:param login: Login.
+		:return: Player object or None when the player isn't online.
+		:rtype: pyplanet.apps.core.maniaplanet.models.Player
+		"""
+		return self._online.get(login)
 
 	async def save_blacklist(self, filename=None):
 		"""
@@ -431,37 +403,60 @@ class PlayerManager(CoreContrib):
 	@property
 	def online(self):
 		"""
-		Online player list.
+		Online player list. The set is a snapshot that is shared and must not be changed, it's rebuilt after a connect or
+		disconnect.
 		"""
-		return self._online.copy()
+		return self._online.players
 
 	@property
 	def online_logins(self):
 		"""
-		Online player logins list.
+		Online player logins list (snapshot).
+		"""
+		return self._online.logins
+
+	@property
+	def spectator_logins(self):
+		"""
+		Logins of the spectating players (snapshot).
+		"""
+		return self._online.spectator_logins
+
+	@property
+	def player_logins(self):
+		"""
+		Logins of the playing players, not spectating (snapshot).
+		"""
+		return self._online.player_logins
+
+	def get_team_logins(self, team_id):
+		"""
+		Logins of the players in the team (snapshot).
+
+		:param team_id: Team id.
 		"""
-		return self._online_logins.copy()
+		return self._online.get_team_logins(team_id)
 
 	@property
 	def count_all(self):
 		"""
 		Get all player counts (players + spectators).
 		"""
-		return self._total_count
+		return len(self._online)
 
 	@property
 	def count_players(self):
 		"""
 		Get number of playing players.
 		"""
-		return self._players_count
+		return self._online.count_players
 
 	@property
 	def count_spectators(self):
 		"""
 		Get number of spectating players.
 		"""
-		return self._spectators_count
+		return self._online.count_spectators
 
 	@property
 	def max_players(self):
@@ -0,0 +1,151 @@
+"""
+Registry of the online players, indexed by login, player id, team and spectator state. The player manager updates the
+indexes on connect, disconnect and info change, so the lookups and counters in the callbacks don't scan all players.
+"""
+
+
+class OnlineRegistry:
+	"""
+	Indexes of the online players. The snapshots (frozensets) are shared between the callers, reading them doesn't copy. The
+	snapshots of the online players are only rebuilt after a connect or disconnect, the snapshots of the spectators and
+	teams after the state of a player has changed.
+	"""
+
+	def __init__(self):
+		self.by_login = dict()
+		self.by_id = dict()
+		self.teams = dict()
+		self.spectators = set()
+
+		self._indexed = dict()
+		self._snapshots = dict()
+		self._state_snapshots = dict()
+
+	def __len__(self):
+		return len(self.by_login)
+
+	def __contains__(self, login):
+		return login in self.by_login
+
+	def add(self, player):
+		"""
+		Add the player, or update the indexes of the player when already online.
+
+		:param player: Player instance.
+		"""
+		if self.by_login.get(player.login) is not player:
+			self._unindex(player.login)
+			self.by_login[player.login] = player
+			self._invalidate()
+		self.update(player)
+
+	def remove(self, login):
+		"""
+		Remove the player.
+
+		:param login: Login of the player.
+		:return: Player instance or None when the player wasn't online.
+		"""
+		player = self.by_login.pop(login, None)
+		if player is None:
+			return None
+		self._unindex(login)
+		self._invalidate()
+		return player
+
+	def update(self, player):
+		"""
+		Update the indexes of the player with the state of the flow (player id, team and spectator state).
+
+		:param player: Player instance.
+		"""
+		if self.by_login.get(player.login) is not player:
+			return
+		state = (player.flow.player_id, player.flow.team_id, bool(player.flow.is_spectator))
+		if self._indexed.get(player.login) == state:
+			return
+
+		self._unindex(player.login)
+		player_id, team_id, is_spectator = state
+		if player_id is not None:
+			self.by_id[player_id] = player
+		self.teams.setdefault(team_id, set()).add(player.login)
+		if is_spectator:
+			self.spectators.add(player.login)
+		self._indexed[player.login] = state
+		self._state_snapshots.clear()
+
+	def get(self, login):
+		return self.by_login.get(login)
+
+	def get_by_id(self, player_id):
+		return self.by_id.get(player_id)
+
+	@property
+	def players(self):
+		"""
+		Snapshot of the online players.
+		"""
+		return self._snapshot('players', lambda: frozenset(self.by_login.values()))
+
+	@property
+	def logins(self):
+		"""
+		Snapshot of the online logins.
+		"""
+		return self._snapshot('logins', lambda: frozenset(self.by_login))
+
+	@property
+	def spectator_logins(self):
+		"""
+		Snapshot of the logins of the spectators.
+		"""
+		return self._snapshot('spectator_logins', lambda: frozenset(self.spectators), state=True)
+
+	@property
+	def player_logins(self):
+		"""
+		Snapshot of the logins of the players (not spectating).
+		"""
+		return self._snapshot('player_logins', lambda: frozenset(self.by_login.keys() - self.spectators), state=True)
+
+	def get_team_logins(self, team_id):
+		"""
+		Snapshot of the logins in the team.
+
+		:param team_id: Team id.
+		"""
+		return self._snapshot(('team', team_id), lambda: frozenset(self.teams.get(team_id, ())), state=True)
+
+	@property
+	def count_spectators(self):
+		return len(self.spectators)
+
+	@property
+	def count_players(self):
+		return len(self.by_login) - len(self.spectators)
+
+	def _snapshot(self, key, build, state=False):
+		snapshots = self._state_snapshots if state else self._snapshots
+		snapshot = snapshots.get(key)
+		if snapshot is None:
+			snapshot = snapshots[key] = build()
+		return snapshot
+
+	def _invalidate(self):
+		self._snapshots.clear()
+		self._state_snapshots.clear()
+
+	def _unindex(self, login):
+		state = self._indexed.pop(login, None)
+		if state is None:
+			return
+		player_id, team_id, _ = state
+		if player_id is not None and getattr(self.by_id.get(player_id), 'login', None) == login:
+			del self.by_id[player_id]
+		team = self.teams.get(team_id)
+		if team is not None:
+			team.discard(login)
+			if not team:
+				del self.teams[team_id]
+		self.spectators.discard(login)
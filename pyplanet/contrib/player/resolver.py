@@ -0,0 +1,188 @@
+"""
+The resolver translates the logins from the callbacks into player instances. The concurrent lookups of a login share one
+database query, the unknown logins (bots, server-side entities) are remembered for a short time, and the lookups of a
+player that is connecting wait for the connect instead of sleeping for a fixed time.
+"""
+import asyncio
+import time
+
+from pyplanet.apps.core.maniaplanet.models import Player
+from pyplanet.core import metrics
+
+PLAYER_LOOKUPS = metrics.registry.counter(
+	'pyplanet_player_lookups_total', 'Player lookups by login, per result.', labelnames=('result',)
+)
+
+
+class PlayerResolver:
+	"""
+	Resolver of the players by login, used by the player manager.
+
+	:ivar pending: The in-flight lookups, by login.
+	:ivar missing: The expiry time of the unknown logins, by login.
+	:ivar waiters: The futures waiting for the connect of the player, by login.
+	"""
+
+	def __init__(self, missing_ttl=10, connect_timeout=4):
+		"""
+		:param missing_ttl: Seconds to remember the unknown logins, 0 to disable.
+		:param connect_timeout: Maximum seconds to wait for the connect of an unknown login, 0 to disable.
+		"""
+		self.missing_ttl = missing_ttl
+		self.connect_timeout = connect_timeout
+
+		self.pending = dict()
+		self.missing = dict()
+		self.waiters = dict()
+
+	def is_missing(self, login, now=None):
+		"""
+		Check if the login is known to not exist (within the time to live).
+
+		:param login: Login.
+		:param now: Current time, defaults to the monotonic clock.
+		:return: Boolean
+		"""
+		expires = self.missing.get(login)
+		if expires is None:
+			return False
+		if expires > (time.monotonic() if now is None else now):
+			return True
+		del self.missing[login]
+		return False
+
+	def connected(self, login, player):
+		"""
+		Mark the player as connected (existing), and wake up the lookups waiting for the connect.
+
+		:param login: Login.
+		:param player: Player instance.
+		"""
+		self.missing.pop(login, None)
+		for future in self.waiters.pop(login, set()):
+			if not future.done():
+				future.set_result(player)
+
+	async def get(self, login, wait=True):
+		"""
+		Get the player by login.
+
+		:param login: Login.
+		:param wait: Wait for the connect of the player when the login is unknown.
+		:return: Player instance or None when the player doesn't exist.
+		:rtype: pyplanet.apps.core.maniaplanet.models.Player
+		"""
+		return (await self.get_many([login], wait=wait)).get(login)
+
+	async def get_many(self, logins, wait=True):
+		"""
+		Get the players by login. All the logins that aren't cached are fetched with a single query.
+
+		:param logins: Logins.
+		:param wait: Wait for the connect of the players when logins are not found, not for the logins that are already
+					 known to be missing (within the ``missing_ttl``).
+		:return: Dictionary with the players by login, the unknown logins are left out.
+		"""
+		players = dict()
+		fetch = list()
+		futures = dict()
+
+		for login in set(logins):
+			player = Player.CACHE.get(login)
+			if player is not None:
+				PLAYER_LOOKUPS.inc(labels=('cached',))
+				players[login] = player
+			elif login in self.pending:
+				futures[login] = self.pending[login]
+			elif not self.is_missing(login):
+				fetch.append(login)
+
+		if fetch:
+			for login in fetch:
+				futures[login] = self.pending[login] = asyncio.Future()
+			PLAYER_LOOKUPS.inc(len(fetch), labels=('query',))
+			await self._fetch(fetch)
+
+		for login, future in futures.items():
+			player = await asyncio.shield(future)
+			if player is not None:
+				players[login] = player
+
+		# Only wait for the logins that were just looked up, the known missing logins (bots) are returned directly.
+		unknown = [login for login in futures if login not in players]
+		if unknown and wait and self.connect_timeout:
+			connected = await asyncio.gather(*[self.wait_connect(login) for login in unknown])
+			players.update((login, player) for login, player in zip(unknown, connected) if player is not None)
+		if len(players) < len(set(logins)):
+			PLAYER_LOOKUPS.inc(len(set(logins)) - len(players), labels=('missing',))
+		return players
+
+	async def wait_connect(self, login, timeout=None):
+		"""
+		Wait for the connect of the player, within the timeout.
+
+		:param login: Login.
+		:param timeout: Timeout in seconds, defaults to the connect timeout of the resolver.
+		:return: Player instance or None when the player didn't connect in time.
+		"""
+		future = asyncio.Future()
+		self.waiters.setdefault(login, set()).add(future)
+
+		# The player could have connected while the lookup was running.
+		player = Player.CACHE.get(login)
+		if player is not None:
+			self._discard_waiter(login, future)
+			return player
+
+		try:
+			return await asyncio.wait_for(future, timeout or self.connect_timeout)
+		except asyncio.TimeoutError:
+			return None
+		finally:
+			self._discard_waiter(login, future)
+
+	async def _fetch(self, logins):
+		try:
+			if len(logins) == 1:
+				result = [await Player.get_by_login(logins[0], default=None)]
+			else:
+				result = await Player.execute(Player.select().where(Player.login.in_(logins)))
+		except BaseException as e:
+			for login in logins:
+				self._resolve(login, exception=e)
+			raise
+
+		found = dict()
+		for player in result:
+			if player is None:
+				continue
+			# Keep the cached instance (with the flow), it could have been cached during the query.
+			cached = Player.CACHE.get(player.login)
+			if cached is None:
+				Player.CACHE[player.login] = cached = player
+			found[player.login] = cached
+
+		expires = time.monotonic() + self.missing_ttl
+		for login in logins:
+			if login not in found and self.missing_ttl:
+				self.missing[login] = expires
+			self._resolve(login, found.get(login))
+
+	def _resolve(self, login, player=None, exception=None):
+		future = self.pending.pop(login, None)
+		if future is None or future.done():
+			return
+		if exception is not None:
+			future.set_exception(exception)
+			# Only the concurrent lookups (if any) see the exception, the fetching lookup raises it itself.
+			future.add_done_callback(lambda f: f.exception())
+		else:
+			future.set_result(player)
+
+	def _discard_waiter(self, login, future):
+		waiters = self.waiters.get(login)
+		if waiters is None:
+			return
+		waiters.discard(future)
+		if not waiters:
+			del self.waiters[login]
@@ -0,0 +1,169 @@
+"""
+Benchmark helpers: measure the callback throughput, event loop lag and signal latency of an instance that is connected
+to the fake dedicated server (see :class:`pyplanet.core.gbx.dedicated.FakeDedicated`).
+"""
+import asyncio
+import collections
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(values, pct):
+	"""
+	Get the percentile of the values (nearest rank).
+
+	:param values: Sorted list of values.
+	:param pct: Percentile, between 0 and 100.
+	:return: Value or None when there are no values.
+	"""
+	if not values:
+		return None
+	rank = max(int(math.ceil(pct / 100.0 * len(values))), 1)
+	return values[min(rank, len(values)) - 1]
+
+
+class Benchmark:
+	"""
+	The benchmark instruments the callback handling of the instance's GBX client and samples the event loop lag, while the
+	fake dedicated server is sending the load.
+
+	.. code-block:: python
+
+		benchmark = Benchmark(instance, dedicated)
+		await benchmark.start()
+		await dedicated.race(rounds=10)
+		await benchmark.wait_idle()
+		benchmark.stop()
+		print('\\n'.join(benchmark.report()))
+
+	"""
+
+	def __init__(self, instance, dedicated, lag_interval=0.05):
+		"""
+		Initiate benchmark.
+
+		:param instance: Instance connected to the fake dedicated server.
+		:param dedicated: Fake dedicated server.
+		:param lag_interval: Interval of the event loop lag samples in seconds.
+		:type instance: pyplanet.core.instance.Instance
+		:type dedicated: pyplanet.core.gbx.dedicated.FakeDedicated
+		"""
+		self.instance = instance
+		self.dedicated = dedicated
+		self.lag_interval = lag_interval
+
+		self.loop = asyncio.get_event_loop()
+		self.started_at = None
+		self.finished_at = None
+		self.callbacks_offset = 0
+		self.handled = 0
+		self.in_flight = 0
+
+		self.latencies = collections.defaultdict(list)
+		self.lags = list()
+
+		self._lag_task = None
+
+	async def start(self):
+		"""
+		Start measuring. Callbacks that are sent before the start are not counted in the throughput.
+		"""
+		gbx = self.instance.gbx
+		gbx.handle_callback = self.instrument(gbx.handle_callback, lambda method, data: method)
+		gbx.handle_scripted = self.instrument(gbx.handle_scripted, lambda method, data: 'Script.{}'.format(data[0]))
+
+		self.started_at = self.loop.time()
+		self.callbacks_offset = self.dedicated.callbacks_sent
+		self.dedicated.sent_at.clear()
+		self._lag_task = asyncio.ensure_future(self.sample_lag())
+
+	def stop(self):
+		"""
+		Stop measuring.
+		"""
+		self.finished_at = self.loop.time()
+		if self._lag_task:
+			self._lag_task.cancel()
+			self._lag_task = None
+
+	def instrument(self, handler, get_key):
+		"""
+		Wrap the callback handler to measure the latency, from sending the callback at the fake dedicated server till the
+		signal has been handled completely.
+		"""
+		async def wrapper(handle_nr, method, data):
+			key = get_key(method, data)
+			sent_queue = self.dedicated.sent_at.get(key)
+			sent_at = sent_queue.popleft() if sent_queue else None
+
+			self.in_flight += 1
+			try:
+				return await handler(handle_nr, method, data)
+			finally:
+				self.in_flight -= 1
+				if sent_at is not None:
+					self.handled += 1
+					self.latencies[key].append(self.loop.time() - sent_at)
+		return wrapper
+
+	async def sample_lag(self):
+		while True:
+			expected_at = self.loop.time() + self.lag_interval
+			await asyncio.sleep(self.lag_interval)
+			self.lags.append(max(self.loop.time() - expected_at, 0.0))
+
+	async def wait_idle(self, timeout=60.0):
+		"""
+		Wait until all the callbacks sent by the fake dedicated server are handled.
+
+		:param timeout: Maximum seconds to wait.
+		:return: Boolean, True when all callbacks are handled.
+		"""
+		deadline = self.loop.time() + timeout
+		while self.loop.time() < deadline:
+			if self.handled >= self.dedicated.callbacks_sent - self.callbacks_offset and self.in_flight == 0:
+				return True
+			await asyncio.sleep(0.01)
+		return False
+
+	@property
+	def duration(self):
+		if self.started_at is None:
+			return 0.0
+		return (self.finished_at or self.loop.time()) - self.started_at
+
+	def report(self):
+		"""
+		Get the report as lines of text.
+
+		:return: List of lines.
+		"""
+		lags = sorted(self.lags)
+		sent = self.dedicated.callbacks_sent - self.callbacks_offset
+		duration = self.duration
+
+		def ms(value):
+			return '{:.2f}'.format(value * 1000) if value is not None else '-'
+
+		lines = [
+			'Benchmark results:',
+			'  Duration:           {:.3f}s'.format(duration),
+			'  Callbacks sent:     {}'.format(sent),
+			'  Callbacks handled:  {}'.format(self.handled),
+			'  Throughput:         {:.1f} callbacks/s'.format(self.handled / duration if duration else 0),
+			'  Queries received:   {}'.format(self.dedicated.queries_received),
+			'  Event loop lag:     p50 {}ms, p99 {}ms, max {}ms ({} samples)'.format(
+				ms(percentile(lags, 50)), ms(percentile(lags, 99)), ms(lags[-1] if lags else None), len(lags)
+			),
+			'',
+			'  {:<45} {:>8} {:>10} {:>10} {:>10} {:>10}'.format('Signal latency (ms)', 'count', 'p50', 'p95', 'p99', 'max'),
+		]
+		for key, values in sorted(self.latencies.items(), key=lambda item: -len(item[1])):
+			values = sorted(values)
+			lines.append('  {:<45} {:>8} {:>10} {:>10} {:>10} {:>10}'.format(
+				key, len(values), ms(percentile(values, 50)), ms(percentile(values, 95)), ms(percentile(values, 99)),
+				ms(values[-1]),
+			))
+		return lines
@@ -8,13 +8,23 @@ import logging
 import peewee
 import peewee_async
 
+from pyplanet.conf import settings
 from pyplanet.core.exceptions import ImproperlyConfigured
+from .profiler import profiler
 from .registry import Registry
 from .migrator import Migrator
 from .server_info import ServerInfo
 
 Proxy = peewee.Proxy()
 
+POOLED_ENGINES = {
+	'peewee_async.MySQLDatabase': 'peewee_async.PooledMySQLDatabase',
+	'peewee_async.PostgresqlDatabase': 'peewee_async.PooledPostgresqlDatabase',
+}
+"""
+Pooled variant of the engines, used when the pool size is configured.
+"""
+
 
 class Database:
 	def __init__(self, engine_cls, instance, *args, **kwargs):
@@ -42,20 +52,39 @@ class Database:
 
 	@classmethod
 	def create_from_settings(cls, instance, conf):
+		profiler.configure(
+			slow_query_threshold=settings.DB_SLOW_QUERY_THRESHOLD, n_plus_one_threshold=settings.DB_N_PLUS_ONE_THRESHOLD
+		)
+
 		try:
-			engine_path, _, cls_name = conf['ENGINE'].rpartition('.')
+			engine_name = conf['ENGINE']
 			db_name = conf['NAME']
-			db_options = conf['OPTIONS'] if 'OPTIONS' in conf and conf['OPTIONS'] else dict()
+			db_options = dict(conf['OPTIONS']) if 'OPTIONS' in conf and conf['OPTIONS'] else dict()
 
 			# FIX for #331. Replace utf8 by utf8mb4 in the mysql driver encoding.
-			if conf['ENGINE'] == 'peewee_async.MySQLDatabase' and 'charset' in db_options and db_options['charset'] == 'utf8':
+			if engine_name == 'peewee_async.MySQLDatabase' and 'charset' in db_options and db_options['charset'] == 'utf8':
 				logging.info('Forcing to use \'utf8mb4\' instead of \'utf8\' for the MySQL charset option! (Fix #331).')
 				db_options['charset'] = 'utf8mb4'
 
+			# Use a connection pool when the pool size is configured.
+			if conf.get('POOL_MIN_SIZE') or conf.get('POOL_MAX_SIZE'):
+				engine_name = POOLED_ENGINES.get(engine_name, engine_name)
+				if engine_name not in POOLED_ENGINES.values():
+					logging.warning('The database engine doesn\'t support a connection pool, ignoring the pool size!')
+				else:
+					db_options['min_connections'] = conf.get('POOL_MIN_SIZE') or 1
+					db_options['max_connections'] = conf.get('POOL_MAX_SIZE') or max(db_options['min_connections'], 10)
+					if db_options['min_connections'] > db_options['max_connections']:
+						raise ImproperlyConfigured('The database POOL_MIN_SIZE can\'t be larger than the POOL_MAX_SIZE!')
+
+			engine_path, _, cls_name = engine_name.rpartition('.')
+
 			# We will try to load it so we have the validation inside this class.
 			engine = getattr(importlib.import_module(engine_path), cls_name)
 		except ImportError:
 			raise ImproperlyConfigured('Database engine doesn\'t exist!')
+		except ImproperlyConfigured:
+			raise
 		except Exception as e:
 			raise ImproperlyConfigured('Database configuration isn\'t complete or engine could\'t be found!')
 
@@ -89,10 +118,11 @@ class Database:
 		logging.info('Database connection established!')
 
 	async def initiate(self):
-		# Create the migration table.
+		# Create the migration tables.
 		from .models import migration
 		with self.allow_sync():
 			migration.Migration.create_table(True)
+			migration.MigrationFingerprint.create_table(True)
 
 		# Execute checks.
 		with self.allow_sync():
@@ -107,6 +137,7 @@ class Database:
 		with self.allow_sync():
 			try:
 				migration.Migration.drop_table(True, True)
+				migration.MigrationFingerprint.drop_table(True, True)
 			except:
 				pass
 
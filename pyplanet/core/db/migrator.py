@@ -3,9 +3,11 @@ The database migrator class has logic for migrating existing models and holds so
 and differences.
 """
 import asyncio
-
+import hashlib
 import importlib
 import logging
+import time
+
 import peewee
 
 from playhouse.sqlite_ext import SqliteExtDatabase
@@ -44,13 +46,35 @@ class Migrator:
 		raise ImproperlyConfigured('Database engine doesn\'t support Migrations!')
 
 	async def create_tables(self):
+		# Get all tables at once instead of checking the existence per model.
+		existing = set(self.db.engine.get_tables())
+
 		creating = list()
 		for name, (app, name, model) in self.db.registry.models.items():
-			if not model.table_exists():
+			if model._meta.schema:
+				exists = model.table_exists()
+			else:
+				exists = model._meta.db_table in existing
+			if not exists:
 				creating.append(model)
 				self.pass_migrations.add(app.label)
 
-		self.db.engine.create_tables(creating, safe=True)
+		if creating:
+			self.db.engine.create_tables(creating, safe=True)
+
+	def get_fingerprint(self):
+		"""
+		Get the fingerprint of the models and migrations of all the apps. When the fingerprint equals the fingerprint of the
+		last successful migrate, all tables exist and all migrations are applied.
+
+		:return: Hex digest.
+		"""
+		parts = list()
+		for label, migration_files in sorted(self.db.registry.app_migrations.items()):
+			parts.append('{}:{}'.format(label, ','.join(name for _, _, name, _ in migration_files)))
+		for key, (_, _, model) in sorted(self.db.registry.models.items()):
+			parts.append('{}={}'.format(key, model._meta.db_table))
+		return hashlib.sha1('\n'.join(parts).encode()).hexdigest()
 
 	async def check(self):
 		"""
@@ -84,41 +108,59 @@ class Migrator:
 
 		:return:
 		"""
-		from .models.migration import Migration
+		from .models.migration import Migration, MigrationFingerprint
+		started_at = time.monotonic()
+
+		fingerprint = self.get_fingerprint()
+		if [row.fingerprint for row in MigrationFingerprint.select()] == [fingerprint]:
+			logger.debug('Database is up to date (migrations checked in {:.3f}s).'.format(time.monotonic() - started_at))
+			return
+
+		# Get all applied migrations in one query.
+		applied = set(
+			(migration.app, migration.name) for migration in Migration.select().where(Migration.applied == True)
+		)
 
 		# Create tables + skip migrations.
 		await self.create_tables()
 
 		# Look for app migrations that are not yet applied.
+		faked = list()
+		executed = 0
 		for app, migration_files in self.db.registry.app_migrations.items():
 			if not migration_files:
 				continue
 
-			# Get module path + current applied migrations.
+			# Get module path.
 			app_module = self.instance.apps.apps[app].module.__name__
-			applied_migrations = [p.name for p in Migration.select().where(
-				(Migration.app == app) & (Migration.applied == True)
-			)]
 
 			# For each migration file.
 			for full_path, folder, name, ext in migration_files:
-				if name in applied_migrations:
+				if (app, name) in applied:
 					continue
 				if app in self.pass_migrations:
 					# Fake the migration, we just created all the models for this app. Initial setup.
-					Migration.create(
-						app=app,
-						name=name,
-						applied=True
-					)
+					faked.append(dict(app=app, name=name, applied=True))
 					continue
 
 				# Apply migration..
 				self.run_migration(name, app, app_module)
+				executed += 1
 
 				# Log message.
 				logger.info('Successfully executed migration: {}'.format(name))
 
+		if faked:
+			Migration.insert_many(faked).execute()
+
+		# Save the fingerprint so the next start can skip the checks when nothing changed.
+		MigrationFingerprint.delete().execute()
+		MigrationFingerprint.create(fingerprint=fingerprint)
+
+		logger.info('Database migrations checked in {:.3f}s ({} executed, {} skipped for new tables).'.format(
+			time.monotonic() - started_at, executed, len(faked)
+		))
+
 	def run_migration(self, name, app_label, app_module, save_migration=True):
 		"""
 		Run + apply migration to the actual database.
@@ -5,11 +5,21 @@ from peewee import DateTimeField
 from peewee_async import Manager
 
 from .database import Proxy
+from .profiler import profiler
 
 
 class ObjectManager(Manager):
 	database = Proxy
 
+	async def execute(self, query):
+		return await profiler.profile(query, super().execute(query))
+
+	async def count(self, query, clear_limit=False):
+		return await profiler.profile(query, super().count(query, clear_limit=clear_limit), query_type='CountQuery')
+
+	async def scalar(self, query, as_tuple=False):
+		return await profiler.profile(query, super().scalar(query, as_tuple=as_tuple), query_type='ScalarQuery')
+
 	async def get_related(self, instance, related_name, single_backref=False):
 		"""
 		return related instance for foreign key relationship
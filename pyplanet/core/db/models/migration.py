@@ -9,3 +9,13 @@ class Migration(Model):
 
 	class Meta:
 		database = Proxy
+
+
+class MigrationFingerprint(Model):
+	"""
+	Fingerprint of the models and migrations of the last successful migrate.
+	"""
+	fingerprint = CharField(max_length=40)
+
+	class Meta:
+		database = Proxy
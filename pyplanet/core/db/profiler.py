@@ -0,0 +1,213 @@
+"""
+The query profiler times all the database queries executed through the object manager, logs the slow queries and detects
+signal receivers that execute many similar queries (N+1 queries).
+"""
+import asyncio
+import logging
+import sys
+import time
+
+from pyplanet.core import metrics
+
+logger = logging.getLogger(__name__)
+
+DB_QUERY_DURATION = metrics.registry.histogram(
+	'pyplanet_db_query_duration_seconds', 'Duration of the database queries.', labelnames=('model', 'query')
+)
+DB_QUERY_ERRORS = metrics.registry.counter(
+	'pyplanet_db_query_errors_total', 'Database queries that raised an exception.', labelnames=('model', 'query')
+)
+DB_QUERIES = metrics.registry.counter(
+	'pyplanet_db_queries_total', 'Database queries per app (of the model).', labelnames=('app', 'query')
+)
+DB_SLOW_QUERIES = metrics.registry.counter(
+	'pyplanet_db_slow_queries_total', 'Database queries slower than the slow query threshold.', labelnames=('app',)
+)
+
+
+def _current_task():
+	try:
+		if hasattr(asyncio, 'current_task'):
+			return asyncio.current_task()
+		return asyncio.Task.current_task()
+	except RuntimeError:
+		return None
+
+
+class ReceiverScope:
+	"""
+	Queries executed by one call of a signal receiver.
+	"""
+	__slots__ = ('name', 'app', 'counts')
+
+	def __init__(self, name, app):
+		self.name = name
+		self.app = app
+		self.counts = dict()
+
+	def record(self, sql):
+		"""
+		Record the query.
+
+		:param sql: SQL of the query (without the parameters).
+		:return: Number of times the same query has been executed in the scope.
+		"""
+		count = self.counts[sql] = self.counts.get(sql, 0) + 1
+		return count
+
+
+class QueryProfiler:
+	"""
+	The query profiler is configured with the ``DB_SLOW_QUERY_THRESHOLD`` and ``DB_N_PLUS_ONE_THRESHOLD`` settings.
+	"""
+
+	def __init__(self):
+		self.slow_query_threshold = None
+		self.n_plus_one_threshold = None
+
+		# App labels by model class and by module name of the app.
+		self.model_apps = dict()
+		self.app_modules = dict()
+		self._module_apps = dict()
+
+		# Stack of receiver scopes by task.
+		self.scopes = dict()
+
+	def configure(self, slow_query_threshold=None, n_plus_one_threshold=None):
+		self.slow_query_threshold = slow_query_threshold
+		self.n_plus_one_threshold = n_plus_one_threshold
+
+	def register_app(self, app, models):
+		"""
+		Register the app and its models, to be able to label the queries with the app.
+
+		:param app: App config instance.
+		:param models: List with tuples (name, model class).
+		:type app: pyplanet.apps.config.AppConfig
+		"""
+		self.app_modules[app.name] = app.label
+		self._module_apps.clear()
+		for _, model in models:
+			self.model_apps[model] = app.label
+
+	def get_module_app(self, module):
+		"""
+		Get the label of the app the module belongs to.
+
+		:param module: Module name.
+		:return: App label or empty string.
+		"""
+		try:
+			return self._module_apps[module]
+		except KeyError:
+			pass
+		label = ''
+		for name, app_label in self.app_modules.items():
+			if (module == name or module.startswith(name + '.')) and len(name) > len(label):
+				label = app_label
+		self._module_apps[module] = label
+		return label
+
+	def enter(self, receiver):
+		"""
+		Enter the scope of a signal receiver (in the current task).
+
+		:param receiver: Receiver function.
+		:return: Scope or None when the N+1 detection is disabled.
+		"""
+		if not self.n_plus_one_threshold:
+			return None
+		task = _current_task()
+		if task is None:
+			return None
+		module = getattr(receiver, '__module__', None) or ''
+		scope = ReceiverScope(
+			'{}.{}'.format(module, getattr(receiver, '__qualname__', repr(receiver))), self.get_module_app(module)
+		)
+		self.scopes.setdefault(task, list()).append(scope)
+		return scope
+
+	def leave(self, scope):
+		if scope is None:
+			return
+		task = _current_task()
+		stack = self.scopes.get(task)
+		if stack and scope in stack:
+			stack.remove(scope)
+		if not stack:
+			self.scopes.pop(task, None)
+
+	def get_scope(self):
+		stack = self.scopes.get(_current_task())
+		return stack[-1] if stack else None
+
+	async def profile(self, query, coro, query_type=None):
+		"""
+		Execute and profile the query.
+
+		:param query: Peewee query.
+		:param coro: Coroutine executing the query.
+		:param query_type: Type of the query, defaults to the class name of the query.
+		:return: Result of the query.
+		"""
+		model = getattr(query, 'model_class', None)
+		labels = (getattr(model, '__name__', ''), query_type or type(query).__name__)
+		app = self.model_apps.get(model, '')
+		scope = self.get_scope() if self.scopes else None
+
+		started_at = time.perf_counter()
+		try:
+			return await coro
+		except Exception:
+			DB_QUERY_ERRORS.inc(labels=labels)
+			raise
+		finally:
+			duration = time.perf_counter() - started_at
+			DB_QUERY_DURATION.observe(duration, labels=labels)
+			DB_QUERIES.inc(labels=(app, labels[1]))
+
+			if self.slow_query_threshold and duration >= self.slow_query_threshold:
+				DB_SLOW_QUERIES.inc(labels=(app,))
+				logger.warning('Slow query ({:.3f}s, model of {}) by {}: {}'.format(
+					duration, app or 'core', scope.name if scope else self.find_caller(), self.get_sql(query)
+				))
+			if scope is not None:
+				self.check_n_plus_one(scope, query)
+
+	def check_n_plus_one(self, scope, query):
+		sql = self.get_sql(query)
+		if scope.record(sql) == self.n_plus_one_threshold:
+			logger.warning(
+				'Possible N+1 queries: receiver {} (app {}) executed {} similar queries, consider a join or a single query '
+				'with IN: {}'.format(scope.name, scope.app or 'core', self.n_plus_one_threshold, sql)
+			)
+
+	def find_caller(self):
+		"""
+		Find the caller of the query in the stack, preferring the code of the apps.
+
+		:return: Name of the app and function.
+		"""
+		frame = sys._getframe(1)
+		fallback = 'unknown caller'
+		while frame:
+			module = frame.f_globals.get('__name__', '')
+			if not module.startswith(('pyplanet.core.db', 'peewee', 'asyncio')):
+				name = '{}.{}'.format(module, frame.f_code.co_name)
+				app = self.get_module_app(module)
+				if app:
+					return '{} (app {})'.format(name, app)
+				if fallback == 'unknown caller':
+					fallback = name
+			frame = frame.f_back
+		return fallback
+
+	@staticmethod
+	def get_sql(query):
+		try:
+			return query.sql()[0]
+		except Exception:
+			return repr(query)
+
+
+profiler = QueryProfiler()
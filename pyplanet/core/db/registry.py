@@ -7,6 +7,8 @@ import importlib
 
 from glob import glob
 
+from .profiler import profiler
+
 
 def get_app_models(app):
 	from .model import Model
@@ -72,6 +74,7 @@ class Registry:
 		self.app_models[app.label] = models = list(get_app_models(app))
 		for name, model in models:
 			self.models['{}.{}'.format(app.label, name)] = app, name, model
+		profiler.register_app(app, models)
 
 		# Import migration files.
 		self.app_migrations[app.label] = migrations = list(get_app_migrations(app))
@@ -14,7 +14,7 @@ class Callback(Signal):
 	This will make it possible to develop your app as fast as possible, without any overhead and make it better
 	with callback payload changes!
 	"""
-	def __init__(self, call, namespace, code, target=None):
+	def __init__(self, call, namespace, code, target=None, ui_batch=None):
 		"""
 		Shortcut for registering two signals, one is the raw signal and the second one is the parsed and structured
 		output signal. This also glues the two together.
@@ -23,9 +23,13 @@ class Callback(Signal):
 		:param namespace:
 		:param code:
 		:param target:
+		:param ui_batch: Collect the UI updates of the receivers in one batch (see
+						 :meth:`pyplanet.core.ui.GlobalUIManager.batch`). True for a global batch, or a function returning
+						 the logins of the batch from the raw callback payload.
 		"""
 		# Initiate destination signal (ourself).
 		super().__init__(code=code, namespace=namespace, process_target=target)
+		self.ui_batch = ui_batch
 
 		# Initiate raw signal, the raw gbx/script callback.
 		self.raw_signal = Signal(code=call, namespace='raw')
@@ -38,7 +42,13 @@ class Callback(Signal):
 		"""
 		The glue method converts the source signal (gbx callback) into the pyplanet signal.
 		"""
-		return await self.send_robust(source)
+		if not self.ui_batch:
+			return await self.send_robust(source)
+
+		from pyplanet.core import Controller
+		logins = self.ui_batch(source) if callable(self.ui_batch) else None
+		async with Controller.instance.ui_manager.batch(logins=logins):
+			return await self.send_robust(source)
 
 
 async def handle_generic(source, signal, **kwargs):
@@ -3,10 +3,13 @@ This file has been forked from Django and PyDispatcher.
 The PyDispatcher is licensed under BSD.
 """
 import threading
+import time
 import weakref
 import logging
 import asyncio
 
+from pyplanet.core import metrics
+from pyplanet.core.db.profiler import profiler
 from pyplanet.core.exceptions import SignalException, SignalGlueStop
 from pyplanet.utils.log import handle_exception
 
@@ -22,6 +25,11 @@ NO_RECEIVERS = object()
 
 logger = logging.getLogger(__name__)
 
+SIGNAL_DURATION = metrics.registry.histogram(
+	'pyplanet_signal_duration_seconds', 'Duration of processing and sending the signals to the receivers.',
+	labelnames=('signal',)
+)
+
 
 class Signal:
 	"""
@@ -177,6 +185,7 @@ class Signal:
 
 	@staticmethod
 	async def execute_receiver(receiver, args, kwargs, ignore_exceptions=False):
+		scope = profiler.enter(receiver)
 		try:
 			if asyncio.iscoroutinefunction(receiver):
 				if len(args) > 0:
@@ -200,6 +209,8 @@ class Signal:
 			# Log the actual exception.
 			logger.exception(exc)
 			return receiver, exc
+		finally:
+			profiler.leave(scope)
 
 	async def send(self, source, raw=False, catch_exceptions=False, gather=True):
 		"""
@@ -215,41 +226,46 @@ class Signal:
 
 		:return: Return a list of tuple pairs [(receiver, response), ... ].
 		"""
-		if raw is False:
-			try:
-				kwargs = await self.process_target(signal=self, source=source)
-			except SignalGlueStop:
-				# Stop calling the receivers when our glue says we should!
-				return []
-		else:
-			kwargs = dict(**source, signal=self)
-
-		if not self.receivers:
-			return []
-
-		# Prepare the responses from the calls.
-		responses = []
-		gather_list = []
-		for key, receiver in self._live_receivers():
-			# Dereference the weak reference.
-			slf = self.self_refs.get(key, None)
-			if slf and isinstance(slf, weakref.ReferenceType):
-				slf = slf()
-			args = [slf] if slf else []
-
-			# Execute the receiver.
-			coro = self.execute_receiver(receiver, args, kwargs, ignore_exceptions=catch_exceptions)
-			if gather:
-				gather_list.append(coro)
+		started_at = time.perf_counter() if metrics.registry.enabled else None
+		try:
+			if raw is False:
+				try:
+					kwargs = await self.process_target(signal=self, source=source)
+				except SignalGlueStop:
+					# Stop calling the receivers when our glue says we should!
+					return []
 			else:
-				responses.append(await coro)
+				kwargs = dict(**source, signal=self)
 
-		# If gather, wait on the asyncio.gather operation and return the responses from there.
-		if gather:
-			return await asyncio.gather(*gather_list)
+			if not self.receivers:
+				return []
+
+			# Prepare the responses from the calls.
+			responses = []
+			gather_list = []
+			for key, receiver in self._live_receivers():
+				# Dereference the weak reference.
+				slf = self.self_refs.get(key, None)
+				if slf and isinstance(slf, weakref.ReferenceType):
+					slf = slf()
+				args = [slf] if slf else []
+
+				# Execute the receiver.
+				coro = self.execute_receiver(receiver, args, kwargs, ignore_exceptions=catch_exceptions)
+				if gather:
+					gather_list.append(coro)
+				else:
+					responses.append(await coro)
+
+			# If gather, wait on the asyncio.gather operation and return the responses from there.
+			if gather:
+				return await asyncio.gather(*gather_list)
 
-		# Done, respond with all the results
-		return responses
+			# Done, respond with all the results
+			return responses
+		finally:
+			if started_at is not None:
+				SIGNAL_DURATION.observe(time.perf_counter() - started_at, labels=('{}:{}'.format(self.namespace, self.code),))
 
 	async def send_robust(self, source=None, raw=False, gather=True):
 		"""
@@ -0,0 +1,530 @@
+"""
+In-process fake dedicated server, speaking GBXRemote 2. Used to benchmark PyPlanet without a real ManiaPlanet dedicated
+server, by replaying recorded traffic or synthesizing callback storms.
+"""
+import asyncio
+import collections
+import json
+import logging
+import random
+import re
+import struct
+
+from xmlrpc.client import dumps, loads, Fault
+
+from pyplanet.core.gbx.recorder import read_recording, DIRECTION_IN, DIRECTION_OUT
+
+logger = logging.getLogger(__name__)
+
+METHODS = [
+	'system.listMethods', 'system.methodSignature', 'system.methodHelp', 'system.multicall',
+	'Authenticate', 'ChangeAuthPassword', 'EnableCallbacks', 'SetApiVersion', 'GetVersion', 'GetStatus',
+	'GetSystemInfo', 'GameDataDirectory', 'GetMapsDirectory', 'GetSkinsDirectory',
+	'GetServerName', 'SetServerName', 'GetServerComment', 'SetServerComment', 'GetServerPassword', 'SetServerPassword',
+	'GetServerPasswordForSpectator', 'SetServerPasswordForSpectator', 'GetMaxPlayers', 'SetMaxPlayers',
+	'GetMaxSpectators', 'SetMaxSpectators', 'GetHideServer', 'GetLadderServerLimits', 'GetServerPlanets',
+	'GetCallVoteTimeOut', 'SetCallVoteTimeOut', 'GetCurrentCallVote', 'CancelVote',
+	'ChatSendServerMessage', 'ChatSendServerMessageToLogin', 'ChatSend', 'ChatSendToLogin', 'ChatEnableManualRouting',
+	'ChatForwardToLogin', 'SendDisplayManialinkPage', 'SendDisplayManialinkPageToLogin', 'SendHideManialinkPage',
+	'SendHideManialinkPageToLogin', 'SendNotice', 'SendNoticeToLogin',
+	'GetPlayerList', 'GetPlayerInfo', 'GetDetailedPlayerInfo', 'GetMainServerPlayerInfo',
+	'Kick', 'Ban', 'UnBan', 'GetBanList', 'CleanBanList', 'BlackList', 'UnBlackList', 'GetBlackList', 'LoadBlackList',
+	'SaveBlackList', 'AddGuest', 'RemoveGuest', 'GetGuestList', 'LoadGuestList', 'SaveGuestList', 'Ignore', 'UnIgnore',
+	'GetIgnoreList', 'ForceSpectator', 'ForceSpectatorTarget', 'SpectatorReleasePlayerSlot', 'ForcePlayerTeam',
+	'Pay', 'SendBill', 'GetBillState',
+	'GetMapList', 'GetCurrentMapInfo', 'GetNextMapInfo', 'GetMapInfo', 'GetCurrentMapIndex', 'GetNextMapIndex',
+	'SetNextMapIndex', 'SetNextMapIdent', 'JumpToMapIndex', 'JumpToMapIdent', 'ChooseNextMap', 'NextMap', 'RestartMap',
+	'AddMap', 'AddMapList', 'InsertMap', 'RemoveMap', 'RemoveMapList', 'LoadMatchSettings', 'SaveMatchSettings',
+	'GetGameMode', 'GetScriptName', 'SetScriptName', 'GetModeScriptInfo', 'GetModeScriptSettings',
+	'SetModeScriptSettings', 'GetModeScriptVariables', 'SetModeScriptVariables', 'TriggerModeScriptEvent',
+	'TriggerModeScriptEventArray', 'SetForcedMods', 'SetForcedMusic', 'SaveBestGhostsReplay', 'GetValidationReplay',
+]
+"""
+Methods known by the fake dedicated server. Methods without an explicit response will return True.
+"""
+
+SCRIPT_CALLBACK = 'ManiaPlanet.ModeScriptCallbackArray'
+
+RESPONSE_ID_REGEX = re.compile('^[0-9a-f]{32}$')
+
+
+class FakeDedicated:
+	"""
+	The fake dedicated server accepts GBXRemote 2 connections and answers the queries PyPlanet executes while connecting,
+	starting and running (``system.listMethods``, ``GetVersion``, multicalls, the ``Get*`` queries and the scripted
+	XmlRpc queries). The load can be generated by replaying a recording (see :class:`pyplanet.core.gbx.recorder.GbxRecorder`)
+	or by synthesizing connect, waypoint, finish and chat storms for fake players.
+
+	.. code-block:: python
+
+		dedicated = FakeDedicated(maps=100)
+		await dedicated.start()
+		await dedicated.connect_players(200)
+		await dedicated.race(rounds=5, checkpoints=10)
+
+	"""
+
+	def __init__(self, host='127.0.0.1', port=0, maps=10, checkpoints=5, seed=0, title_id='TMStadium@nadeo'):
+		"""
+		Initiate the fake dedicated server.
+
+		:param host: Host to listen on.
+		:param port: Port to listen on, 0 to pick a free port.
+		:param maps: Number of maps in the map list.
+		:param checkpoints: Number of checkpoints (including the finish) of the maps.
+		:param seed: Seed of the synthesized race times, to make every run deterministic.
+		:param title_id: Title id of the server.
+		"""
+		self.host = host
+		self.port = port
+		self.title_id = title_id
+		self.random = random.Random(seed)
+
+		self.server = None
+		self.writers = list()
+
+		self.server_login = 'pyplanet_bench'
+		self.data_dir = '/tmp/pyplanet-bench/UserData/'
+		self.script_api_version = '3.7.0'
+		self.script_settings = dict(S_TimeLimit=300, S_UseScriptCallbacks=True)
+
+		self.maps = [self.create_map(nr, checkpoints) for nr in range(maps)]
+		self.current_map = 0
+		self.players = collections.OrderedDict()
+
+		self.callback_handle = 0
+		self.callbacks_sent = 0
+		self.queries_received = 0
+		self.sent_at = collections.defaultdict(collections.deque)
+		"""
+		Send times of the callbacks, in order, per callback key (see `callback_key`). Used to measure the latency.
+		"""
+
+		self.recorded_responses = dict()
+
+		self.responses = {
+			'system.listMethods': lambda: list(METHODS),
+			'GetVersion': lambda: dict(
+				Name='ManiaPlanet', TitleId=self.title_id, Version='3.3.0', Build='2019-10-23_20_00',
+				ApiVersion='2013-04-16'
+			),
+			'GetSystemInfo': lambda: dict(
+				PublishedIp='127.0.0.1', Port=2350, P2PPort=3450, TitleId=self.title_id, ServerLogin=self.server_login,
+				ServerPlayerId=0, ConnectionDownloadRate=102400, ConnectionUploadRate=102400, IsServer=True,
+				IsDedicated=True,
+			),
+			'GetStatus': lambda: dict(Code=4, Name='Running - Play'),
+			'GameDataDirectory': lambda: self.data_dir,
+			'GetMapsDirectory': lambda: '{}Maps/'.format(self.data_dir),
+			'GetSkinsDirectory': lambda: '{}Skins/'.format(self.data_dir),
+			'GetServerName': lambda: 'PyPlanet Benchmark',
+			'GetServerComment': lambda: '',
+			'GetServerPassword': lambda: '',
+			'GetServerPasswordForSpectator': lambda: '',
+			'GetMaxPlayers': lambda: dict(CurrentValue=255, NextValue=255),
+			'GetMaxSpectators': lambda: dict(CurrentValue=255, NextValue=255),
+			'GetCallVoteTimeOut': lambda: dict(CurrentValue=60000, NextValue=60000),
+			'GetCurrentCallVote': lambda: dict(CallerLogin='', CmdName='', CmdParam=''),
+			'GetHideServer': lambda: 0,
+			'GetLadderServerLimits': lambda: dict(LadderServerLimitMin=0, LadderServerLimitMax=50000),
+			'GetServerPlanets': lambda: 0,
+			'GetBanList': lambda *args: list(),
+			'GetBlackList': lambda *args: list(),
+			'GetGuestList': lambda *args: list(),
+			'GetIgnoreList': lambda *args: list(),
+			'GetGameMode': lambda: 0,
+			'GetScriptName': lambda: dict(CurrentValue='TimeAttack.Script.txt', NextValue='TimeAttack.Script.txt'),
+			'GetModeScriptInfo': lambda: dict(
+				Name='TimeAttack.Script.txt', CompatibleMapTypes='TrackMania\\TM_Race', Description='', Version='',
+				ParamDescs=list(), CommandDescs=list(),
+			),
+			'GetModeScriptSettings': lambda: dict(self.script_settings),
+			'SetModeScriptSettings': self.set_script_settings,
+			'GetModeScriptVariables': lambda: dict(),
+			'GetMapList': lambda limit=-1, offset=0: self.maps[offset:] if limit < 0 else self.maps[offset:offset + limit],
+			'GetCurrentMapIndex': lambda: self.current_map,
+			'GetNextMapIndex': lambda: (self.current_map + 1) % len(self.maps),
+			'GetCurrentMapInfo': lambda: self.maps[self.current_map],
+			'GetNextMapInfo': lambda: self.maps[(self.current_map + 1) % len(self.maps)],
+			'GetMapInfo': self.get_map_info,
+			'GetPlayerList': self.get_player_list,
+			'GetPlayerInfo': self.get_player_info,
+			'GetDetailedPlayerInfo': self.get_detailed_player_info,
+		}
+
+		self.script_responses = {
+			'XmlRpc.GetAllApiVersions': lambda: dict(latest=self.script_api_version, versions=[self.script_api_version]),
+			'XmlRpc.GetApiVersion': lambda: dict(version=self.script_api_version),
+			'Trackmania.UI.GetProperties': lambda: '<ui_properties></ui_properties>',
+			'Shootmania.UI.GetProperties': lambda: '<ui_properties></ui_properties>',
+		}
+
+	@property
+	def sockets(self):
+		return self.server.sockets if self.server else list()
+
+	async def start(self):
+		"""
+		Start listening. The port will be updated to the actual port when it was 0.
+		"""
+		self.server = await asyncio.start_server(self.handle_connection, host=self.host, port=self.port)
+		self.port = self.server.sockets[0].getsockname()[1]
+		logger.debug('Fake dedicated server listening on {}:{}'.format(self.host, self.port))
+
+	async def close(self):
+		"""
+		Close the server and the open connections.
+		"""
+		for writer in self.writers:
+			writer.close()
+		self.writers.clear()
+		if self.server:
+			self.server.close()
+			await self.server.wait_closed()
+			self.server = None
+
+	async def handle_connection(self, reader, writer):
+		writer.write(struct.pack('<L11s', 11, b'GBXRemote 2'))
+		self.writers.append(writer)
+
+		try:
+			while True:
+				size, handle = struct.unpack('<LL', await reader.readexactly(8))
+				body = await reader.readexactly(size)
+				self.queries_received += 1
+				self.handle_query(writer, handle, body)
+		except (asyncio.IncompleteReadError, ConnectionResetError):
+			pass
+		finally:
+			if writer in self.writers:
+				self.writers.remove(writer)
+			writer.close()
+
+	def handle_query(self, writer, handle, body):
+		"""
+		Answer the query.
+
+		:param writer: Stream writer of the connection.
+		:param handle: Handle number of the query.
+		:param body: Raw payload of the query.
+		"""
+		params, method = loads(body, use_builtin_types=True)
+
+		if method in self.recorded_responses:
+			self.write_frame(writer, handle, self.recorded_responses[method])
+			return
+
+		if method == 'system.multicall':
+			results = list()
+			for call in params[0]:
+				try:
+					results.append([self.call(call['methodName'], *call['params'])])
+				except Fault as fault:
+					results.append(dict(faultCode=fault.faultCode, faultString=fault.faultString))
+			response = (results,)
+		else:
+			try:
+				response = (self.call(method, *params),)
+			except Fault as fault:
+				response = fault
+		self.write_frame(writer, handle, dumps(response, methodresponse=True, allow_none=True).encode())
+
+	def call(self, method, *params):
+		"""
+		Execute a (non-multicall) query.
+
+		:param method: Method name.
+		:param params: Parameters.
+		:return: Result of the query.
+		:raise: xmlrpc.client.Fault for unknown methods or invalid parameters.
+		"""
+		if method == 'TriggerModeScriptEventArray' or method == 'TriggerModeScriptEvent':
+			self.handle_script_query(*params)
+			return True
+		if method in self.responses:
+			try:
+				return self.responses[method](*params)
+			except (TypeError, IndexError, KeyError) as e:
+				raise Fault(-1000, 'Invalid parameters for {}: {}'.format(method, str(e)))
+		if method in METHODS:
+			return True
+		raise Fault(-32601, 'Method \'{}\' not found.'.format(method))
+
+	def handle_script_query(self, method, params=None):
+		"""
+		Handle a scripted query. When the query contains a response id, the response will be send as script callback.
+
+		:param method: Script method name.
+		:param params: Script parameters, the last one is the response id when a response is expected.
+		"""
+		params = list(params or list())
+		if method == 'XmlRpc.SetApiVersion' and params:
+			self.script_api_version = params[0]
+
+		if not params or not isinstance(params[-1], str) or not RESPONSE_ID_REGEX.match(params[-1]):
+			return
+		response_id = params[-1]
+
+		result = self.script_responses[method]() if method in self.script_responses else dict()
+		if isinstance(result, dict):
+			parts = [json.dumps(dict(result, responseid=response_id))]
+		else:
+			parts = [json.dumps(dict(responseid=response_id)), result]
+		self.broadcast(SCRIPT_CALLBACK, method, parts)
+
+	def set_script_settings(self, settings):
+		self.script_settings.update(settings)
+		return True
+
+	def get_map_info(self, file_name):
+		for map_info in self.maps:
+			if map_info['FileName'] == file_name:
+				return map_info
+		raise Fault(-1000, 'Map not found.')
+
+	def get_player_list(self, limit=-1, offset=0, compatibility=1):
+		players = [self.get_player_info(login) for login in self.players]
+		return players[offset:] if limit < 0 else players[offset:offset + limit]
+
+	def get_player_info(self, login, compatibility=1):
+		if login not in self.players:
+			raise Fault(-1000, 'Unknown player.')
+		player = self.players[login]
+		return dict(
+			Login=login, NickName=player['NickName'], PlayerId=player['PlayerId'], TeamId=-1, SpectatorStatus=0,
+			LadderRanking=0, Flags=101000000,
+		)
+
+	def get_detailed_player_info(self, login):
+		if login == self.server_login:
+			return dict(
+				Login=login, NickName='PyPlanet Benchmark', PlayerId=0, TeamId=-1, Path='World|Europe',
+				Language='en', IPAddress='127.0.0.1:2350', IsSpectator=False,
+			)
+		if login not in self.players:
+			raise Fault(-1000, 'Unknown player login.')
+		player = self.players[login]
+		return dict(
+			Login=login, NickName=player['NickName'], PlayerId=player['PlayerId'], TeamId=-1,
+			Path='World|Europe|Netherlands', Language='en', ClientVersion='', ClientTitleVersion='',
+			IPAddress='127.0.0.{}:2350'.format(player['PlayerId'] % 255), DownloadRate=102400, UploadRate=102400,
+			IsSpectator=False, IsInOfficialMode=False, Avatar=dict(FileName='', Checksum=''),
+			Skins=list(), LadderStats=dict(), HoursSinceZoneInscription=0, BroadcasterLogin='', Allies=list(),
+			ClubLink='',
+		)
+
+	@staticmethod
+	def create_map(nr, checkpoints):
+		return dict(
+			UId='PyPlanetBenchMap{:05d}'.format(nr), Name='$o$fffBench Map {}'.format(nr),
+			FileName='Benchmark/BenchMap{:05d}.Map.Gbx'.format(nr), Author='pyplanet', AuthorNickname='PyPlanet',
+			Environnement='Stadium', Mood='Day', BronzeTime=60000, SilverTime=50000, GoldTime=45000, AuthorTime=42000,
+			CopperPrice=1000, LapRace=False, NbLaps=0, NbCheckpoints=checkpoints, MapType='TrackMania\\TM_Race',
+			MapStyle='',
+		)
+
+	@staticmethod
+	def callback_key(method, params):
+		"""
+		Get the key of the callback, matching the name of the callback signal (``Script.`` prefix for script callbacks).
+
+		:param method: Callback method.
+		:param params: Callback parameters.
+		:return: Key string.
+		"""
+		if method == SCRIPT_CALLBACK or method == 'ManiaPlanet.ModeScriptCallback':
+			return 'Script.{}'.format(params[0])
+		return method
+
+	@staticmethod
+	def is_script_response(method, params):
+		if method != SCRIPT_CALLBACK or len(params) < 2 or not isinstance(params[1], list):
+			return False
+		for part in params[1]:
+			try:
+				payload = json.loads(part)
+			except (TypeError, ValueError):
+				continue
+			if isinstance(payload, dict) and payload.get('responseid'):
+				return True
+		return False
+
+	def write_frame(self, writer, handle, body):
+		writer.write(struct.pack('<LL', len(body), handle) + body)
+
+	def next_callback_handle(self):
+		# Callbacks are using handles without the highest bit set (the queries use the higher half).
+		self.callback_handle = (self.callback_handle + 1) % 0x80000000
+		return self.callback_handle
+
+	def broadcast(self, method, *params, body=None, key=None):
+		"""
+		Send a callback (or script response) to all the connected clients.
+
+		:param method: Callback method.
+		:param params: Callback parameters.
+		:param body: Raw payload, to send instead of encoding the method and parameters.
+		:param key: Callback key to record the send time for, None to not record.
+		"""
+		if body is None:
+			body = dumps(params, methodname=method, allow_none=True).encode()
+		handle = self.next_callback_handle()
+		for writer in self.writers:
+			self.write_frame(writer, handle, body)
+		if key:
+			self.sent_at[key].append(asyncio.get_event_loop().time())
+
+	async def send_callback(self, method, *params):
+		"""
+		Send a callback to the connected clients.
+
+		:param method: Callback method, for example ``ManiaPlanet.PlayerConnect``.
+		:param params: Callback parameters.
+		"""
+		self.broadcast(method, *params, key=self.callback_key(method, params))
+		self.callbacks_sent += 1
+		await self.drain()
+
+	async def send_script_callback(self, method, payload):
+		"""
+		Send a script callback to the connected clients.
+
+		:param method: Script callback method, for example ``Trackmania.Event.WayPoint``.
+		:param payload: Payload dictionary, will be json encoded.
+		"""
+		await self.send_callback(SCRIPT_CALLBACK, method, [json.dumps(payload)])
+
+	async def drain(self):
+		for writer in self.writers:
+			await writer.drain()
+
+	async def connect_players(self, count, interval=0):
+		"""
+		Connect fake players, sending the connect callbacks.
+
+		:param count: Number of players to connect.
+		:param interval: Seconds between the connects.
+		:return: List with the logins of the new players.
+		"""
+		logins = list()
+		for _ in range(count):
+			player_id = len(self.players) + 1
+			while 'bench_player_{}'.format(player_id) in self.players:
+				player_id += 1
+			login = 'bench_player_{}'.format(player_id)
+			self.players[login] = dict(NickName='$i$f80Bench Player {}'.format(player_id), PlayerId=player_id)
+			logins.append(login)
+
+			await self.send_callback('ManiaPlanet.PlayerConnect', login, False)
+			await asyncio.sleep(interval)
+		return logins
+
+	async def disconnect_players(self, logins=None, interval=0):
+		"""
+		Disconnect fake players, sending the disconnect callbacks.
+
+		:param logins: Logins of the players to disconnect, None to disconnect all players.
+		:param interval: Seconds between the disconnects.
+		"""
+		for login in list(logins if logins is not None else self.players):
+			self.players.pop(login, None)
+			await self.send_callback('ManiaPlanet.PlayerDisconnect', login, '')
+			await asyncio.sleep(interval)
+
+	async def chat(self, messages=1, interval=0):
+		"""
+		Send chat messages from all connected fake players.
+
+		:param messages: Number of messages per player.
+		:param interval: Seconds between the rounds of messages.
+		"""
+		for nr in range(messages):
+			for login, player in self.players.items():
+				await self.send_callback('ManiaPlanet.PlayerChat', player['PlayerId'], login, 'Benchmark message {}'.format(nr), False)
+			await asyncio.sleep(interval)
+
+	async def race(self, rounds=1, checkpoints=None, interval=0):
+		"""
+		Let all connected fake players drive the current map. Sends the start line, waypoint and finish (as waypoint with
+		end race flag) script callbacks, interleaved per checkpoint over all players.
+
+		:param rounds: Number of runs per player.
+		:param checkpoints: Number of checkpoints including the finish, defaults to the number of the current map.
+		:param interval: Seconds between the checkpoints.
+		"""
+		checkpoints = checkpoints or self.maps[self.current_map]['NbCheckpoints']
+
+		for _ in range(rounds):
+			started_at = dict()
+			times = {login: list() for login in self.players}
+
+			for login in self.players:
+				started_at[login] = self.random.randint(0, 1000)
+				await self.send_script_callback('Trackmania.Event.StartLine', dict(time=started_at[login], login=login))
+
+			for checkpoint in range(checkpoints):
+				is_finish = checkpoint == checkpoints - 1
+				for login in self.players:
+					race_time = (times[login][-1] if times[login] else 0) + self.random.randint(4000, 6000)
+					times[login].append(race_time)
+					await self.send_script_callback('Trackmania.Event.WayPoint', dict(
+						time=started_at[login] + race_time, login=login, racetime=race_time, laptime=race_time,
+						checkpointinrace=checkpoint, checkpointinlap=checkpoint, isendrace=is_finish, isendlap=is_finish,
+						curracecheckpoints=list(times[login]), curlapcheckpoints=list(times[login]),
+						blockid='#{}'.format(checkpoint), speed=400.0, distance=100.0 * (checkpoint + 1),
+					))
+				await asyncio.sleep(interval)
+
+	def load_recording(self, path):
+		"""
+		Load the recorded responses of a recording, the recorded responses are used instead of the built in responses.
+		Responses of multicalls and scripted queries are not reused.
+
+		:param path: Path of the recording.
+		:return: List with the recorded callback frames, to replay.
+		"""
+		pending = dict()
+		callbacks = list()
+		for frame in read_recording(path):
+			if frame.direction == DIRECTION_OUT:
+				_, method = loads(frame.body, use_builtin_types=True)
+				pending[frame.handle] = method
+			elif frame.direction == DIRECTION_IN and frame.handle in pending:
+				method = pending.pop(frame.handle)
+				if method not in ('system.multicall', 'TriggerModeScriptEventArray', 'TriggerModeScriptEvent'):
+					self.recorded_responses[method] = frame.body
+			elif frame.direction == DIRECTION_IN:
+				callbacks.append(frame)
+		return callbacks
+
+	async def replay(self, frames, speed=1.0):
+		"""
+		Replay the recorded callbacks, in the recorded order and timing.
+
+		:param frames: Callback frames, see `load_recording`.
+		:param speed: Replay speed factor, 0 to replay as fast as possible.
+		"""
+		if not frames:
+			return
+
+		loop = asyncio.get_event_loop()
+		started_at = loop.time()
+		first_offset = frames[0].offset
+
+		for frame in frames:
+			if speed:
+				delay = (frame.offset - first_offset) / speed - (loop.time() - started_at)
+				if delay > 0:
+					await asyncio.sleep(delay)
+
+			try:
+				params, method = loads(frame.body, use_builtin_types=True)
+			except Exception:
+				continue
+			if self.is_script_response(method, params):
+				# Don't replay responses to scripted queries.
+				continue
+
+			self.broadcast(method, body=frame.body, key=self.callback_key(method, params))
+			self.callbacks_sent += 1
+			await self.drain()
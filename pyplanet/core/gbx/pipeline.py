@@ -0,0 +1,218 @@
+"""
+The callback pipeline processes the callbacks of the dedicated server. The callbacks of one player (or of one callback
+family when the callback isn't about a single player) are handled in the order they are received, the callbacks of
+different players concurrently, with a limit on the number of handlers running at the same time. When the queue is full,
+the reader of the socket waits for space (backpressure), the low-value callbacks are dropped or coalesced.
+"""
+import asyncio
+import logging
+import re
+import time
+
+from collections import deque
+
+from pyplanet.core import metrics
+from pyplanet.utils.log import handle_exception
+
+logger = logging.getLogger(__name__)
+
+POLICY_DROP = 'drop'
+"""
+Drop the callback when the queue is full.
+"""
+POLICY_COALESCE = 'coalesce'
+"""
+Replace the queued (not yet handled) callback of the same player or family with the newer callback.
+"""
+
+CALLBACK_QUEUE_DEPTH = metrics.registry.gauge(
+	'pyplanet_gbx_callback_queue_depth', 'Callbacks waiting to be handled.'
+)
+CALLBACKS_IN_FLIGHT = metrics.registry.gauge(
+	'pyplanet_gbx_callbacks_in_flight', 'Callbacks being handled at the moment.'
+)
+CALLBACK_WAIT = metrics.registry.histogram(
+	'pyplanet_gbx_callback_wait_seconds', 'Time the callbacks were queued before handling.'
+)
+CALLBACK_DURATION = metrics.registry.histogram(
+	'pyplanet_gbx_callback_duration_seconds', 'Duration of the callback handlers.', labelnames=('method',)
+)
+CALLBACKS_DISCARDED = metrics.registry.counter(
+	'pyplanet_gbx_callbacks_discarded_total', 'Callbacks dropped or coalesced.', labelnames=('method', 'policy')
+)
+CALLBACK_BACKPRESSURE = metrics.registry.counter(
+	'pyplanet_gbx_callback_backpressure_seconds_total', 'Time the socket reader waited for space in the callback queue.'
+)
+
+_LOGIN_PATTERN = re.compile(r'"login"\s*:\s*"([^"]+)"')
+
+# Position of the login in the arguments of the (non-script) player callbacks.
+_PLAYER_CALLBACKS = {
+	'ManiaPlanet.PlayerConnect': 0,
+	'ManiaPlanet.PlayerDisconnect': 0,
+}
+
+
+def get_callback_key(name, data):
+	"""
+	Get the ordering key of the callback: the login for the callbacks of a single player, the name (family) for all other
+	callbacks.
+
+	:param name: Name of the callback (``Script.`` prefixed for script callbacks).
+	:param data: Raw data of the callback (script callbacks: tuple with the method and the JSON arguments).
+	:return: Key.
+	"""
+	login = None
+	if name.startswith('Script.'):
+		# Only the events are about a single player, the other script callbacks (like scores) contain many logins.
+		if '.Event.' in name:
+			raw = data[1] if isinstance(data, (list, tuple)) and len(data) > 1 else data
+			match = _LOGIN_PATTERN.search(raw if isinstance(raw, str) else str(raw))
+			login = match.group(1) if match else None
+	elif isinstance(data, dict):
+		login = data.get('Login')
+	elif name in _PLAYER_CALLBACKS and isinstance(data, (list, tuple)) and len(data) > _PLAYER_CALLBACKS[name]:
+		login = data[_PLAYER_CALLBACKS[name]]
+
+	if login:
+		return 'player', login
+	return name
+
+
+class _Item:
+	__slots__ = ('key', 'name', 'handler', 'args', 'queued_at')
+
+	def __init__(self, key, name, handler, args):
+		self.key = key
+		self.name = name
+		self.handler = handler
+		self.args = args
+		self.queued_at = time.perf_counter()
+
+
+class CallbackPipeline:
+	"""
+	Ordered and bounded processing of the callbacks.
+
+	:ivar queues: The queued callbacks per key (only the keys with queued or running callbacks).
+	:ivar ready: The keys with queued callbacks that can run (no callback of the key is running).
+	:ivar depth: Number of queued callbacks.
+	:ivar running: Number of running callback handlers.
+	"""
+
+	def __init__(self, max_size=10000, concurrency=50, policies=None, loop=None):
+		"""
+		:param max_size: Size of the queue, the reader waits for space when full. 0 for no limit.
+		:param concurrency: Maximum number of handlers running at the same time. 0 for no limit.
+		:param policies: Dictionary with the policy (``drop`` or ``coalesce``) per callback name.
+		:param loop: Event loop.
+		"""
+		self.max_size = max_size
+		self.concurrency = concurrency
+		self.policies = dict(policies or ())
+		self.loop = loop or asyncio.get_event_loop()
+
+		self.queues = dict()
+		self.ready = deque()
+		self.depth = 0
+		self.running = 0
+
+		self._coalescing = dict()
+		self._space = None
+
+	@property
+	def full(self):
+		return bool(self.max_size) and self.depth >= self.max_size
+
+	async def put(self, key, name, handler, *args, can_wait=None):
+		"""
+		Queue the callback. When the queue is full, wait for space (backpressure) or drop the callback, depending on the
+		policy of the callback.
+
+		:param key: Ordering key, the callbacks with the same key are handled one by one in order.
+		:param name: Name of the callback, for the policy and the metrics.
+		:param handler: Coroutine function handling the callback.
+		:param args: Arguments for the handler.
+		:param can_wait: Function returning if the caller can wait for space, the queue goes over the limit when not.
+		:return: False when the callback was dropped.
+		"""
+		policy = self.policies.get(name)
+		if policy == POLICY_COALESCE:
+			item = self._coalescing.get((name, key))
+			queue = self.queues.get(key)
+			# Only replace the last queued callback of the key, the order with other callbacks stays the same.
+			if item is not None and queue and queue[-1] is item:
+				item.args = args
+				CALLBACKS_DISCARDED.inc(labels=(name, policy))
+				return True
+
+		if self.full:
+			if policy == POLICY_DROP:
+				CALLBACKS_DISCARDED.inc(labels=(name, policy))
+				return False
+			await self._wait(can_wait)
+
+		item = _Item(key, name, handler, args)
+		queue = self.queues.get(key)
+		if queue is None:
+			self.queues[key] = queue = deque()
+			self.ready.append(key)
+		queue.append(item)
+		if policy == POLICY_COALESCE:
+			self._coalescing[(name, key)] = item
+		self.depth += 1
+
+		self._pump()
+		return True
+
+	def wakeup(self):
+		"""
+		Wake up the reader waiting for space, to check if it can still wait.
+		"""
+		if self._space is not None and not self._space.done():
+			self._space.set_result(None)
+		self._space = None
+
+	async def _wait(self, can_wait=None):
+		started_at = time.perf_counter()
+		while self.full and (can_wait is None or can_wait()):
+			self._space = self.loop.create_future()
+			await self._space
+		CALLBACK_BACKPRESSURE.inc(time.perf_counter() - started_at)
+
+	def _pump(self):
+		while self.ready and (not self.concurrency or self.running < self.concurrency):
+			key = self.ready.popleft()
+			item = self.queues[key].popleft()
+			self.depth -= 1
+			if self._coalescing.get((item.name, key)) is item:
+				del self._coalescing[(item.name, key)]
+
+			self.running += 1
+			task = asyncio.ensure_future(self._run(item), loop=self.loop)
+			task.add_done_callback(lambda _, key=key: self._done(key))
+
+		CALLBACK_QUEUE_DEPTH.set(self.depth)
+		CALLBACKS_IN_FLIGHT.set(self.running)
+
+	async def _run(self, item):
+		started_at = time.perf_counter()
+		CALLBACK_WAIT.observe(started_at - item.queued_at)
+		try:
+			await item.handler(*item.args)
+		except Exception as e:
+			handle_exception(exception=e, module_name=__name__, func_name=item.name)
+			logger.exception(e)
+		finally:
+			CALLBACK_DURATION.observe(time.perf_counter() - started_at, labels=(item.name,))
+
+	def _done(self, key):
+		self.running -= 1
+		if self.queues[key]:
+			self.ready.append(key)
+		else:
+			del self.queues[key]
+
+		self._pump()
+		if not self.full:
+			self.wakeup()
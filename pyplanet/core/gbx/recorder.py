@@ -0,0 +1,121 @@
+"""
+Recorder and reader of raw GBXRemote 2 traffic. The recording can be replayed with the fake dedicated server to reproduce
+production load offline.
+"""
+import collections
+import logging
+import struct
+import time
+
+from pyplanet.core.exceptions import TransportException
+
+logger = logging.getLogger(__name__)
+
+RECORDING_MAGIC = b'PyPlanetGbxRec\x00\x01'
+"""
+Magic header (and version) of the recording files.
+"""
+
+DIRECTION_IN = 0
+"""
+Frame received from the dedicated server (responses and callbacks).
+"""
+
+DIRECTION_OUT = 1
+"""
+Frame sent to the dedicated server (queries).
+"""
+
+FRAME_HEADER = struct.Struct('<dBLL')
+
+Frame = collections.namedtuple('Frame', ['offset', 'direction', 'handle', 'body'])
+"""
+Recorded frame. The offset is the number of seconds since the start of the recording.
+"""
+
+
+class GbxRecorder:
+	"""
+	The recorder writes all frames (length + handle + payload) exchanged with the dedicated server to a file, including
+	the time offset since the start of the recording.
+
+	Enable the recorder by adding ``RECORD_TRAFFIC`` with the target file to the ``DEDICATED`` settings of the pool.
+	"""
+
+	def __init__(self, path):
+		"""
+		Initiate recorder.
+
+		:param path: Path of the recording file. Will be overwritten if it exists.
+		:type path: str
+		"""
+		self.path = path
+		self.started_at = None
+		self.frames = 0
+
+		self._file = None
+
+	@property
+	def is_recording(self):
+		return self._file is not None
+
+	def open(self):
+		"""
+		Open the file and start recording.
+		"""
+		if self._file:
+			return
+		self._file = open(self.path, 'wb')
+		self._file.write(RECORDING_MAGIC)
+		self.started_at = time.monotonic()
+		self.frames = 0
+		logger.info('GBX: Recording traffic to \'{}\''.format(self.path))
+
+	def record(self, direction, handle, body):
+		"""
+		Record a single frame.
+
+		:param direction: Direction of the frame, DIRECTION_IN or DIRECTION_OUT.
+		:param handle: Handle number of the frame.
+		:param body: Raw payload (xml) bytes.
+		:type body: bytes
+		"""
+		if not self._file:
+			return
+		self._file.write(FRAME_HEADER.pack(time.monotonic() - self.started_at, direction, len(body), handle))
+		self._file.write(body)
+		self.frames += 1
+
+	def close(self):
+		"""
+		Stop recording and close the file.
+		"""
+		if not self._file:
+			return
+		self._file.close()
+		self._file = None
+		logger.info('GBX: Recorded {} frames to \'{}\''.format(self.frames, self.path))
+
+
+def read_recording(path):
+	"""
+	Read the frames from a recording file.
+
+	:param path: Path of the recording file.
+	:return: Generator with Frame tuples.
+	:raise: pyplanet.core.exceptions.TransportException when the file isn't a valid recording.
+	"""
+	with open(path, 'rb') as fh:
+		if fh.read(len(RECORDING_MAGIC)) != RECORDING_MAGIC:
+			raise TransportException('File \'{}\' is not a valid GBX traffic recording!'.format(path))
+
+		while True:
+			header = fh.read(FRAME_HEADER.size)
+			if len(header) < FRAME_HEADER.size:
+				# End of file (or truncated frame header when the recorder was killed).
+				return
+			offset, direction, size, handle = FRAME_HEADER.unpack(header)
+			body = fh.read(size)
+			if len(body) < size:
+				return
+			yield Frame(offset, direction, handle, body)
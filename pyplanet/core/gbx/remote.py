@@ -5,16 +5,30 @@ import asyncio
 import json
 import logging
 import struct
+import time
 
 from xmlrpc.client import dumps, loads, Fault
 from xml.parsers.expat import ExpatError
 
+from pyplanet.conf import settings
+from pyplanet.core import metrics
 from pyplanet.core.exceptions import TransportException
 from pyplanet.core.events.manager import SignalManager
+from pyplanet.core.gbx.pipeline import CallbackPipeline, get_callback_key
+from pyplanet.core.gbx.recorder import GbxRecorder, DIRECTION_IN, DIRECTION_OUT
 from pyplanet.utils.log import handle_exception
 
 logger = logging.getLogger(__name__)
 
+GBX_CALLS = metrics.registry.counter('pyplanet_gbx_calls_total', 'GBX queries executed.', labelnames=('method',))
+GBX_CALL_DURATION = metrics.registry.histogram(
+	'pyplanet_gbx_call_duration_seconds', 'Round trip duration of the GBX queries.', labelnames=('method',)
+)
+GBX_CALLBACKS = metrics.registry.counter('pyplanet_gbx_callbacks_total', 'GBX callbacks received.', labelnames=('method',))
+GBX_BYTES_SENT = metrics.registry.counter('pyplanet_gbx_sent_bytes_total', 'Bytes sent to the dedicated server.')
+GBX_BYTES_RECEIVED = metrics.registry.counter('pyplanet_gbx_received_bytes_total', 'Bytes received from the dedicated server.')
+GBX_PENDING = metrics.registry.gauge('pyplanet_gbx_pending_calls', 'GBX queries waiting for a response.')
+
 
 class GbxRemote:
 	"""
@@ -23,7 +37,14 @@ class GbxRemote:
 	MAX_REQUEST_SIZE  = 2000000  # 2MB
 	MAX_RESPONSE_SIZE = 4000000  # 4MB
 
-	def __init__(self, host, port, event_pool=None, user=None, password=None, api_version='2013-04-16', instance=None):
+	# Interactive callbacks are handled directly, outside of the pipeline. Their handlers can wait for the next answer of
+	# the player (prompts and alerts), which would never be handled when queued behind them.
+	DIRECT_CALLBACKS = ('ManiaPlanet.PlayerChat', 'ManiaPlanet.PlayerManialinkPageAnswer')
+
+	def __init__(
+		self, host, port, event_pool=None, user=None, password=None, api_version='2013-04-16', instance=None,
+		record_traffic=None, callback_queue_size=10000, callback_concurrency=50, callback_policies=None
+	):
 		"""
 		Initiate the GbxRemote client.
 
@@ -35,6 +56,10 @@ class GbxRemote:
 		:param api_version: API Version to use. In most cases you won't override the default because version changes
 							should be abstracted by the other core components.
 		:param instance: Instance of the app.
+		:param record_traffic: Path of the file to record the raw traffic to, None to disable recording.
+		:param callback_queue_size: Size of the callback queue, the reading of the socket waits when full.
+		:param callback_concurrency: Maximum number of callback handlers running at the same time.
+		:param callback_policies: Dictionary with the policy (``drop`` or ``coalesce``) per callback name.
 		:type host: str
 		:type port: str int
 		:type event_pool: asyncio.BaseEventPool
@@ -42,6 +67,7 @@ class GbxRemote:
 		:type password: str
 		:type api_version: str
 		:type instance: pyplanet.core.instance.Instance
+		:type record_traffic: str
 		"""
 		self.host = host
 		self.port = port
@@ -65,6 +91,12 @@ class GbxRemote:
 		self.writer = None
 		self.loop_task = None
 
+		self.recorder = GbxRecorder(record_traffic) if record_traffic else None
+
+		self.pipeline = CallbackPipeline(
+			max_size=callback_queue_size, concurrency=callback_concurrency, policies=callback_policies, loop=self.event_loop
+		)
+
 	@classmethod
 	def create_from_settings(cls, instance, conf):
 		"""
@@ -78,7 +110,10 @@ class GbxRemote:
 		"""
 		return cls(
 			instance=instance,
-			host=conf['HOST'], port=conf['PORT'], user=conf['USER'], password=conf['PASSWORD']
+			host=conf['HOST'], port=conf['PORT'], user=conf['USER'], password=conf['PASSWORD'],
+			record_traffic=conf.get('RECORD_TRAFFIC', None),
+			callback_queue_size=settings.GBX_CALLBACK_QUEUE_SIZE, callback_concurrency=settings.GBX_CALLBACK_CONCURRENCY,
+			callback_policies=settings.GBX_CALLBACK_POLICIES,
 		)
 
 	def get_next_handler(self):
@@ -125,6 +160,9 @@ class GbxRemote:
 			raise TransportException('Server is not a valid GBXRemote 2 server.')
 		logger.debug('Dedicated connection established!')
 
+		if self.recorder:
+			self.recorder.open()
+
 		# From now we need to start listening.
 		self.loop_task = self.event_loop.create_task(self.listen())
 
@@ -177,6 +215,8 @@ class GbxRemote:
 		if self.writer:
 			self.writer.close()
 			del self.writer
+		if self.recorder:
+			self.recorder.close()
 
 	async def execute(self, method, *args, timeout=45.0):
 		"""
@@ -200,10 +240,26 @@ class GbxRemote:
 		# Create new future to be returned.
 		self.handlers[handler] = future = asyncio.Future()
 
+		if self.recorder:
+			self.recorder.record(DIRECTION_OUT, handler, request_bytes)
+
 		# Send to server.
 		self.writer.write(length_bytes + handler_bytes + request_bytes)
 
-		return await asyncio.wait_for(future, timeout)
+		# The reader can't keep waiting for space in the callback queue, it has to read the response.
+		self.pipeline.wakeup()
+
+		if not metrics.registry.enabled:
+			return await asyncio.wait_for(future, timeout)
+
+		GBX_CALLS.inc(labels=(method,))
+		GBX_BYTES_SENT.inc(len(request_bytes) + 8)
+		GBX_PENDING.set(len(self.handlers))
+		started_at = time.perf_counter()
+		try:
+			return await asyncio.wait_for(future, timeout)
+		finally:
+			GBX_CALL_DURATION.observe(time.perf_counter() - started_at, labels=(method,))
 
 	async def listen(self):
 		"""
@@ -214,6 +270,9 @@ class GbxRemote:
 				head = await self.reader.readexactly(8)
 				size, handle = struct.unpack_from('<LL', head)
 				body = await self.reader.readexactly(size)
+				if self.recorder:
+					self.recorder.record(DIRECTION_IN, handle, body)
+				GBX_BYTES_RECEIVED.inc(size + 8)
 				data = method = fault = None
 
 				try:
@@ -228,7 +287,10 @@ class GbxRemote:
 				if data and len(data) == 1:
 					data = data[0]
 
-				self.event_loop.create_task(self.handle_payload(handle, method, data, fault))
+				if handle not in self.handlers and method and data is not None:
+					await self.dispatch_callback(handle, method, data)
+				else:
+					self.event_loop.create_task(self.handle_payload(handle, method, data, fault))
 		except ConnectionResetError as e:
 			logger.critical(
 				'Connection with the dedicated server has been closed, we will now close down the subprocess! {}'.format(str(e))
@@ -252,6 +314,7 @@ class GbxRemote:
 		if handle_nr in self.handlers:
 			await self.handle_response(handle_nr, method, data, fault)
 		elif method and data is not None:
+			GBX_CALLBACKS.inc(labels=(method,))
 			if method == 'ManiaPlanet.ModeScriptCallbackArray':
 				await self.handle_scripted(handle_nr, method, data)
 			elif method == 'ManiaPlanet.ModeScriptCallback':
@@ -266,6 +329,41 @@ class GbxRemote:
 				handle_nr, method,
 			))
 
+	async def dispatch_callback(self, handle_nr, method, data):
+		"""
+		Queue the callback in the callback pipeline. The callbacks are handled in order per player (or per callback name
+		when the callback isn't about one player). Waits when the queue is full.
+
+		:param handle_nr: Handler ID
+		:param method: Method name
+		:param data: Parsed payload data.
+		"""
+		GBX_CALLBACKS.inc(labels=(method,))
+		if method in ('ManiaPlanet.ModeScriptCallbackArray', 'ManiaPlanet.ModeScriptCallback'):
+			name = 'Script.{}'.format(data[0])
+			handler = self.handle_scripted
+
+			# Responses to script queries are handled directly, the query could be waiting in a queued callback handler.
+			if self.script_handlers and any(response_id in str(data[1]) for response_id in self.script_handlers):
+				self.event_loop.create_task(handler(handle_nr, method, data))
+				return
+		else:
+			name = method
+			handler = self.handle_callback
+
+		if name in self.DIRECT_CALLBACKS:
+			self.event_loop.create_task(handler(handle_nr, method, data))
+			return
+
+		await self.pipeline.put(
+			get_callback_key(name, data), name, handler, handle_nr, method, data, can_wait=self._can_wait_for_queue
+		)
+
+	def _can_wait_for_queue(self):
+		# Waiting for space while a query waits for a (script) response could deadlock. The callback handlers could need
+		# the response to finish, also when the query is made by another task (a shared future or a lock they wait for).
+		return not self.handlers and not self.script_handlers
+
 	async def handle_response(self, handle_nr, method=None, data=None, fault=None):
 		logger.debug('GBX: Received response to handler {}, method: {}'.format(handle_nr, method))
 		handler = self.handlers.pop(handle_nr)
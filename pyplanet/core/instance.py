@@ -8,6 +8,8 @@ import asyncio
 import logging
 import traceback
 
+from collections import OrderedDict
+
 from pyplanet.utils.analytics import Analytics
 from .controller import Controller as _Controller
 
@@ -15,14 +17,19 @@ from pyplanet import __version__ as version
 
 from pyplanet.apps import Apps
 from pyplanet.conf import settings
-from pyplanet.core import signals
+from pyplanet.core import metrics, signals
 from pyplanet.core.events import SignalManager
 from pyplanet.core.db.database import Database
 from pyplanet.core.game import Game
 from pyplanet.core.gbx import GbxClient
+from pyplanet.core.loop import LagMonitor
+from pyplanet.core.metrics.exposition import SnapshotWriter, write_snapshot
+from pyplanet.core.scheduler import Scheduler
 from pyplanet.core.exceptions import ImproperlyConfigured
+from pyplanet.core.startup import StartupTimeline, run_graph
 from pyplanet.core.storage.storage import Storage
 from pyplanet.core.ui import GlobalUIManager
+from pyplanet.core.ui.template import EnvironmentManager
 from pyplanet.utils import memleak, releases
 
 from pyplanet.contrib.map import MapManager
@@ -48,7 +55,11 @@ class Instance:
 	:ivar db: Database component.
 	:ivar storage: Storage component.
 	:ivar signals: Signal Manager (global). Please use the APP context Signal Manager instead!
+	:ivar scheduler: Scheduler of the delayed and recurring jobs (global). Please use the APP context Scheduler instead!
 	:ivar ui_manager: UI Manager (global). Please use the APP context UI Manager instead!
+	:ivar startup_timeline: Timeline with the duration of each phase of the last startup.
+	:ivar metrics_writer: Writer of the metrics snapshots, None when the metrics are disabled.
+	:ivar lag_monitor: Event loop lag monitor, None when disabled.
 
 	:ivar map_manager: Contrib: Map Manager.
 	:ivar player_manager: Contrib: Player Manager.
@@ -70,12 +81,21 @@ class Instance:
 		self.loop = 				asyncio.get_event_loop()
 		self.game =					Game
 
+		# Enable the metrics before the components are created, so they can be instrumented.
+		metrics.registry.enabled = bool(settings.METRICS_ENABLED)
+		self.metrics_writer =		SnapshotWriter(self, metrics.registry) if metrics.registry.enabled else None
+		self.lag_monitor =			LagMonitor(
+			self.loop, interval=settings.LAG_MONITOR_INTERVAL, threshold=settings.LAG_MONITOR_THRESHOLD
+		) if settings.LAG_MONITOR_ENABLED else None
+
 		self.gbx = 					GbxClient.create_from_settings(self, settings.DEDICATED[self.process_name])
 		self.db = 					Database.create_from_settings(self, settings.DATABASES[self.process_name])
 		self.storage =				Storage.create_from_settings(self, settings.STORAGE[self.process_name])
 		self.signals =				SignalManager
+		self.scheduler =			Scheduler(self.loop)
 		self.ui_manager =			GlobalUIManager(self)
 		self.apps = 				Apps(self)
+		self.startup_timeline =		StartupTimeline()
 
 		# Contrib components.
 		self.map_manager =				MapManager(self)
@@ -152,37 +172,59 @@ class Instance:
 		The start coroutine is executed when the process is ready to create connection to the gbx protocol, database,
 		other services and finally start the apps.
 		"""
+		timeline = self.startup_timeline
+		timeline.start()
+
+		if self.metrics_writer:
+			self.metrics_writer.start()
+		if self.lag_monitor:
+			self.lag_monitor.start()
+
 		# Make sure we start the Gbx connection, authenticate, set api version and stuff.
 		await self.__fire_signal(signals.pyplanet_start_gbx_before)
-		await self.gbx.connect()
+		async with timeline.phase('gbx.connect'):
+			await self.gbx.connect()
 		await self.__fire_signal(signals.pyplanet_start_gbx_after)
 
 		# Initiate the database connection, discover apps assets,models etc.
 		await self.__fire_signal(signals.pyplanet_start_db_before)
-		await self.db.connect()				# Connect and initial state.
-		await self.apps.discover() 			# Discover apps models.
-		await self.db.initiate() 			# Execute migrations and initial tasks.
-		await self.apps.check(True)    		# Check for incompatible apps and remove them.
-		await self.apps.init()				# Initiate apps
-		await self.ui_manager.on_start()    # Initiate UI manager.
+		async with timeline.phase('db.connect'):
+			await self.db.connect()				# Connect and initial state.
+		async with timeline.phase('apps.discover'):
+			await self.apps.discover() 			# Discover apps models.
+		async with timeline.phase('db.initiate'):
+			await self.db.initiate() 			# Execute migrations and initial tasks.
+		async with timeline.phase('apps.check'):
+			await self.apps.check(True)    		# Check for incompatible apps and remove them.
+
+		# Compile the templates of the core and apps in the background while starting.
+		warmup = asyncio.ensure_future(EnvironmentManager.warmup()) if settings.TEMPLATE_WARMUP else None
+
+		async with timeline.phase('apps.init'):
+			await self.apps.init()				# Initiate apps
+		async with timeline.phase('ui_manager'):
+			await self.ui_manager.on_start()    # Initiate UI manager.
 		await self.__fire_signal(signals.pyplanet_start_db_after)
 
-		# Start the core contribs.
-		await self.setting_manager.on_start()
-		await self.map_manager.on_start()
-		await self.player_manager.on_start()
-		await self.permission_manager.on_start()
-		await self.command_manager.on_start()
-		await self.mode_manager.on_start()
-		await self.chat_manager.on_start()
+		# Start the core contribs, the contribs that don't depend on each other are started concurrently.
+		async with timeline.phase('contribs'):
+			await run_graph(
+				self.contrib_dependencies, lambda name: getattr(self, name).on_start(),
+				concurrent=settings.CONCURRENT_STARTUP, timeline=timeline, prefix='contrib.'
+			)
 
 		# Start the apps, call the on_ready, resulting in apps user logic to be started.
 		await self.print_header()
 		await self.__fire_signal(signals.pyplanet_start_apps_before)
-		await self.apps.start()
+		async with timeline.phase('apps'):
+			await self.apps.start()
 		await self.__fire_signal(signals.pyplanet_start_apps_after)
 		await self.print_footer()
 
+		if warmup:
+			async with timeline.phase('templates.warmup'):
+				logger.debug('Compiled {} templates in the background.'.format(await warmup))
+
 		# Utils.
 		await Analytics.start(self)
 
@@ -190,11 +232,39 @@ class Instance:
 		await self.signals.finish_start()
 		await self.__fire_signal(signals.pyplanet_start_after)
 
+		timeline.finish()
+		timeline.log(limit=15)
+
+	@property
+	def contrib_dependencies(self):
+		"""
+		The dependency graph of the core contribs, the order is used when starting sequentially.
+
+		:return: Ordered adjacency dict with the contrib attribute names.
+		:rtype: collections.OrderedDict
+		"""
+		return OrderedDict([
+			('setting_manager', []),
+			('map_manager', []),
+			('player_manager', ['setting_manager']),
+			('permission_manager', []),
+			('command_manager', []),
+			('mode_manager', []),
+			('chat_manager', []),
+		])
+
 	async def _stop(self):
 		"""
 		The stop coroutine is executed when the process exits with the SIGINT signal.
 		"""
 		await self.apps.stop()
+		self.scheduler.stop()
+
+		if self.lag_monitor:
+			self.lag_monitor.stop()
+		if self.metrics_writer:
+			self.metrics_writer.stop()
+			write_snapshot(metrics.registry, self.process_name)
 
 	async def print_header(self):  # pragma: no cover
 		await self.chat.execute(
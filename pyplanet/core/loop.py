@@ -0,0 +1,176 @@
+"""
+Event loop helpers: install the configured event loop policy and monitor the event loop for lag (blocking code).
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from pyplanet.core import metrics
+from pyplanet.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+LOOP_POLICIES = ('asyncio', 'uvloop', 'auto')
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LOOP_LAG = metrics.registry.histogram(
+	'pyplanet_event_loop_lag_seconds', 'Drift between the scheduled and actual wakeup of the event loop.',
+	buckets=LAG_BUCKETS,
+)
+LOOP_BLOCKED = metrics.registry.counter(
+	'pyplanet_event_loop_blocked_total', 'Times the event loop has been blocked longer than the lag threshold.'
+)
+
+
+def install_loop_policy(name):
+	"""
+	Install the event loop policy and create the event loop for the current (main) thread.
+
+	:param name: Name of the policy: 'asyncio', 'uvloop' or 'auto' (uvloop when installed, asyncio otherwise).
+	:return: Name of the installed policy.
+	:raise: pyplanet.core.exceptions.ImproperlyConfigured when the policy is unknown.
+	"""
+	name = (name or 'asyncio').lower()
+	if name not in LOOP_POLICIES:
+		raise ImproperlyConfigured('Unknown event loop policy \'{}\', choose one of: {}'.format(name, ', '.join(LOOP_POLICIES)))
+
+	if name == 'asyncio':
+		return 'asyncio'
+
+	try:
+		import uvloop
+	except ImportError:
+		if name == 'uvloop':
+			logger.warning('The uvloop event loop is configured but uvloop isn\'t installed! Using the asyncio event loop.')
+		return 'asyncio'
+
+	asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+	asyncio.set_event_loop(asyncio.new_event_loop())
+	return 'uvloop'
+
+
+def _current_task(loop):
+	try:
+		if hasattr(asyncio, 'current_task'):
+			return asyncio.current_task(loop)
+		return asyncio.Task.current_task(loop)
+	except RuntimeError:
+		return None
+
+
+class LagMonitor:
+	"""
+	The lag monitor samples the drift between the scheduled and actual wakeup of the event loop and records the samples in
+	the ``pyplanet_event_loop_lag_seconds`` metric. A watchdog thread detects when the event loop is blocked longer than the
+	threshold and logs the stack of the code that is blocking the loop (and the task it's running in) while it's still
+	blocking.
+	"""
+
+	def __init__(self, loop=None, interval=0.5, threshold=0.25):
+		"""
+		Initiate the monitor.
+
+		:param loop: Event loop to monitor, defaults to the current event loop.
+		:param interval: Interval of the samples in seconds.
+		:param threshold: Lag in seconds before the blocking code is logged, None or 0 to disable the watchdog.
+		"""
+		self.loop = loop or asyncio.get_event_loop()
+		self.interval = interval
+		self.threshold = threshold
+
+		self.samples = 0
+		self.max_lag = 0.0
+		self.blocked_count = 0
+
+		self._heartbeat = None
+		self._reported = False
+		self._loop_thread_id = None
+		self._task = None
+		self._watchdog = None
+		self._stopped = threading.Event()
+
+	def start(self):
+		"""
+		Start sampling, must be called from the thread running the event loop.
+		"""
+		if self._task:
+			return
+		self._loop_thread_id = threading.get_ident()
+		self._heartbeat = time.monotonic()
+		self._stopped.clear()
+		self._task = asyncio.ensure_future(self.sample(), loop=self.loop)
+
+		if self.threshold:
+			self._watchdog = threading.Thread(target=self.watch, name='LagMonitor', daemon=True)
+			self._watchdog.start()
+
+	def stop(self):
+		self._stopped.set()
+		if self._task:
+			self._task.cancel()
+			self._task = None
+
+	async def sample(self):
+		while True:
+			expected_at = self.loop.time() + self.interval
+			await asyncio.sleep(self.interval)
+			self.record(max(self.loop.time() - expected_at, 0.0))
+
+	def record(self, lag):
+		"""
+		Record a lag sample.
+
+		:param lag: Lag in seconds.
+		"""
+		self._heartbeat = time.monotonic()
+		self._reported = False
+
+		self.samples += 1
+		LOOP_LAG.observe(lag)
+		if lag > self.max_lag:
+			self.max_lag = lag
+
+	def watch(self):
+		# The blocking is reported (once per block) from here only, while the loop is still blocked.
+		check_interval = max(min(self.threshold / 4, 1.0), 0.01)
+		while not self._stopped.wait(check_interval):
+			blocked = time.monotonic() - self._heartbeat - self.interval
+			if blocked < self.threshold or self._reported:
+				continue
+
+			self._reported = True
+			self.blocked_count += 1
+			LOOP_BLOCKED.inc()
+			self.report_blocking(blocked)
+
+	def report_blocking(self, blocked):
+		"""
+		Log the stack of the event loop thread and the current task, called from the watchdog thread.
+
+		:param blocked: Seconds the loop is blocked already.
+		"""
+		frame = sys._current_frames().get(self._loop_thread_id)
+		stack = ''.join(traceback.format_stack(frame)) if frame else '(unknown)'
+		task = _current_task(self.loop)
+
+		logger.warning(
+			'Event loop is blocked for more than {:.3f}s by task {}:\n{}'.format(blocked, repr(task) if task else '(none)', stack)
+		)
+
+	@property
+	def stats(self):
+		"""
+		Lag statistics: number of samples, max lag and the number of times the loop was blocked longer than the threshold.
+		The distribution of the lag is in the ``pyplanet_event_loop_lag_seconds`` metric.
+
+		:return: Dictionary.
+		"""
+		return dict(
+			samples=self.samples,
+			max_lag=self.max_lag,
+			blocked_count=self.blocked_count,
+		)
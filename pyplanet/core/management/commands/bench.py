@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import threading
+
+from pyplanet.conf import settings
+from pyplanet.core import Controller
+from pyplanet.core.benchmark import Benchmark
+from pyplanet.core.gbx.dedicated import FakeDedicated
+from pyplanet.core.management import BaseCommand, CommandError
+from pyplanet.utils.log import initiate_logger
+
+
+class Command(BaseCommand):  # pragma: no cover
+	help = (
+		'Benchmark PyPlanet against an in-process fake dedicated server. Replays a traffic recording or synthesizes '
+		'player connects, checkpoints, finishes and chat messages and reports the throughput, event loop lag and signal '
+		'latencies.'
+	)
+
+	requires_system_checks = False
+	requires_migrations_checks = False
+
+	def add_arguments(self, parser):
+		parser.add_argument('--players', type=int, default=50, help='Number of fake players to connect.')
+		parser.add_argument('--rounds', type=int, default=5, help='Number of runs per player.')
+		parser.add_argument('--checkpoints', type=int, default=10, help='Number of checkpoints (including finish) per run.')
+		parser.add_argument('--chat', type=int, default=1, help='Number of chat messages per player.')
+		parser.add_argument('--maps', type=int, default=100, help='Number of maps on the fake dedicated server.')
+		parser.add_argument('--seed', type=int, default=0, help='Seed of the synthesized load.')
+		parser.add_argument(
+			'--replay', type=str, default=None,
+			help='Replay the traffic recording (see the RECORD_TRAFFIC dedicated setting) instead of synthesizing load.'
+		)
+		parser.add_argument(
+			'--speed', type=float, default=0.0,
+			help='Replay speed factor, 1 is the recorded speed. Default 0 replays as fast as possible.'
+		)
+		parser.add_argument(
+			'--database', type=str, default=None,
+			help=(
+				'Name of the database to use during the benchmark, with the engine and credentials of the pool. '
+				'Defaults to the database configured for the pool.'
+			)
+		)
+		parser.add_argument('--timeout', type=float, default=300.0, help='Maximum seconds to wait for the load to be handled.')
+
+	def handle(self, *args, **options):
+		settings._setup()
+
+		threading.current_thread().setName('Main')
+		initiate_logger()
+		logger = logging.getLogger(__name__)
+
+		pool = options['pool'] or 'default'
+		loop = asyncio.get_event_loop()
+
+		dedicated = FakeDedicated(maps=options['maps'], checkpoints=options['checkpoints'], seed=options['seed'])
+		callbacks = dedicated.load_recording(options['replay']) if options['replay'] else None
+		loop.run_until_complete(dedicated.start())
+
+		# Point the pool to the fake dedicated server (and to a separate database when given).
+		try:
+			settings.DEDICATED[pool] = dict(settings.DEDICATED[pool], HOST=dedicated.host, PORT=dedicated.port)
+			settings.DEDICATED[pool].pop('RECORD_TRAFFIC', None)
+		except KeyError:
+			raise CommandError('Pool \'{}\' is not configured in the DEDICATED setting!'.format(pool))
+		if options['database']:
+			try:
+				settings.DATABASES[pool] = dict(settings.DATABASES[pool], NAME=options['database'])
+			except KeyError:
+				raise CommandError('Pool \'{}\' is not configured in the DATABASES setting!'.format(pool))
+
+		instance = Controller.prepare(pool).instance
+		logger.info('Starting PyPlanet against the fake dedicated server on port {}...'.format(dedicated.port))
+
+		try:
+			loop.run_until_complete(self.bench(instance, dedicated, callbacks, options))
+		finally:
+			loop.run_until_complete(instance._stop())
+			loop.run_until_complete(dedicated.close())
+
+	async def bench(self, instance, dedicated, callbacks, options):
+		await instance._start()
+		benchmark = Benchmark(instance, dedicated)
+
+		if callbacks is not None:
+			await benchmark.start()
+			await dedicated.replay(callbacks, speed=options['speed'])
+		else:
+			# Wait for the players to be connected before they start driving.
+			await benchmark.start()
+			await dedicated.connect_players(options['players'])
+			await self.wait_idle(benchmark, options)
+			await dedicated.race(rounds=options['rounds'], checkpoints=options['checkpoints'])
+			await dedicated.chat(messages=options['chat'])
+			await self.wait_idle(benchmark, options)
+			await dedicated.disconnect_players()
+
+		await self.wait_idle(benchmark, options)
+		benchmark.stop()
+
+		self.stdout.write('\n'.join(instance.startup_timeline.report(limit=10)))
+		self.stdout.write('')
+		self.stdout.write('\n'.join(benchmark.report()))
+
+	async def wait_idle(self, benchmark, options):
+		if not await benchmark.wait_idle(timeout=options['timeout']):
+			self.stderr.write('Not all callbacks have been handled within the timeout!')
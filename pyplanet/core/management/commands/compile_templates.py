@@ -0,0 +1,40 @@
+import time
+
+from pyplanet.conf import settings
+from pyplanet.core import Controller
+from pyplanet.core.management import BaseCommand, CommandError
+from pyplanet.core.ui.template import EnvironmentManager
+
+
+class Command(BaseCommand):  # pragma: no cover
+	help = (
+		'Compile the templates of the core and all the apps of the pool ahead of time into the template cache, so the '
+		'templates don\'t have to be compiled when displayed for the first time.'
+	)
+
+	requires_system_checks = False
+	requires_migrations_checks = False
+
+	def add_arguments(self, parser):
+		parser.add_argument('--verbose', action='store_true', help='Show the names of the compiled templates.')
+
+	def handle(self, *args, **options):
+		settings._setup()
+		if not settings.TEMPLATE_CACHE:
+			raise CommandError('The template cache is disabled, enable the TEMPLATE_CACHE setting first!')
+
+		# The instance is required to populate the apps (and the template loaders of the apps).
+		Controller.prepare(options['pool'] or 'default')
+
+		started_at = time.monotonic()
+		names = EnvironmentManager.list_templates()
+		compiled, errors = EnvironmentManager.compile_templates(names)
+
+		if options['verbose']:
+			for name in names:
+				if name not in errors:
+					self.stdout.write('Compiled {}'.format(name))
+		for name, error in sorted(errors.items()):
+			self.stderr.write('Can\'t compile {}: {}'.format(name, str(error)))
+
+		self.stdout.write('Compiled {} of {} templates in {:.3f}s.'.format(compiled, len(names), time.monotonic() - started_at))
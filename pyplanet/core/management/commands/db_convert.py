@@ -33,6 +33,17 @@ class Command(BaseCommand):
 			help='Source database table prefix. Leave empty for using no prefix or the default one by the source type.',
 			default=None,
 		)
+		parser.add_argument(
+			'--chunk-size', type=int, default=500, help='Number of source rows to convert at once (in one transaction).'
+		)
+		parser.add_argument(
+			'--checkpoint', default=None,
+			help='Path of the file to save the progress to, defaults to a file in the TMP_PATH. An interrupted conversion '
+				 'continues from the checkpoint when started again.'
+		)
+		parser.add_argument(
+			'--restart', action='store_true', help='Ignore the progress in the checkpoint and start from the beginning.'
+		)
 
 	def handle(self, *args, **options):
 		if options['source_db_password'] is None:
@@ -43,7 +54,8 @@ class Command(BaseCommand):
 			options['source_format'], instance=instance, db_name=options['source_db_name'],
 			db_type=options['source_db_type'], db_user=options['source_db_username'],
 			db_port=options['source_db_port'], db_password=options['source_db_password'],
-			db_host=options['source_db_host'], prefix=options['source_db_prefix']
+			db_host=options['source_db_host'], prefix=options['source_db_prefix'],
+			chunk_size=options['chunk_size'], checkpoint=options['checkpoint'], restart=options['restart'],
 		)
 
 		instance.loop.run_until_complete(self.convert(instance, converter))
@@ -0,0 +1,84 @@
+import json
+
+from pyplanet.conf import settings
+from pyplanet.core.management import BaseCommand, CommandError
+from pyplanet.core.metrics.exposition import read_snapshots, get_metrics_path
+
+
+def get_value(snapshot, name, labels=()):
+	metric = snapshot['metrics'].get(name)
+	if not metric:
+		return None
+	for sample_labels, value in metric['samples']:
+		if tuple(sample_labels) == tuple(labels):
+			return value
+	return None
+
+
+def format_bytes(value):
+	if value is None:
+		return 'unknown'
+	for unit in ('B', 'KiB', 'MiB'):
+		if value < 1024:
+			return '{:.1f} {}'.format(value, unit)
+		value /= 1024
+	return '{:.1f} GiB'.format(value)
+
+
+class Command(BaseCommand):  # pragma: no cover
+	help = 'Show the memory usage and the player cache statistics of the running pools (requires METRICS_ENABLED).'
+
+	requires_system_checks = False
+	requires_migrations_checks = False
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			'--all-pools', dest='all_pools', action='store_true',
+			help='Show the memory usage of all the pools instead of only the given pool.'
+		)
+		parser.add_argument(
+			'--format', type=str, default='text', choices=['text', 'json'],
+			help='Output as readable text (default) or as JSON.'
+		)
+
+	def handle(self, *args, **options):
+		settings._setup()
+
+		pools = settings.POOLS if options['all_pools'] else [options['pool'] or 'default']
+		snapshots = read_snapshots(pools=pools)
+		if not snapshots:
+			raise CommandError(
+				'No metrics found in \'{}\'. Is the pool running with METRICS_ENABLED = True?'.format(get_metrics_path())
+			)
+
+		reports = dict()
+		for pool, snapshot in snapshots.items():
+			reports[pool] = dict(
+				resident_memory=get_value(snapshot, 'pyplanet_process_resident_memory_bytes'),
+				gc_objects=get_value(snapshot, 'pyplanet_gc_objects'),
+				gc_garbage=get_value(snapshot, 'pyplanet_gc_garbage'),
+				player_cache={
+					stat: get_value(snapshot, 'pyplanet_player_cache', (stat,))
+					for stat in ('size', 'pinned', 'max_size', 'hits', 'misses', 'evictions')
+				},
+				map_cache=get_value(snapshot, 'pyplanet_map_cache_size'),
+			)
+
+		if options['format'] == 'json':
+			self.stdout.write(json.dumps(reports, indent=2))
+			return
+
+		for pool, report in sorted(reports.items()):
+			cache = report['player_cache']
+			lookups = (cache['hits'] or 0) + (cache['misses'] or 0)
+			self.stdout.write('Pool \'{}\':'.format(pool))
+			self.stdout.write('  Resident memory:     {}'.format(format_bytes(report['resident_memory'])))
+			self.stdout.write('  Tracked objects:     {}'.format(report['gc_objects']))
+			self.stdout.write('  Uncollectable:       {}'.format(report['gc_garbage']))
+			self.stdout.write('  Player cache:        {} players ({} online), max {}'.format(
+				cache['size'], cache['pinned'], cache['max_size'] or 'unlimited'
+			))
+			self.stdout.write('  Player cache hits:   {} of {} lookups, {} evictions'.format(
+				cache['hits'], lookups, cache['evictions']
+			))
+			self.stdout.write('  Map cache:           {} maps'.format(report['map_cache']))
@@ -0,0 +1,37 @@
+import json
+
+from pyplanet.conf import settings
+from pyplanet.core.management import BaseCommand, CommandError
+from pyplanet.core.metrics.exposition import read_snapshots, render, get_metrics_path
+
+
+class Command(BaseCommand):  # pragma: no cover
+	help = 'Show the collected metrics of the running pools (requires METRICS_ENABLED).'
+
+	requires_system_checks = False
+	requires_migrations_checks = False
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			'--all-pools', dest='all_pools', action='store_true',
+			help='Show the metrics of all the pools instead of only the given pool.'
+		)
+		parser.add_argument(
+			'--format', type=str, default='text', choices=['text', 'json'],
+			help='Output in the Prometheus text format (default) or the raw JSON snapshots.'
+		)
+
+	def handle(self, *args, **options):
+		settings._setup()
+
+		pools = settings.POOLS if options['all_pools'] else [options['pool'] or 'default']
+		snapshots = read_snapshots(pools=pools)
+		if not snapshots:
+			raise CommandError(
+				'No metrics found in \'{}\'. Is the pool running with METRICS_ENABLED = True?'.format(get_metrics_path())
+			)
+
+		if options['format'] == 'json':
+			self.stdout.write(json.dumps(snapshots, indent=2))
+		else:
+			self.stdout.write(render(snapshots), ending='')
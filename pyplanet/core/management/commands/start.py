@@ -12,6 +12,7 @@ except:
 
 from pyplanet.conf import settings
 from pyplanet.core.management import BaseCommand
+from pyplanet.core.metrics.exposition import MetricsServer
 from pyplanet.god.pool import EnvironmentPool
 from pyplanet.utils.log import initiate_logger
 
@@ -30,10 +31,14 @@ class Command(BaseCommand):  # pragma: no cover
 		self.pid = None
 
 		self.pool = None
+		self.metrics_server = None
 
 	def add_arguments(self, parser):
 		parser.add_argument('--max-restarts', type=int, default=0)
-		parser.add_argument('--tokio', dest='tokio', action='store_true')
+		parser.add_argument(
+			'--loop', type=str, default=None, choices=['asyncio', 'uvloop', 'auto'],
+			help='Event loop policy, overrides the EVENT_LOOP_POLICY setting.'
+		)
 		parser.add_argument('--detach', dest='detach', action='store_true')
 		parser.add_argument('--pid-file', type=str, default=None)
 
@@ -66,6 +71,11 @@ class Command(BaseCommand):  # pragma: no cover
 		# Starting all processes.
 		self.pool.start()
 
+		# Expose the aggregated metrics of all pools.
+		if settings.METRICS_ENABLED and settings.METRICS_PORT:
+			self.metrics_server = MetricsServer(settings.METRICS_HOST, int(settings.METRICS_PORT), pools=settings.POOLS)
+			self.metrics_server.start()
+
 		# Start the watchdog.
 		try:
 			self.pool.watchdog()
@@ -0,0 +1,21 @@
+"""
+The metrics package contains the lightweight in-process metrics registry (counters, gauges and histograms) and the
+exposition of the metrics in the Prometheus text format.
+"""
+from .registry import MetricsRegistry, Counter, Gauge, Histogram, DEFAULT_BUCKETS
+
+registry = MetricsRegistry()
+"""
+The metrics registry of the process.
+
+:type registry: pyplanet.core.metrics.registry.MetricsRegistry
+"""
+
+__all__ = [
+	'registry',
+	'MetricsRegistry',
+	'Counter',
+	'Gauge',
+	'Histogram',
+	'DEFAULT_BUCKETS',
+]
@@ -0,0 +1,222 @@
+"""
+Exposition of the metrics in the Prometheus text format. Every pool process writes a snapshot of its metrics to the metrics
+path, the god process (and the ``metrics`` management command) aggregates the snapshots of all pools.
+"""
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from pyplanet.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def get_metrics_path():
+	"""
+	Get the path where the snapshots of the pools are written to.
+
+	:return: Directory path.
+	"""
+	if settings.METRICS_PATH:
+		return settings.METRICS_PATH
+	return os.path.join(settings.TMP_PATH or tempfile.gettempdir(), 'metrics')
+
+
+def format_value(value):
+	if value == float('inf'):
+		return '+Inf'
+	if isinstance(value, float) and value.is_integer():
+		return str(int(value))
+	return repr(value) if isinstance(value, float) else str(value)
+
+
+def format_labels(names, values, extra=None):
+	pairs = list(zip(names, values))
+	if extra:
+		pairs = list(extra) + pairs
+	if not pairs:
+		return ''
+	return '{{{}}}'.format(','.join(
+		'{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"'))
+		for name, value in pairs
+	))
+
+
+def render(snapshots):
+	"""
+	Render the snapshots in the Prometheus text exposition format. Every sample gets the ``pool`` label.
+
+	:param snapshots: Dictionary with pool name as key and the snapshot as value.
+	:return: Text.
+	"""
+	now = time.time()
+	lines = [
+		'# HELP pyplanet_snapshot_age_seconds Age of the metrics snapshot of the pool.',
+		'# TYPE pyplanet_snapshot_age_seconds gauge',
+	]
+	for pool, snapshot in sorted(snapshots.items()):
+		lines.append('pyplanet_snapshot_age_seconds{} {}'.format(
+			format_labels((), (), [('pool', pool)]), format_value(round(now - snapshot.get('timestamp', now), 3))
+		))
+
+	# All samples of a metric should be grouped together, over all the pools.
+	names = sorted(set(name for snapshot in snapshots.values() for name in snapshot.get('metrics', dict())))
+	for name in names:
+		described = False
+		for pool, snapshot in sorted(snapshots.items()):
+			metric = snapshot['metrics'].get(name)
+			if not metric:
+				continue
+			if not described:
+				described = True
+				lines.append('# HELP {} {}'.format(name, metric['help']))
+				lines.append('# TYPE {} {}'.format(name, metric['type']))
+
+			pool_label = [('pool', pool)]
+			labelnames = metric['labelnames']
+			for labels, value in metric['samples']:
+				if metric['type'] != 'histogram':
+					lines.append('{}{} {}'.format(name, format_labels(labelnames, labels, pool_label), format_value(value)))
+					continue
+
+				cumulative = 0
+				for bound, count in zip(metric['buckets'] + [float('inf')], value[:-1]):
+					cumulative += count
+					lines.append('{}_bucket{} {}'.format(
+						name, format_labels(labelnames + ['le'], labels + [format_value(float(bound))], pool_label),
+						cumulative
+					))
+				lines.append('{}_sum{} {}'.format(name, format_labels(labelnames, labels, pool_label), format_value(value[-1])))
+				lines.append('{}_count{} {}'.format(name, format_labels(labelnames, labels, pool_label), cumulative))
+
+	return '\n'.join(lines) + '\n'
+
+
+def create_snapshot(registry):
+	return dict(timestamp=time.time(), pid=os.getpid(), metrics=registry.collect())
+
+
+def write_snapshot(registry, pool, path=None):
+	"""
+	Write the snapshot of the registry for the pool (atomically).
+
+	:param registry: Metrics registry.
+	:param pool: Pool name.
+	:param path: Metrics path, defaults to the configured path.
+	"""
+	path = path or get_metrics_path()
+	os.makedirs(path, exist_ok=True)
+
+	target = os.path.join(path, '{}.json'.format(pool))
+	with open('{}.tmp'.format(target), 'w') as fh:
+		json.dump(create_snapshot(registry), fh)
+	os.replace('{}.tmp'.format(target), target)
+
+
+def read_snapshots(pools=None, path=None):
+	"""
+	Read the snapshots of the pools.
+
+	:param pools: Pool names, defaults to all configured pools.
+	:param path: Metrics path, defaults to the configured path.
+	:return: Dictionary with the pool name as key and the snapshot as value. Pools without snapshot are left out.
+	"""
+	path = path or get_metrics_path()
+	snapshots = dict()
+	for pool in pools or settings.POOLS:
+		try:
+			with open(os.path.join(path, '{}.json'.format(pool)), 'r') as fh:
+				snapshots[pool] = json.load(fh)
+		except (IOError, ValueError):
+			continue
+	return snapshots
+
+
+class SnapshotWriter:
+	"""
+	Periodically write the snapshot of the metrics of the pool process.
+	"""
+
+	def __init__(self, instance, registry, interval=None):
+		"""
+		:param instance: Controller instance.
+		:param registry: Metrics registry.
+		:param interval: Interval in seconds, defaults to the ``METRICS_INTERVAL`` setting.
+		:type instance: pyplanet.core.instance.Instance
+		"""
+		self.instance = instance
+		self.registry = registry
+		self.interval = interval or settings.METRICS_INTERVAL
+		self.task = None
+
+	def start(self):
+		if not self.task:
+			self.task = asyncio.ensure_future(self.loop())
+
+	def stop(self):
+		if self.task:
+			self.task.cancel()
+			self.task = None
+
+	async def loop(self):
+		while True:
+			try:
+				write_snapshot(self.registry, self.instance.process_name)
+			except Exception as e:
+				logger.warning('Can\'t write the metrics snapshot: {}'.format(str(e)))
+			await asyncio.sleep(self.interval)
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+	daemon_threads = True
+
+
+class MetricsServer:
+	"""
+	HTTP endpoint exposing the aggregated metrics of all the pools, runs in a thread of the god process.
+	"""
+
+	def __init__(self, host, port, pools=None):
+		self.host = host
+		self.port = port
+		self.pools = pools
+		self.server = None
+		self.thread = None
+
+	def start(self):
+		pools = self.pools
+
+		class Handler(BaseHTTPRequestHandler):
+			def do_GET(self):
+				if self.path.split('?')[0] not in ('/', '/metrics'):
+					self.send_error(404)
+					return
+				body = render(read_snapshots(pools=pools)).encode()
+				self.send_response(200)
+				self.send_header('Content-Type', CONTENT_TYPE)
+				self.send_header('Content-Length', str(len(body)))
+				self.end_headers()
+				self.wfile.write(body)
+
+			def log_message(self, format, *args):
+				logger.debug('Metrics endpoint: {}'.format(format % args))
+
+		self.server = _ThreadingHTTPServer((self.host, self.port), Handler)
+		self.thread = threading.Thread(target=self.server.serve_forever, name='Metrics', daemon=True)
+		self.thread.start()
+		logger.info('Metrics endpoint listening on http://{}:{}/metrics'.format(self.host, self.server.server_address[1]))
+
+	def stop(self):
+		if self.server:
+			self.server.shutdown()
+			self.server.server_close()
+			self.server = None
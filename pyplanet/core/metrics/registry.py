@@ -0,0 +1,196 @@
+import bisect
+import threading
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""
+Default histogram buckets (upper bounds in seconds).
+"""
+
+
+class Metric:
+	"""
+	Base of the metrics. The values are kept per combination of label values. When the registry is disabled, all updates
+	return directly.
+	"""
+	type = None
+
+	def __init__(self, registry, name, documentation, labelnames=()):
+		"""
+		Initiate metric, please use the registry to create the metrics.
+
+		:param registry: Registry instance.
+		:param name: Name of the metric, for example ``pyplanet_gbx_calls_total``.
+		:param documentation: Description of the metric.
+		:param labelnames: Tuple with the names of the labels.
+		:type registry: pyplanet.core.metrics.registry.MetricsRegistry
+		"""
+		self.registry = registry
+		self.name = name
+		self.documentation = documentation
+		self.labelnames = tuple(labelnames)
+		self.values = dict()
+
+	def clear(self):
+		self.values.clear()
+
+	def collect(self):
+		"""
+		Collect the samples of the metric.
+
+		:return: Dictionary with the metric description and the samples.
+		"""
+		return dict(
+			type=self.type, help=self.documentation, labelnames=list(self.labelnames),
+			samples=[[list(labels), value] for labels, value in self.values.items()],
+		)
+
+
+class Counter(Metric):
+	"""
+	Counter, a value that only goes up.
+	"""
+	type = 'counter'
+
+	def inc(self, amount=1, labels=()):
+		"""
+		Increase the counter.
+
+		:param amount: Amount to increase.
+		:param labels: Tuple with the label values.
+		"""
+		if not self.registry.enabled:
+			return
+		self.values[labels] = self.values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+	"""
+	Gauge, a value that can go up and down.
+	"""
+	type = 'gauge'
+
+	def set(self, value, labels=()):
+		"""
+		Set the value of the gauge.
+
+		:param value: New value.
+		:param labels: Tuple with the label values.
+		"""
+		if not self.registry.enabled:
+			return
+		self.values[labels] = value
+
+	def inc(self, amount=1, labels=()):
+		if not self.registry.enabled:
+			return
+		self.values[labels] = self.values.get(labels, 0) + amount
+
+	def dec(self, amount=1, labels=()):
+		self.inc(-amount, labels=labels)
+
+
+class Histogram(Metric):
+	"""
+	Histogram with fixed buckets. The value per label values is a list with the (non-cumulative) counts per bucket, the
+	last one being the +Inf bucket, followed by the sum of all observed values.
+	"""
+	type = 'histogram'
+
+	def __init__(self, *args, buckets=DEFAULT_BUCKETS, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.buckets = tuple(sorted(buckets))
+
+	def observe(self, value, labels=()):
+		"""
+		Observe a value.
+
+		:param value: Value (in most cases duration in seconds).
+		:param labels: Tuple with the label values.
+		"""
+		if not self.registry.enabled:
+			return
+		counts = self.values.get(labels)
+		if counts is None:
+			counts = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+		counts[bisect.bisect_left(self.buckets, value)] += 1
+		counts[-1] += value
+
+	def collect(self):
+		data = super().collect()
+		data['buckets'] = list(self.buckets)
+		return data
+
+
+class MetricsRegistry:
+	"""
+	The metrics registry holds all the metrics of the process. The registry is disabled by default, the updates of the
+	metrics are ignored until the registry is enabled (``METRICS_ENABLED`` setting).
+
+	.. code-block:: python
+
+		from pyplanet.core.metrics import registry
+
+		CALLS = registry.counter('myapp_calls_total', 'Number of calls.', labelnames=('method',))
+		CALLS.inc(labels=('GetVersion',))
+
+	"""
+
+	def __init__(self):
+		self.enabled = False
+		self.metrics = dict()
+		self.lock = threading.Lock()
+
+	def register(self, cls, name, *args, **kwargs):
+		with self.lock:
+			if name in self.metrics:
+				if not isinstance(self.metrics[name], cls):
+					raise ValueError('Metric \'{}\' is already registered with another type!'.format(name))
+				return self.metrics[name]
+			self.metrics[name] = metric = cls(self, name, *args, **kwargs)
+			return metric
+
+	def counter(self, name, documentation, labelnames=()):
+		"""
+		Create (or get the existing) counter.
+
+		:param name: Name of the metric.
+		:param documentation: Description of the metric.
+		:param labelnames: Tuple with the names of the labels.
+		:rtype: pyplanet.core.metrics.registry.Counter
+		"""
+		return self.register(Counter, name, documentation, labelnames=labelnames)
+
+	def gauge(self, name, documentation, labelnames=()):
+		"""
+		Create (or get the existing) gauge.
+
+		:param name: Name of the metric.
+		:param documentation: Description of the metric.
+		:param labelnames: Tuple with the names of the labels.
+		:rtype: pyplanet.core.metrics.registry.Gauge
+		"""
+		return self.register(Gauge, name, documentation, labelnames=labelnames)
+
+	def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+		"""
+		Create (or get the existing) histogram.
+
+		:param name: Name of the metric.
+		:param documentation: Description of the metric.
+		:param labelnames: Tuple with the names of the labels.
+		:param buckets: Upper bounds of the buckets.
+		:rtype: pyplanet.core.metrics.registry.Histogram
+		"""
+		return self.register(Histogram, name, documentation, labelnames=labelnames, buckets=buckets)
+
+	def collect(self):
+		"""
+		Collect all the metrics.
+
+		:return: Dictionary with the metric name as key and the collected samples as value.
+		"""
+		return {name: metric.collect() for name, metric in self.metrics.items()}
+
+	def clear(self):
+		for metric in self.metrics.values():
+			metric.clear()
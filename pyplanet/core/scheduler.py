@@ -0,0 +1,312 @@
+"""
+The scheduler runs the delayed and recurring jobs of the core and the apps (vote timeouts, reminders, messages). All jobs
+are kept in one heap ordered by the due time, with a single timer handle on the event loop for the first due job. An idle
+controller only wakes up when a job is actually due, instead of every sleeping loop waking up on its own.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+
+from pyplanet.core import metrics
+from pyplanet.utils.log import handle_exception
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_JOBS = metrics.registry.gauge(
+	'pyplanet_scheduler_jobs', 'Scheduled (pending) jobs of the scheduler.'
+)
+SCHEDULER_RUNS = metrics.registry.counter(
+	'pyplanet_scheduler_runs_total', 'Executed jobs per owner.', labelnames=('owner',)
+)
+
+
+class Job:
+	"""
+	Handle of a scheduled job, can be used to cancel the job.
+
+	:ivar name: Name of the job.
+	:ivar owner: Owner of the job (app label or core component).
+	:ivar when: Loop time the job is due.
+	:ivar interval: Interval in seconds for recurring jobs, None for a single run.
+	"""
+	__slots__ = ('scheduler', 'callback', 'args', 'kwargs', 'name', 'owner', 'when', 'interval', 'cancelled', 'task')
+
+	def __init__(self, scheduler, callback, args, kwargs, when, interval=None, name=None, owner=None):
+		self.scheduler = scheduler
+		self.callback = callback
+		self.args = args
+		self.kwargs = kwargs
+		self.when = when
+		self.interval = interval
+		self.name = name or getattr(callback, '__qualname__', repr(callback))
+		self.owner = owner
+		self.cancelled = False
+		self.task = None
+
+	def __repr__(self):
+		return '<Job {} of {} due at {:.3f}{}>'.format(
+			self.name, self.owner or 'core', self.when, ' every {}s'.format(self.interval) if self.interval else ''
+		)
+
+	def __lt__(self, other):
+		return self.when < other.when
+
+	@property
+	def pending(self):
+		"""
+		True when the job is scheduled to run (again).
+		"""
+		return not self.cancelled and self.scheduler is not None and self in self.scheduler.jobs
+
+	def cancel(self, running=True):
+		"""
+		Cancel the job, a recurring job won't run again.
+
+		:param running: Also cancel the task of the job when it's running at the moment.
+		"""
+		if self.cancelled:
+			return
+		self.cancelled = True
+		if running and self.task and not self.task.done() and self.task is not _current_task():
+			self.task.cancel()
+		if self.scheduler:
+			self.scheduler.remove(self)
+
+
+def _current_task():
+	try:
+		if hasattr(asyncio, 'current_task'):
+			return asyncio.current_task()
+		return asyncio.Task.current_task()
+	except RuntimeError:
+		return None
+
+
+class Scheduler:
+	"""
+	The scheduler of the instance. Apps should use the scheduler of their app context (``self.context.scheduler``), so the
+	jobs of the app are cancelled when the app is stopped.
+
+	.. code-block:: python
+
+		job = self.instance.scheduler.call_later(10, self.remind, vote, owner='voting')
+		job.cancel()
+
+		self.instance.scheduler.call_every(60, self.send_message, owner='ads')
+	"""
+
+	def __init__(self, loop=None):
+		self.loop = loop or asyncio.get_event_loop()
+		self.jobs = set()
+		self.running = set()
+
+		self._heap = list()
+		self._counter = itertools.count()
+		self._timer = None
+		self._timer_when = None
+
+	def call_later(self, delay, callback, *args, name=None, owner=None, **kwargs):
+		"""
+		Run the callback once after the delay.
+
+		:param delay: Delay in seconds.
+		:param callback: Function or coroutine function.
+		:param args: Arguments for the callback.
+		:param name: Name of the job (for debugging), defaults to the name of the callback.
+		:param owner: Owner of the job, used to cancel all jobs of the owner.
+		:param kwargs: Keyword arguments for the callback.
+		:return: Job handle.
+		:rtype: pyplanet.core.scheduler.Job
+		"""
+		return self.schedule(Job(self, callback, args, kwargs, self.loop.time() + max(delay, 0), name=name, owner=owner))
+
+	def call_every(self, interval, callback, *args, delay=None, name=None, owner=None, **kwargs):
+		"""
+		Run the callback every interval. The next run is planned after the previous run finished, runs never overlap.
+
+		:param interval: Interval in seconds.
+		:param callback: Function or coroutine function.
+		:param args: Arguments for the callback.
+		:param delay: Delay of the first run, defaults to the interval.
+		:param name: Name of the job (for debugging), defaults to the name of the callback.
+		:param owner: Owner of the job, used to cancel all jobs of the owner.
+		:param kwargs: Keyword arguments for the callback.
+		:return: Job handle.
+		:rtype: pyplanet.core.scheduler.Job
+		"""
+		if not interval or interval <= 0:
+			raise ValueError('The interval of a recurring job must be positive!')
+		when = self.loop.time() + (interval if delay is None else max(delay, 0))
+		return self.schedule(Job(self, callback, args, kwargs, when, interval=interval, name=name, owner=owner))
+
+	def schedule(self, job):
+		job.cancelled = False
+		self.jobs.add(job)
+		heapq.heappush(self._heap, (job.when, next(self._counter), job))
+		SCHEDULER_JOBS.set(len(self.jobs))
+		self._arm()
+		return job
+
+	def remove(self, job):
+		"""
+		Remove the job from the scheduler. The entry in the heap is dropped lazily, when it's due.
+		"""
+		self.jobs.discard(job)
+		self.running.discard(job)
+		SCHEDULER_JOBS.set(len(self.jobs))
+
+		# Compact the heap when it's mostly cancelled entries.
+		if len(self._heap) > 64 and len(self._heap) > len(self.jobs) * 2:
+			self._heap = [entry for entry in self._heap if entry[2] in self.jobs]
+			heapq.heapify(self._heap)
+		if not self.jobs:
+			self._disarm()
+
+	def cancel_owner(self, owner):
+		"""
+		Cancel all the jobs of the owner, including the running jobs.
+
+		:param owner: Owner (app label).
+		:return: Number of cancelled jobs.
+		"""
+		jobs = [job for job in self.jobs | self.running if job.owner == owner]
+		for job in jobs:
+			job.cancel()
+		return len(jobs)
+
+	def get_jobs(self, owner=None):
+		"""
+		Get the pending jobs, ordered by the due time.
+
+		:param owner: Only the jobs of the owner.
+		:return: List of jobs.
+		"""
+		return sorted(job for job in self.jobs if owner is None or job.owner == owner)
+
+	def stop(self):
+		"""
+		Cancel all the jobs.
+		"""
+		for job in list(self.jobs | self.running):
+			job.cancel()
+		self._heap.clear()
+		self._disarm()
+
+	def _arm(self):
+		"""
+		Make sure the timer handle is set for the first due job.
+		"""
+		while self._heap and self._heap[0][2] not in self.jobs:
+			heapq.heappop(self._heap)
+		if not self._heap:
+			self._disarm()
+			return
+
+		when = self._heap[0][0]
+		if self._timer is not None and self._timer_when <= when:
+			return
+		self._disarm()
+		self._timer_when = when
+		self._timer = self.loop.call_at(when, self._run_due)
+
+	def _disarm(self):
+		if self._timer is not None:
+			self._timer.cancel()
+		self._timer = None
+		self._timer_when = None
+
+	def _run_due(self):
+		self._timer = None
+		self._timer_when = None
+
+		now = self.loop.time()
+		while self._heap and self._heap[0][0] <= now:
+			_, _, job = heapq.heappop(self._heap)
+			if job not in self.jobs or job.when > now:
+				continue
+			self.jobs.discard(job)
+			self._run(job)
+
+		SCHEDULER_JOBS.set(len(self.jobs))
+		self._arm()
+
+	def _run(self, job):
+		SCHEDULER_RUNS.inc(labels=(job.owner or 'core',))
+		try:
+			result = job.callback(*job.args, **job.kwargs)
+		except Exception as e:
+			self._handle_exception(job, e)
+			self._reschedule(job)
+			return
+
+		if asyncio.iscoroutine(result) or isinstance(result, asyncio.Future):
+			self.running.add(job)
+			job.task = asyncio.ensure_future(result, loop=self.loop)
+			job.task.add_done_callback(lambda task: self._done(job, task))
+		else:
+			self._reschedule(job)
+
+	def _done(self, job, task):
+		job.task = None
+		self.running.discard(job)
+		if task.cancelled():
+			return
+		if task.exception():
+			self._handle_exception(job, task.exception())
+		self._reschedule(job)
+
+	def _reschedule(self, job):
+		if job.interval and not job.cancelled:
+			# Skip the missed runs, don't run them all at once after the loop was blocked.
+			job.when = max(job.when + job.interval, self.loop.time())
+			self.schedule(job)
+
+	@staticmethod
+	def _handle_exception(job, exception):
+		logger.error('Scheduled job {} has thrown an exception!'.format(repr(job)))
+		handle_exception(exception, getattr(job.callback, '__module__', __name__), job.name)
+		logger.exception(exception)
+
+
+class AppScheduler:
+	"""
+	The scheduler of an app (in the app context). All the jobs are owned by the app, and are cancelled when the app is
+	stopped or unloaded.
+	"""
+
+	def __init__(self, instance, app):
+		"""
+		:param instance: Controller instance.
+		:param app: App config instance.
+		:type instance: pyplanet.core.instance.Instance
+		:type app: pyplanet.apps.config.AppConfig
+		"""
+		self._scheduler = instance.scheduler
+		self._app = app
+
+	def call_later(self, delay, callback, *args, **kwargs):
+		"""
+		Run the callback once after the delay. See :meth:`pyplanet.core.scheduler.Scheduler.call_later`.
+		"""
+		return self._scheduler.call_later(delay, callback, *args, owner=self._app.label, **kwargs)
+
+	def call_every(self, interval, callback, *args, **kwargs):
+		"""
+		Run the callback every interval. See :meth:`pyplanet.core.scheduler.Scheduler.call_every`.
+		"""
+		return self._scheduler.call_every(interval, callback, *args, owner=self._app.label, **kwargs)
+
+	def get_jobs(self):
+		return self._scheduler.get_jobs(owner=self._app.label)
+
+	def cancel_all(self):
+		"""
+		Cancel all the jobs of the app.
+
+		:return: Number of cancelled jobs.
+		"""
+		return self._scheduler.cancel_owner(self._app.label)
+
+	async def on_destroy(self):
+		self.cancel_all()
@@ -0,0 +1,127 @@
+"""
+Startup helpers: run components as a dependency graph (concurrently where possible) and record the startup timeline.
+"""
+import asyncio
+import logging
+import time
+
+from asyncio_extras import async_contextmanager
+from async_generator import yield_
+
+from pyplanet.utils.toposort import toposort
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimeline:
+	"""
+	The startup timeline records the duration of each phase of the startup, so we can see which component or app
+	dominates the boot time.
+
+	.. code-block:: python
+
+		async with instance.startup_timeline.phase('apps.karma'):
+			await app.on_start()
+
+	"""
+
+	def __init__(self):
+		self.started_at = None
+		self.finished_at = None
+		self.phases = list()
+
+	def start(self):
+		self.started_at = time.monotonic()
+		self.finished_at = None
+		self.phases = list()
+
+	def finish(self):
+		self.finished_at = time.monotonic()
+
+	@property
+	def total(self):
+		if self.started_at is None:
+			return 0.0
+		return (self.finished_at or time.monotonic()) - self.started_at
+
+	@async_contextmanager
+	async def phase(self, name):
+		"""
+		Record the duration of the phase executed inside of the context.
+
+		:param name: Name of the phase.
+		"""
+		started_at = time.monotonic()
+		try:
+			await yield_()
+		finally:
+			self.phases.append(dict(
+				name=name, offset=started_at - (self.started_at or started_at), duration=time.monotonic() - started_at
+			))
+
+	def report(self, limit=None):
+		"""
+		Get the timeline report as lines of text, slowest phases first.
+
+		:param limit: Limit the number of phases in the report.
+		:return: List of lines.
+		"""
+		phases = sorted(self.phases, key=lambda p: p['duration'], reverse=True)
+		if limit:
+			phases = phases[:limit]
+
+		lines = ['Startup took {:.3f}s, slowest phases:'.format(self.total)]
+		for phase in phases:
+			lines.append('  {:<40} {:>8.3f}s (at +{:.3f}s)'.format(phase['name'], phase['duration'], phase['offset']))
+		return lines
+
+	def log(self, limit=None):
+		for line in self.report(limit=limit):
+			logger.info(line)
+
+
+async def run_graph(graph, target, concurrent=True, timeline=None, prefix=''):
+	"""
+	Run the target for every node in the dependency graph. A node will only be started once all its dependencies are
+	finished. Nodes that don't depend on each other will run concurrently (unless concurrent is False). Dependencies
+	that aren't part of the graph itself are ignored.
+
+	:param graph: Adjacency dict {node1: [dep1, dep2], node2: [dep1]}, ordered (used when not concurrent).
+	:param target: Coroutine function that gets the node as its only argument.
+	:param concurrent: Run independent nodes concurrently, or run all in the order of the graph.
+	:param timeline: Optional timeline to record the duration of each node.
+	:param prefix: Prefix of the phase names in the timeline.
+	:raise: ValueError when the graph is cyclical.
+	"""
+	async def run(node):
+		if timeline:
+			async with timeline.phase('{}{}'.format(prefix, node)):
+				await target(node)
+		else:
+			await target(node)
+
+	if not concurrent:
+		for node in graph:
+			await run(node)
+		return
+
+	tasks = dict()
+
+	async def run_after_dependencies(node):
+		dependencies = [tasks[dep] for dep in graph[node] if dep in tasks]
+		if dependencies:
+			await asyncio.gather(*dependencies)
+		await run(node)
+
+	# The topological order guarantees that the tasks of the dependencies are created before the dependent tasks.
+	for node in toposort(graph):
+		if node in graph:
+			tasks[node] = asyncio.ensure_future(run_after_dependencies(node))
+
+	try:
+		await asyncio.gather(*tasks.values())
+	except BaseException:
+		for task in tasks.values():
+			if not task.done():
+				task.cancel()
+		raise
@@ -1,22 +1,80 @@
+import asyncio
 import asyncssh
 import logging
-import os
+import stat
+import time
 import async_generator
 import asyncio_extras
 
 from pyplanet.core.storage import StorageDriver
+from pyplanet.core.storage.exceptions import StorageException
 
 logger = logging.getLogger(__name__)
 
 
+def _current_task():
+	try:
+		if hasattr(asyncio, 'current_task'):
+			return asyncio.current_task()
+		return asyncio.Task.current_task()
+	except RuntimeError:
+		return None
+
+
+class SFTPConnection:
+	"""
+	Pooled SSH connection with its SFTP session.
+	"""
+
+	def __init__(self):
+		self.ssh = None
+		self.sftp = None
+		self.closed = False
+		self.last_used = time.monotonic()
+
+	@property
+	def healthy(self):
+		return not self.closed and self.ssh is not None and self.sftp is not None
+
+	async def close(self):
+		self.closed = True
+		try:
+			if self.sftp:
+				self.sftp.exit()
+			if self.ssh:
+				self.ssh.close()
+				await self.ssh.wait_closed()
+		except Exception as e:
+			logger.debug('Error while closing SFTP connection: {}'.format(str(e)))
+
+
+class SFTPClient(asyncssh.SSHClient):
+	"""
+	SSH client handler that marks the pooled connection as closed once the connection has been lost.
+	"""
+
+	def __init__(self, connection):
+		self.connection = connection
+
+	def connection_lost(self, exc):
+		self.connection.closed = True
+		if exc:
+			logger.warning('SFTP connection lost: {}'.format(str(exc)))
+
+
 class SFTPDriver(StorageDriver):
 	"""
 	SFTP storage driver is using the asyncssh module to access storage that is situated remotely.
-	
-	.. warning::
-	
-		This driver is not ready for production use!!
-	
+
+	The driver keeps a pool of persistent SSH connections (with the SFTP session started), instead of connecting for
+	every single file operation. Broken connections are detected and replaced transparently. File transfers are limited
+	to a configurable amount of concurrent transfers and are streamed in chunks. The results of ``stat`` calls are cached
+	for a short time as the same paths are checked often right after each other.
+
+	Nested operations of the same task (like opening a second file while a file is open) share the connection and the
+	transfer slot of the outer operation. Operations in other tasks wait for a free connection, don't wait for those
+	tasks while holding an open file when the pool is full.
+
 	:option HOST: Hostname of destinotion server.
 	:option PORT: Port destinotion server.
 	:option USERNAME: Username of the user account.
@@ -24,6 +82,12 @@ class SFTPDriver(StorageDriver):
 	:option KNOWN_HOSTS: File to the Known Hosts file.
 	:option CLIENT_KEYS: Array with client private keys.
 	:option PASSPHRASE: Passphrase to unlock private key(s).
+	:option POOL_SIZE: Maximum number of persistent connections. Defaults to 2.
+	:option MAX_TRANSFERS: Maximum number of concurrent file transfers (open, get and put). Defaults to 4.
+	:option CHUNK_SIZE: Size of the chunks (in bytes) used to stream file contents. Defaults to 16384.
+	:option MAX_REQUESTS: Maximum number of parallel chunk requests per transfer. Defaults to 128.
+	:option STAT_CACHE_TTL: Time (in seconds) to cache stat results. Defaults to 2, set to 0 to disable.
+	:option KEEPALIVE_INTERVAL: Interval (in seconds) of SSH keepalive messages for idle connections. Defaults to 30.
 	:option KWARGS: Any other options that will be passed to ``asyncssh``.
 	"""
 
@@ -40,66 +104,279 @@ class SFTPDriver(StorageDriver):
 		self.passphrase = config['PASSPHRASE'] if 'PASSPHRASE' in config else None
 		self.kwargs = config['KWARGS'] if 'KWARGS' in config and isinstance(config['KWARGS'], dict) else dict()
 
+		self.pool_size = max(1, int(config.get('POOL_SIZE', 2)))
+		self.max_transfers = max(1, int(config.get('MAX_TRANSFERS', 4)))
+		self.chunk_size = int(config.get('CHUNK_SIZE', 16384))
+		self.max_requests = int(config.get('MAX_REQUESTS', 128))
+		self.stat_cache_ttl = float(config.get('STAT_CACHE_TTL', 2))
+		self.keepalive_interval = int(config.get('KEEPALIVE_INTERVAL', 30))
+
 		self.options = dict(
 			host=self.host, port=self.port, known_hosts=self.known_hosts, username=self.username, password=self.password,
-			client_keys=self.client_keys, passphrase=self.passphrase,
+			client_keys=self.client_keys, passphrase=self.passphrase, keepalive_interval=self.keepalive_interval,
 		)
+		self.options.update(self.kwargs)
+
+		self._idle = list()
+		self._all = set()
+		self._connections = 0
+		self._generation = 0
+		self._held = dict()
+		self._transferring = dict()
+		self._pool_condition = None
+		self._transfers = None
+		self._stat_cache = dict()
+
+	@property
+	def pool_condition(self):
+		# Created lazily, the driver is initiated before the event loop is running.
+		if not self._pool_condition:
+			self._pool_condition = asyncio.Condition()
+		return self._pool_condition
+
+	@property
+	def transfers(self):
+		if not self._transfers:
+			self._transfers = asyncio.Semaphore(self.max_transfers)
+		return self._transfers
+
+	async def create_connection(self):
+		"""
+		Create a new SSH connection and start the SFTP session on it.
+
+		:return: Connection.
+		:rtype: pyplanet.core.storage.drivers.asyncssh.SFTPConnection
+		"""
+		connection = SFTPConnection()
+		connection.ssh, _ = await asyncssh.create_connection(lambda: SFTPClient(connection), **self.options)
+		try:
+			connection.sftp = await connection.ssh.start_sftp_client()
+		except:
+			await connection.close()
+			raise
+		return connection
+
+	async def acquire(self):
+		"""
+		Get a healthy connection from the pool, create one if the pool isn't full yet, or wait for a free connection. When
+		the current task already holds a connection, that connection is returned.
+
+		:return: Connection.
+		:rtype: pyplanet.core.storage.drivers.asyncssh.SFTPConnection
+		:raise: pyplanet.core.storage.exceptions.StorageException when the pool is closed while waiting.
+		"""
+		task = _current_task()
+		if task in self._held:
+			connection, depth = self._held[task]
+			self._held[task] = (connection, depth + 1)
+			return connection
+
+		async with self.pool_condition:
+			generation = self._generation
+			while True:
+				while self._idle:
+					connection = self._idle.pop()
+					if connection.healthy:
+						self._held[task] = (connection, 1)
+						return connection
+					self._all.discard(connection)
+					self._connections -= 1
+					await connection.close()
+
+				if self._connections < self.pool_size:
+					self._connections += 1
+					break
+				await self.pool_condition.wait()
+				if self._generation != generation:
+					raise StorageException('The SFTP connection pool has been closed.')
+
+		try:
+			connection = await self.create_connection()
+		except:
+			async with self.pool_condition:
+				if self._generation == generation:
+					self._connections -= 1
+				self.pool_condition.notify()
+			raise
+
+		if self._generation != generation:
+			await connection.close()
+			raise StorageException('The SFTP connection pool has been closed.')
+		self._all.add(connection)
+		self._held[task] = (connection, 1)
+		return connection
+
+	async def release(self, connection):
+		"""
+		Give the connection back to the pool. Broken connections and the connections of a closed pool are closed.
+
+		:param connection: Connection.
+		"""
+		task = _current_task()
+		held = self._held.get(task)
+		if held is not None and held[0] is connection:
+			if held[1] > 1:
+				self._held[task] = (connection, held[1] - 1)
+				return
+			del self._held[task]
+
+		async with self.pool_condition:
+			if connection not in self._all:
+				await connection.close()
+			elif connection.healthy:
+				connection.last_used = time.monotonic()
+				self._idle.append(connection)
+			else:
+				self._all.discard(connection)
+				self._connections -= 1
+				await connection.close()
+			self.pool_condition.notify()
+
+	@asyncio_extras.async_contextmanager
+	async def transfer_slot(self):
+		"""
+		Limit the number of concurrent transfers. A nested transfer of the same task uses the slot of the outer transfer.
+		"""
+		task = _current_task()
+		if task in self._transferring:
+			self._transferring[task] += 1
+			try:
+				await async_generator.yield_()
+			finally:
+				self._transferring[task] -= 1
+			return
+
+		async with self.transfers:
+			self._transferring[task] = 1
+			try:
+				await async_generator.yield_()
+			finally:
+				del self._transferring[task]
 
 	@asyncio_extras.async_contextmanager
 	async def connect(self):
-		ssh = await asyncssh.connect(
-			host=self.host, port=self.port, known_hosts=self.known_hosts, username=self.username, password=self.password,
-			client_keys=self.client_keys, passphrase=self.passphrase,
-		).__aenter__()
-		await async_generator.yield_(ssh)
-		await ssh.__aexit__()
+		"""
+		Get a pooled SSH connection.
+
+		:return: SSH connection.
+		:rtype: asyncssh.SSHClientConnection
+		"""
+		connection = await self.acquire()
+		try:
+			await async_generator.yield_(connection.ssh)
+		finally:
+			await self.release(connection)
 
 	@asyncio_extras.async_contextmanager
 	async def connect_sftp(self):
 		"""
-		Get sftp client.
-		
+		Get a pooled sftp client.
+
 		:return: Sftp client.
 		:rtype: asyncssh.SFTPClient
 		"""
-		ssh = await self.connect().__aenter__()
-		sftp = await ssh.start_sftp_client().__aenter__()
-		await async_generator.yield_(sftp)
-		await sftp.__aexit__()
-		await ssh.__aexit__()
+		connection = await self.acquire()
+		try:
+			await async_generator.yield_(connection.sftp)
+		except (asyncssh.DisconnectError, asyncssh.ChannelOpenError, ConnectionError):
+			connection.closed = True
+			raise
+		finally:
+			await self.release(connection)
+
+	def invalidate(self, *paths):
+		"""
+		Remove the given (relative) paths from the stat cache.
+
+		:param paths: Paths.
+		"""
+		for path in paths:
+			self._stat_cache.pop(self.absolute(path), None)
+
+	async def cached_stat(self, sftp, path):
+		"""
+		Get the attributes of the absolute path, or None if the path doesn't exist. Cached for a short time.
+
+		:param sftp: Sftp client.
+		:param path: Absolute path.
+		:return: Attributes or None.
+		:rtype: asyncssh.SFTPAttrs
+		"""
+		now = time.monotonic()
+		if path in self._stat_cache:
+			expires, attrs = self._stat_cache[path]
+			if expires > now:
+				return attrs
+
+		try:
+			attrs = await sftp.stat(path)
+		except asyncssh.SFTPError as e:
+			if e.code != asyncssh.FX_NO_SUCH_FILE:
+				raise
+			attrs = None
+
+		if self.stat_cache_ttl > 0:
+			self._stat_cache[path] = (now + self.stat_cache_ttl, attrs)
+		return attrs
 
 	async def chmod(self, path: str, mode: int, **kwargs):
+		self.invalidate(path)
 		async with self.connect_sftp() as sftp:
 			await sftp.chmod(self.absolute(path), mode)
 
 	async def chown(self, path: str, uid: int, gid: int, **kwargs):
+		self.invalidate(path)
 		async with self.connect_sftp() as sftp:
 			await sftp.chown(self.absolute(path), uid, gid)
 
 	async def close(self, **kwargs):
-		pass
+		"""
+		Close all connections of the pool, including the connections in use. The operations waiting for a connection fail
+		with a StorageException. The pool can be used again afterwards.
+		"""
+		async with self.pool_condition:
+			connections, self._all = self._all, set()
+			self._idle = list()
+			self._connections = 0
+			self._generation += 1
+			self._stat_cache.clear()
+			self.pool_condition.notify_all()
+		for connection in connections:
+			await connection.close()
 
 	@asyncio_extras.async_contextmanager
 	async def open(self, filename: str, mode: str = 'r', **kwargs):
-		sftp = await self.connect_sftp().__aenter__()
-		fh = await sftp.open(self.absolute(filename), mode, **kwargs).__aenter__()
-		await async_generator.yield_(fh)
-		await fh.__aexit__()
-		await sftp.__aexit__()
+		if mode[0] != 'r' or '+' in mode:
+			self.invalidate(filename)
+		kwargs.setdefault('block_size', self.chunk_size)
+		kwargs.setdefault('max_requests', self.max_requests)
+
+		async with self.transfer_slot():
+			async with self.connect_sftp() as sftp:
+				async with sftp.open(self.absolute(filename), mode, **kwargs) as fh:
+					await async_generator.yield_(fh)
 
 	async def get(self, remotepath: str, localpath: str, **kwargs):
-		async with self.connect_sftp() as sftp:
-			return await sftp.get(self.absolute(remotepath), localpath, preserve=True, follow_symlinks=True, **kwargs)
+		kwargs.setdefault('block_size', self.chunk_size)
+		kwargs.setdefault('max_requests', self.max_requests)
+		async with self.transfer_slot():
+			async with self.connect_sftp() as sftp:
+				return await sftp.get(self.absolute(remotepath), localpath, preserve=True, follow_symlinks=True, **kwargs)
 
 	async def put(self, localpath: str, remotepath: str, **kwargs):
-		async with self.connect_sftp() as sftp:
-			await sftp.put(localpath, self.absolute(remotepath), preserve=True, follow_symlinks=True, **kwargs)
+		self.invalidate(remotepath)
+		kwargs.setdefault('block_size', self.chunk_size)
+		kwargs.setdefault('max_requests', self.max_requests)
+		async with self.transfer_slot():
+			async with self.connect_sftp() as sftp:
+				await sftp.put(localpath, self.absolute(remotepath), preserve=True, follow_symlinks=True, **kwargs)
 
 	async def listdir(self, path='.', **kwargs):
 		async with self.connect_sftp() as sftp:
 			return await sftp.listdir(self.absolute(path))
 
 	async def mkdir(self, path, mode=511, **kwargs):
+		self.invalidate(path)
 		async with self.connect_sftp() as sftp:
 			attrs = asyncssh.SFTPAttrs()
 			attrs.permissions = mode
@@ -108,49 +385,61 @@ class SFTPDriver(StorageDriver):
 			await sftp.mkdir(self.absolute(path), attrs)
 
 	async def remove(self, path: str, **kwargs):
+		self.invalidate(path)
 		async with self.connect_sftp() as sftp:
 			await sftp.remove(self.absolute(path))
 
 	async def rename(self, oldpath: str, newpath: str, **kwargs):
+		self.invalidate(oldpath, newpath)
 		async with self.connect_sftp() as sftp:
 			await sftp.rename(self.absolute(oldpath), self.absolute(newpath))
 
 	async def rmdir(self, path: str, **kwargs):
+		# Directory contents could be cached, clear the complete cache.
+		self._stat_cache.clear()
 		async with self.connect_sftp() as sftp:
 			async def rm(file):
 				if await sftp.isdir(file):
-					files = await sftp.listdir(os.path.join(self.absolute(path), file))
-					for subfile in files:
-						await rm(subfile)
+					for subfile in await sftp.listdir(file):
+						if subfile not in ('.', '..'):
+							await rm('{}/{}'.format(file, subfile))
+					await sftp.rmdir(file)
 				else:
 					await sftp.remove(file)
 			await rm(self.absolute(path))
 
 	async def stat(self, path: str, **kwargs):
 		async with self.connect_sftp() as sftp:
-			return await sftp.stat(self.absolute(path))
+			attrs = await self.cached_stat(sftp, self.absolute(path))
+		if attrs is None:
+			raise asyncssh.SFTPError(asyncssh.FX_NO_SUCH_FILE, 'No such file')
+		return attrs
 
 	async def symlink(self, source: str, dest: str, **kwargs):
+		self.invalidate(dest)
 		async with self.connect_sftp() as sftp:
 			await sftp.symlink(self.absolute(source), self.absolute(dest))
 
 	async def exists(self, path: str, **kwargs):
 		async with self.connect_sftp() as sftp:
-			return await sftp.exists(self.absolute(path))
+			return await self.cached_stat(sftp, self.absolute(path)) is not None
 
 	async def is_file(self, path: str, **kwargs):
 		async with self.connect_sftp() as sftp:
-			return await sftp.isfile(self.absolute(path))
+			attrs = await self.cached_stat(sftp, self.absolute(path))
+		return attrs is not None and stat.S_ISREG(attrs.permissions)
 
 	async def is_dir(self, path: str, **kwargs):
 		async with self.connect_sftp() as sftp:
-			return await sftp.isdir(self.absolute(path))
+			attrs = await self.cached_stat(sftp, self.absolute(path))
+		return attrs is not None and stat.S_ISDIR(attrs.permissions)
 
 	async def is_link(self, path: str, **kwargs):
 		async with self.connect_sftp() as sftp:
 			return await sftp.islink(self.absolute(path))
 
 	async def touch(self, path: str, **kwargs):
+		self.invalidate(path)
 		async with self.connect_sftp() as sftp:
 			async with sftp.open(self.absolute(path), 'w+') as fh:
 				await fh.write('')
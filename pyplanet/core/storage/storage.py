@@ -1,12 +1,61 @@
 import asyncio_extras
+import functools
 import os
+import time
 
 import importlib
 from async_generator import yield_
 
 from pyplanet.conf import settings
+from pyplanet.core import metrics
 from pyplanet.core.storage import StorageDriver, StorageInterface
 
+STORAGE_DURATION = metrics.registry.histogram(
+	'pyplanet_storage_operation_duration_seconds', 'Duration of the storage driver operations.',
+	labelnames=('driver', 'operation')
+)
+STORAGE_OPENS = metrics.registry.counter(
+	'pyplanet_storage_opens_total', 'Files opened with the storage driver.', labelnames=('driver', 'mode')
+)
+
+INSTRUMENTED_OPERATIONS = (
+	'chmod', 'chown', 'get', 'put', 'listdir', 'mkdir', 'remove', 'rename', 'rmdir', 'stat', 'exists', 'is_file',
+	'is_dir', 'is_link', 'symlink', 'touch',
+)
+
+
+def instrument_driver(driver):
+	"""
+	Wrap the operations of the driver instance to collect metrics. Only used when the metrics are enabled.
+
+	:param driver: Driver instance.
+	:type driver: pyplanet.core.storage.interface.StorageDriver
+	"""
+	driver_name = type(driver).__name__
+
+	def wrap(operation, method):
+		labels = (driver_name, operation)
+
+		@functools.wraps(method)
+		async def wrapper(*args, **kwargs):
+			started_at = time.perf_counter()
+			try:
+				return await method(*args, **kwargs)
+			finally:
+				STORAGE_DURATION.observe(time.perf_counter() - started_at, labels=labels)
+		return wrapper
+
+	for operation in INSTRUMENTED_OPERATIONS:
+		setattr(driver, operation, wrap(operation, getattr(driver, operation)))
+
+	open_method = driver.open
+
+	@functools.wraps(open_method)
+	def open_wrapper(filename, mode='r', **kwargs):
+		STORAGE_OPENS.inc(labels=(driver_name, mode))
+		return open_method(filename, mode, **kwargs)
+	driver.open = open_wrapper
+
 
 class Storage(StorageInterface):
 	"""
@@ -46,6 +95,8 @@ class Storage(StorageInterface):
 		driver_options = storage_config['OPTIONS'] if 'OPTIONS' in storage_config else dict()
 		driver_cls = getattr(importlib.import_module(driver_path), driver_cls_name)
 		driver = driver_cls(instance, driver_options)
+		if metrics.registry.enabled:
+			instrument_driver(driver)
 		return cls(instance, driver, storage_config)
 
 	async def initialize(self):
@@ -1,14 +1,34 @@
 import asyncio
 import logging
+import weakref
 
 from xmlrpc.client import Fault
 
 from pyplanet.apps.core.maniaplanet.models import Player
+from pyplanet.conf import settings
+from pyplanet.core import metrics
+from pyplanet.core.ui.audience import SpectatorMap
+from pyplanet.core.ui.batch import UIBatch
+from pyplanet.core.ui.lifecycle import ViewRegistry, is_player_view
+from pyplanet.core.ui.signals import spectator_target_changed
 from pyplanet.core.ui.ui_properties import UIProperties
 from pyplanet.utils.log import handle_exception
 
 logger = logging.getLogger(__name__)
 
+UI_QUEUE_DEPTH = metrics.registry.gauge(
+	'pyplanet_ui_send_queue_depth', 'Queries waiting in the relaxed updating send queue.', labelnames=('manager',)
+)
+UI_QUERIES = metrics.registry.counter(
+	'pyplanet_ui_queries_total', 'Manialink display and hide queries.', labelnames=('manager', 'mode')
+)
+UI_PLAYER_VIEWS = metrics.registry.gauge(
+	'pyplanet_ui_player_views', 'Views owned by the players (lists, alerts and prompts).'
+)
+UI_VIEWS_REAPED = metrics.registry.counter(
+	'pyplanet_ui_views_reaped_total', 'Player views released by the UI manager.', labelnames=('reason',)
+)
+
 
 class _BaseUIManager:
 	def __init__(self, instance):
@@ -21,6 +41,7 @@ class _BaseUIManager:
 		self.instance = instance
 		self.manialinks = dict()
 		self.send_queue = list()
+		self.metrics_label = 'global'
 
 	async def on_start(self):
 		asyncio.ensure_future(self.send_loop())
@@ -34,6 +55,7 @@ class _BaseUIManager:
 			# Copy send queue and clear the global one
 			queue = self.send_queue.copy()
 			self.send_queue.clear()
+			UI_QUEUE_DEPTH.set(0, labels=(self.metrics_label,))
 
 			# Process and push out the queue.
 			try:
@@ -76,9 +98,14 @@ class _BaseUIManager:
 		else:
 			for_logins = list()
 
-		# Register to the manialink context.
+		# Register to the manialink context and the action routing table.
 		if manialink.id not in self.manialinks:
 			self.manialinks[manialink.id] = manialink
+		self.instance.ui_manager.register_route(manialink)
+
+		# Views displayed to one player (lists, alerts and prompts) are owned by the player.
+		if isinstance(players, list) and len(for_logins) == 1:
+			await self.instance.ui_manager.track_view(for_logins[0], manialink)
 
 		is_global = await manialink.is_global()
 		if not is_global:
@@ -134,8 +161,8 @@ class _BaseUIManager:
 		if self.instance.game.game == 'sm' and manialink.disable_alt_menu:
 			if is_global:
 				queries.extend([
-					self.instance.gbx('Maniaplanet.UI.SetAltScoresTableVisibility', player.login, 'false', encode_json=False, response_id=False)
-					for player in self.instance.player_manager.online
+					self.instance.gbx('Maniaplanet.UI.SetAltScoresTableVisibility', login, 'false', encode_json=False, response_id=False)
+					for login in self.instance.player_manager.online_logins
 				])
 			else:
 				queries.extend([
@@ -143,10 +170,17 @@ class _BaseUIManager:
 					for login in for_logins
 				])
 
+		# Collect in the open batch (player connect, map begin), to send all queries with one multicall.
+		if self.add_to_batch(queries, for_logins):
+			return
+
 		# It the manialink wants rate limitting with the relaxed updating feature (mostly used for widgets), add to send queue
 		if getattr(manialink, 'relaxed_updating', False):
 			self.send_queue.extend(queries)
+			UI_QUERIES.inc(len(queries), labels=(self.metrics_label, 'relaxed'))
+			UI_QUEUE_DEPTH.set(len(self.send_queue), labels=(self.metrics_label,))
 			return
+		UI_QUERIES.inc(len(queries), labels=(self.metrics_label, 'direct'))
 
 		# Execute calls, ignore login unknown (player just left).
 		try:
@@ -181,21 +215,44 @@ class _BaseUIManager:
 			queries.append(self.instance.gbx('SendDisplayManialinkPage', body, 0, False))
 			if self.instance.game.game == 'sm' and manialink.disable_alt_menu:
 				queries.extend([
-					self.instance.gbx('Maniaplanet.UI.SetAltScoresTableVisibility', player.login, 'true', encode_json=False, response_id=False)
-					for player in self.instance.player_manager.online
+					self.instance.gbx('Maniaplanet.UI.SetAltScoresTableVisibility', login, 'true', encode_json=False, response_id=False)
+					for login in self.instance.player_manager.online_logins
 				])
 
+		if self.add_to_batch(queries, logins):
+			return
+
 		# It the manialink wants rate limitting with the relaxed updating feature (mostly used for widgets), add to send queue
 		if getattr(manialink, 'relaxed_updating', False):
 			self.send_queue.extend(queries)
+			UI_QUERIES.inc(len(queries), labels=(self.metrics_label, 'relaxed'))
+			UI_QUEUE_DEPTH.set(len(self.send_queue), labels=(self.metrics_label,))
 			return
+		UI_QUERIES.inc(len(queries), labels=(self.metrics_label, 'direct'))
 
 		# Execute queries.
 		await self.instance.gbx.multicall(*queries)
 
+	def add_to_batch(self, queries, logins=None):
+		"""
+		Add the queries to the open UI batch of the logins.
+
+		:param queries: Queries to send.
+		:param logins: Logins the queries are for, empty for the queries to all players.
+		:return: True when the queries are added to a batch, False when they have to be sent now.
+		"""
+		batch = self.instance.ui_manager.get_batch(logins)
+		if batch is None:
+			return False
+		batch.add(queries)
+		UI_QUERIES.inc(len(queries), labels=(self.metrics_label, 'batched'))
+		return True
+
 	async def destroy(self, manialink, logins=None):
 		if manialink.id in self.manialinks:
 			del self.manialinks[manialink.id]
+		self.instance.ui_manager.unregister_route(manialink)
+		self.instance.ui_manager.forget_view(manialink)
 		return await self.hide(manialink, logins)
 
 
@@ -205,10 +262,35 @@ class GlobalUIManager(_BaseUIManager):
 		self.app_managers = dict()
 		self.properties = UIProperties(self.instance)
 
+		# Routing table of the manialink answers, the displayed manialinks (of the global and app managers) by id.
+		self.routes = weakref.WeakValueDictionary()
+
+		# Spectated players and their spectators, for the audience of the race state updates.
+		self.spectators = SpectatorMap()
+
+		# Views owned by the players, released on disconnect, after the idle timeout or when exceeding the maximum.
+		self.views = ViewRegistry(max_views=settings.UI_MAX_PLAYER_VIEWS)
+		self.reap_job = None
+
+		# Open UI batches, per login and global (collecting the queries for everyone).
+		self.player_batches = dict()
+		self.global_batches = list()
+
 	async def on_start(self):
 		await super().on_start()
 		await self.properties.on_start()
 
+		# Route the manialink answers to the manialink that owns the action, instead of all manialinks.
+		self.instance.signals.listen('maniaplanet:manialink_answer', self.handle_answer)
+
+		self.instance.signals.listen('maniaplanet:player_info_changed', self.handle_spectator_change)
+		self.instance.signals.listen('maniaplanet:player_disconnect', self.handle_disconnect)
+
+		if settings.UI_VIEW_IDLE_TIMEOUT:
+			self.reap_job = self.instance.scheduler.call_every(
+				min(settings.UI_VIEW_IDLE_TIMEOUT, 60), self.reap_idle_views, owner='ui'
+			)
+
 		# Start app ui managers.
 		await asyncio.gather(*[
 			m.on_start() for m in self.app_managers.values()
@@ -223,14 +305,192 @@ class GlobalUIManager(_BaseUIManager):
 		:return: ManiaLink instance or None
 		:rtype: pyplanet.core.ui.components.manialink._ManiaLink
 		"""
-		global_ui = super().get_manialink_by_id(identifier)
-		if global_ui is not None:
-			return global_ui
+		return self.routes.get(identifier)
+
+	def register_route(self, manialink):
+		"""
+		Register the manialink in the routing table, to receive the answers (actions) of the players.
+
+		:param manialink: ManiaLink instance.
+		:type manialink: pyplanet.core.ui.components.manialink._ManiaLink
+		"""
+		self.routes[manialink.id] = manialink
+
+	def unregister_route(self, manialink):
+		if self.routes.get(manialink.id) is manialink:
+			del self.routes[manialink.id]
+
+	def resolve_action(self, action):
+		"""
+		Get the manialinks of the action. Actions are formatted as ``[manialink id]__[action name]``, as manialink ids can
+		contain double underscores as well, every prefix before a double underscore is looked up.
+
+		:param action: Action string of the answer.
+		:return: List of manialink instances.
+		"""
+		manialinks = list()
+		manialink = self.routes.get(action)
+		if manialink is not None:
+			manialinks.append(manialink)
+
+		index = action.find('__')
+		while index != -1:
+			manialink = self.routes.get(action[:index])
+			if manialink is not None:
+				manialinks.append(manialink)
+			index = action.find('__', index + 1)
+		return manialinks
+
+	async def handle_answer(self, player, action, values, **kwargs):
+		"""
+		Dispatch the manialink answer to the manialink that owns the action.
+
+		:param player: Player instance.
+		:param action: Action string.
+		:param values: Values provided by the user client.
+		"""
+		for manialink in self.resolve_action(action):
+			self.views.touch(player.login, manialink)
+			try:
+				await manialink.handle(player, action, values)
+			except Exception as e:
+				if getattr(manialink, 'throw_exceptions', False):
+					raise
+				logger.exception(e)
+				handle_exception(exception=e, module_name=type(manialink).__module__, func_name='handle')
+
+	async def handle_spectator_change(self, player_login, is_spectator, target, **kwargs):
+		if self.spectators.update(player_login, target.login if is_spectator and target else None):
+			await spectator_target_changed.send_robust(dict(
+				player_login=player_login, target_login=self.spectators.get_target(player_login)
+			))
+
+	async def handle_disconnect(self, player, **kwargs):
+		self.spectators.remove(player.login)
+		await self.release_views(player.login, self.views.get_views(player.login), hide=False, reason='disconnect')
+
+	async def track_view(self, login, manialink):
+		"""
+		Register the view as owned by the player. Releases the least recently used views of the player when the player has
+		more views than the maximum (``UI_MAX_PLAYER_VIEWS``).
+
+		:param login: Login of the player.
+		:param manialink: ManiaLink instance.
+		"""
+		if not is_player_view(manialink):
+			return
+		evicted = self.views.track(login, manialink)
+		UI_PLAYER_VIEWS.set(len(self.views))
+		if evicted:
+			await self.release_views(login, evicted, reason='limit')
+
+	def forget_view(self, manialink):
+		self.views.forget(manialink)
+		UI_PLAYER_VIEWS.set(len(self.views))
+
+	async def release_views(self, login, views, hide=True, reason='release'):
+		"""
+		Release the views of the player. The views without other owners are destroyed: the pending futures are cancelled
+		(alerts and prompts) and the views are removed from the managers and the routing table. The views are hidden for
+		the player with a single multicall.
+
+		:param login: Login of the player.
+		:param views: List with the views (ManiaLink instances).
+		:param hide: Hide the views at the player, disable when the player left.
+		:param reason: Reason (for the metrics).
+		"""
+		queries = list()
+		for manialink in views:
+			if self.views.release(login, manialink):
+				manialink.cancel_pending()
+				manager = manialink.manager or self
+				if manager.manialinks.get(manialink.id) is manialink:
+					del manager.manialinks[manialink.id]
+				self.unregister_route(manialink)
+			manialink.forget_player(login)
+
+			if not hide:
+				continue
+			queries.append(self.instance.gbx(
+				'SendDisplayManialinkPageToLogin', login, '<manialink id="{}"></manialink>'.format(manialink.id), 0, False
+			))
+			if self.instance.game.game == 'sm' and manialink.disable_alt_menu:
+				queries.append(self.instance.gbx(
+					'Maniaplanet.UI.SetAltScoresTableVisibility', login, 'true', encode_json=False, response_id=False
+				))
+
+		UI_PLAYER_VIEWS.set(len(self.views))
+		if views:
+			UI_VIEWS_REAPED.inc(len(views), labels=(reason,))
+		if not queries:
+			return
+
+		UI_QUERIES.inc(len(queries), labels=(self.metrics_label, 'direct'))
+		try:
+			await self.instance.gbx.multicall(*queries)
+		except Fault as e:
+			if 'Login unknown' in str(e):
+				return
+			logger.exception(e)
+
+	async def reap_idle_views(self):
+		"""
+		Release the views without activity of the owner within the idle timeout (``UI_VIEW_IDLE_TIMEOUT``).
+		"""
+		per_login = dict()
+		for login, manialink in self.views.get_idle(settings.UI_VIEW_IDLE_TIMEOUT):
+			per_login.setdefault(login, list()).append(manialink)
+		await asyncio.gather(*[
+			self.release_views(login, views, reason='idle') for login, views in per_login.items()
+		])
+
+	def batch(self, logins=None, deadline=None):
+		"""
+		Create a UI batch, collecting the display and hide queries (of all ui managers) for the logins while the context is
+		open, and sending them with a single multicall. Batching is disabled when ``UI_BATCH_DEADLINE`` is 0.
+
+		.. code-block:: python
+
+			async with self.instance.ui_manager.batch(logins=[player.login]):
+				await asyncio.gather(self.widget.display(player), self.other_widget.display(player))
+
+		:param logins: Logins of the batch, None for a global batch (collecting all queries).
+		:param deadline: Seconds to flush at the latest, defaults to the ``UI_BATCH_DEADLINE`` setting.
+		:return: Batch, to use as async context manager.
+		:rtype: pyplanet.core.ui.batch.UIBatch
+		"""
+		return UIBatch(self, logins=logins, deadline=settings.UI_BATCH_DEADLINE if deadline is None else deadline)
+
+	def open_batch(self, batch):
+		if not batch.deadline:
+			batch.closed = True
+			return
+		if batch.logins is None:
+			self.global_batches.append(batch)
+			return
+		for login in batch.logins:
+			self.player_batches[login] = batch
+
+	def close_batch(self, batch):
+		if batch in self.global_batches:
+			self.global_batches.remove(batch)
+		for login in batch.logins or ():
+			if self.player_batches.get(login) is batch:
+				del self.player_batches[login]
+
+	def get_batch(self, logins=None):
+		"""
+		Get the open batch collecting the queries for the logins, the batch of the player(s) before a global batch.
 
-		for app_manager in self.app_managers.values():
-			app_manialink = app_manager.get_manialink_by_id(identifier)
-			if app_manialink is not None:
-				return app_manialink
+		:param logins: Logins of the queries, empty for queries to all players.
+		:return: Batch or None.
+		:rtype: pyplanet.core.ui.batch.UIBatch
+		"""
+		if logins:
+			batch = self.player_batches.get(logins[0])
+			if batch is not None and batch.accepts(logins):
+				return batch
+		return self.global_batches[-1] if self.global_batches else None
 
 	def create_app_manager(self, app_config):
 		"""
@@ -263,6 +523,7 @@ class AppUIManager(_BaseUIManager):
 		"""
 		super().__init__(instance)
 		self.app = app
+		self.metrics_label = app.label
 
 	async def on_destroy(self):
 		links = self.manialinks.copy()
@@ -0,0 +1,109 @@
+"""
+The audience of an update: the logins that should receive a display. Updates of the race state of one player are only
+relevant for the player and the spectators watching the player, not for the whole server.
+"""
+from pyplanet.core import Controller
+
+
+class SpectatorMap:
+	"""
+	Live mapping of the spectated players to their spectators (by login), kept up to date by the global UI manager with the
+	player info changes.
+	"""
+
+	def __init__(self):
+		self.targets = dict()
+		self.spectators = dict()
+
+	def update(self, login, target_login=None):
+		"""
+		Update the spectator target of the player.
+
+		:param login: Login of the (spectating) player.
+		:param target_login: Login of the spectated player, None when the player isn't spectating a player.
+		:return: Boolean, True when the target of the player changed.
+		"""
+		if target_login == login:
+			target_login = None
+		current = self.targets.get(login)
+		if current == target_login:
+			return False
+		if current is not None:
+			self._discard(login, current)
+
+		if target_login is None:
+			self.targets.pop(login, None)
+			return True
+		self.targets[login] = target_login
+		self.spectators.setdefault(target_login, set()).add(login)
+		return True
+
+	def remove(self, login):
+		"""
+		Remove the player, as spectator and as spectated player (on disconnect).
+
+		:param login: Login of the player.
+		"""
+		self.update(login, None)
+		for spectator in self.spectators.pop(login, set()):
+			self.targets.pop(spectator, None)
+
+	def clear(self):
+		self.targets.clear()
+		self.spectators.clear()
+
+	def get_target(self, login):
+		"""
+		Get the login of the player spectated by the player.
+
+		:param login: Login of the spectator.
+		:return: Login or None.
+		"""
+		return self.targets.get(login)
+
+	def get_spectators(self, login):
+		"""
+		Get the logins of the spectators of the player.
+
+		:param login: Login of the player.
+		:return: Set with logins.
+		"""
+		return set(self.spectators.get(login, ()))
+
+	def _discard(self, login, target_login):
+		spectators = self.spectators.get(target_login)
+		if spectators is None:
+			return
+		spectators.discard(login)
+		if not spectators:
+			del self.spectators[target_login]
+
+
+def _get_login(player):
+	return player if isinstance(player, str) else player.login
+
+
+def spectators_of(player):
+	"""
+	Get the audience of the spectators watching the player.
+
+	:param player: Player instance or login.
+	:return: List with logins.
+	"""
+	return sorted(Controller.instance.ui_manager.spectators.get_spectators(_get_login(player)))
+
+
+def player_and_spectators(player):
+	"""
+	Get the audience of the player and the spectators watching the player. Use it to display updates of the race state of
+	the player only to the logins the update is relevant for.
+
+	.. code-block:: python
+
+		await self.widget.display(audience=player_and_spectators(player))
+
+	:param player: Player instance or login.
+	:return: List with logins.
+	"""
+	login = _get_login(player)
+	return [login] + spectators_of(login)
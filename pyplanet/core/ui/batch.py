@@ -0,0 +1,101 @@
+"""
+UI batches collect the display and hide queries of the views and widgets while a callback is handled (a player connect
+or a map begin), and send them with a single multicall, instead of a round trip per app.
+"""
+import logging
+
+from xmlrpc.client import Fault
+
+from pyplanet.core import metrics
+
+logger = logging.getLogger(__name__)
+
+UI_BATCH_FLUSHES = metrics.registry.counter(
+	'pyplanet_ui_batch_flushes_total', 'Flushed UI batches, when done or at the deadline.', labelnames=('reason',)
+)
+UI_BATCH_SIZE = metrics.registry.histogram(
+	'pyplanet_ui_batch_queries', 'Queries per flushed UI batch.', buckets=(1, 2, 5, 10, 20, 50, 100, 250)
+)
+
+
+class UIBatch:
+	"""
+	Batch of UI queries, used as async context manager. The queries for the logins of the batch (or all queries for a
+	global batch) are collected until the context is left, or until the flush deadline has been reached (the queries
+	after the deadline are sent directly).
+
+	.. code-block:: python
+
+		async with instance.ui_manager.batch(logins=[player.login]):
+			await self.widget.display(player)
+			await self.other_widget.display(player)
+	"""
+
+	def __init__(self, manager, logins=None, deadline=None):
+		"""
+		:param manager: Global UI manager.
+		:param logins: Logins of the batch, None for a global batch (collecting all the queries).
+		:param deadline: Seconds to flush the batch at the latest, None or 0 to only flush when leaving the context.
+		:type manager: pyplanet.core.ui.GlobalUIManager
+		"""
+		self.manager = manager
+		self.logins = set(logins) if logins is not None else None
+		self.deadline = deadline
+		self.queries = list()
+		self.closed = False
+		self._job = None
+
+	def accepts(self, logins):
+		"""
+		Check if the batch collects the queries for the logins.
+
+		:param logins: Logins of the queries, empty for the queries to all players.
+		:return: Boolean
+		"""
+		if self.closed:
+			return False
+		if self.logins is None:
+			return True
+		return bool(logins) and self.logins.issuperset(logins)
+
+	def add(self, queries):
+		self.queries.extend(queries)
+
+	async def flush(self, reason='done'):
+		"""
+		Close the batch and send the collected queries, in the order they were added.
+
+		:param reason: Reason (for the metrics).
+		"""
+		if self.closed:
+			return
+		self.closed = True
+		if self._job:
+			self._job.cancel(running=False)
+			self._job = None
+		self.manager.close_batch(self)
+
+		queries, self.queries = self.queries, list()
+		UI_BATCH_FLUSHES.inc(labels=(reason,))
+		if not queries:
+			return
+		UI_BATCH_SIZE.observe(len(queries))
+
+		try:
+			await self.manager.instance.gbx.multicall(*queries)
+		except Fault as e:
+			# Ignore login unknown (player just left).
+			if 'Login unknown' in str(e):
+				return
+			logger.exception(e)
+
+	async def __aenter__(self):
+		self.manager.open_batch(self)
+		if self.deadline:
+			self._job = self.manager.instance.scheduler.call_later(
+				self.deadline, self.flush, 'deadline', name='flush_ui_batch', owner='ui'
+			)
+		return self
+
+	async def __aexit__(self, exc_type, exc_val, exc_tb):
+		await self.flush()
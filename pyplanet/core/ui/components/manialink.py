@@ -4,7 +4,6 @@ import logging
 
 from asyncio import iscoroutinefunction
 
-from pyplanet.core.events import SignalManager
 from pyplanet.core.ui.exceptions import ManialinkMemoryLeakException
 from pyplanet.core.ui.template import Template
 
@@ -54,8 +53,6 @@ class _ManiaLink:
 		self._is_global_shown = False
 		self._is_player_shown = dict()  # Holds per player login a boolean if the ml is shown.
 
-		self.__register_listener = False
-
 	async def is_global(self):
 		return not self.player_data or self.player_data.keys() == 0
 
@@ -113,11 +110,7 @@ class _ManiaLink:
 		else:
 			self._is_global_shown = True
 
-		if not self.__register_listener:
-			# Register handle
-			SignalManager.listen('maniaplanet:manialink_answer', self.handle)
-			self.__register_listener = True
-
+		# The manager registers the manialink in the routing table of the answers (handled in handle).
 		return await self.manager.send(self, player_logins, **kwargs)
 
 	async def hide(self, player_logins=None):
@@ -150,6 +143,13 @@ class _ManiaLink:
 		self.receivers[action].append(target)
 
 	async def handle(self, player, action, values, **kwargs):
+		"""
+		Handle an answer (action) of a player, called by the UI manager when the action belongs to this manialink.
+
+		:param player: Player instance.
+		:param action: Action string, including the manialink id.
+		:param values: Values provided by the user client.
+		"""
 		if not action.startswith(self.id):
 			return
 
@@ -181,6 +181,23 @@ class _ManiaLink:
 				else:
 					logging.exception('Exception has been silenced in ManiaLink Action receiver:', exc_info=e)
 
+	def cancel_pending(self):
+		"""
+		Cancel the pending futures of the manialink (waiting for the answer of a player). Called when the view is released
+		by the UI manager, for example when the player disconnects.
+		"""
+		pass
+
+	def forget_player(self, login):
+		"""
+		Forget the state of the player (shown and player data), without sending anything to the player.
+
+		:param login: Player login.
+		"""
+		self._is_player_shown.pop(login, None)
+		if self.player_data:
+			self.player_data.pop(login, None)
+
 	async def handle_catch_all(self, player, action, values, **kwargs):
 		"""
 		Override this class to handle all other actions related to this view/manialink.
@@ -192,17 +209,15 @@ class _ManiaLink:
 		"""
 		pass
 
-	async def destroy(self):
+	async def destroy(self, player_logins=None):
 		"""
 		Destroy the Manialink with it's handlers and references.
 		Will also hide the Manialink for all users!
+
+		:param player_logins: Only hide for the list of players (the players the manialink is displayed to).
 		"""
 		try:
-			SignalManager.get_signal('maniaplanet:manialink_answer').unregister(self.handle)
-		except Exception as e:
-			logging.exception(e)
-		try:
-			await self.manager.destroy(self)
+			await self.manager.destroy(self, player_logins)
 		except:
 			pass
 		self.receivers = dict()
@@ -218,7 +233,6 @@ class _ManiaLink:
 		be executed at the same time. Be aware with this one!
 		"""
 		try:
-			SignalManager.get_signal('maniaplanet:manialink_answer').unregister(self.handle)
 			asyncio.ensure_future(self.manager.destroy(self))
 		except Exception as e:
 			logging.exception(e)
@@ -0,0 +1,131 @@
+"""
+Ownership of the per-player views (lists, alerts and prompts). The views are created for one player and used to be only
+cleaned up when the code reached ``destroy()``. The registry keeps the views per login, so the UI manager can destroy the
+views of a player in bulk on disconnect, after an idle timeout, or when the player opened too many views.
+"""
+import time
+import uuid
+
+from collections import OrderedDict
+
+
+def is_player_view(manialink):
+	"""
+	Check if the manialink is a view instance created for players (unique uuid4 id), instead of a shared widget or view
+	with a fixed id.
+
+	:param manialink: ManiaLink instance.
+	:return: Boolean
+	"""
+	try:
+		uuid.UUID(manialink.id, version=4)
+	except (ValueError, TypeError, AttributeError):
+		return False
+	return True
+
+
+class ViewRegistry:
+	"""
+	Registry of the views owned by the players, by login. The views of a login are kept in the order of the last activity
+	(display or answer), the first view is the least recently used one.
+	"""
+
+	def __init__(self, max_views=10):
+		"""
+		:param max_views: Maximum number of views per player, 0 for no limit.
+		"""
+		self.max_views = max_views
+		self.views = dict()
+		self.owners = dict()
+		self.activity = dict()
+
+	def track(self, login, manialink, now=None):
+		"""
+		Register the view as owned by the player, or mark the activity when it's already registered.
+
+		:param login: Login of the player.
+		:param manialink: ManiaLink instance.
+		:param now: Time of the activity, defaults to the monotonic clock.
+		:return: List with the views exceeding the limit of the player (least recently used first), to release.
+		"""
+		views = self.views.setdefault(login, OrderedDict())
+		views[manialink.id] = manialink
+		views.move_to_end(manialink.id)
+		self.owners.setdefault(manialink.id, set()).add(login)
+		self.activity[(login, manialink.id)] = time.monotonic() if now is None else now
+
+		if not self.max_views or len(views) <= self.max_views:
+			return list()
+		return list(views.values())[:len(views) - self.max_views]
+
+	def touch(self, login, manialink, now=None):
+		"""
+		Mark the activity of the player on the view (answer), when the view is owned by the player.
+		"""
+		views = self.views.get(login)
+		if views and manialink.id in views:
+			views.move_to_end(manialink.id)
+			self.activity[(login, manialink.id)] = time.monotonic() if now is None else now
+
+	def release(self, login, manialink):
+		"""
+		Remove the ownership of the player.
+
+		:param login: Login of the player.
+		:param manialink: ManiaLink instance.
+		:return: True when the view has no owners left.
+		"""
+		views = self.views.get(login)
+		if views is not None:
+			views.pop(manialink.id, None)
+			if not views:
+				del self.views[login]
+		self.activity.pop((login, manialink.id), None)
+
+		owners = self.owners.get(manialink.id)
+		if owners is not None:
+			owners.discard(login)
+			if owners:
+				return False
+			del self.owners[manialink.id]
+		return True
+
+	def forget(self, manialink):
+		"""
+		Remove the view from all the players (when the view is destroyed).
+		"""
+		for login in self.owners.pop(manialink.id, set()):
+			self.activity.pop((login, manialink.id), None)
+			views = self.views.get(login)
+			if views is not None:
+				views.pop(manialink.id, None)
+				if not views:
+					del self.views[login]
+
+	def get_views(self, login):
+		"""
+		Get the views owned by the player.
+
+		:param login: Login of the player.
+		:return: List with the views, least recently used first.
+		"""
+		return list(self.views.get(login, dict()).values())
+
+	def get_idle(self, timeout, now=None):
+		"""
+		Get the views without activity of the owner within the timeout.
+
+		:param timeout: Timeout in seconds.
+		:param now: Current time, defaults to the monotonic clock.
+		:return: List with tuples (login, view).
+		"""
+		now = time.monotonic() if now is None else now
+		idle = list()
+		for login, views in self.views.items():
+			for manialink in views.values():
+				if now - self.activity.get((login, manialink.id), now) >= timeout:
+					idle.append((login, manialink))
+		return idle
+
+	def __len__(self):
+		return len(self.owners)
@@ -0,0 +1,23 @@
+"""
+This file contains the core UI signals.
+"""
+from pyplanet.core.events import Signal as _Signal, handle_generic
+from pyplanet.core.events.manager import SignalManager as _SignalManager
+
+
+spectator_target_changed = _Signal(
+	code='spectator_target_changed',
+	namespace='ui',
+	process_target=handle_generic
+)
+"""
+Is called after a spectator switched to another player, or stopped spectating a player. The spectator map of the global
+UI manager is already updated. Reporting two parameters:
+
+:param player_login: Login of the spectator.
+:param target_login: Login of the spectated player, None when the player isn't spectating a player anymore.
+"""
+
+_SignalManager.register_signal([
+	spectator_target_changed
+])
@@ -1,13 +1,39 @@
-from jinja2 import Environment, select_autoescape
+import asyncio
+import logging
+import os
+import tempfile
+
+from jinja2 import Environment, FileSystemBytecodeCache, select_autoescape
 
 from pyplanet.conf import settings
 from pyplanet.core.ui.loader import PyPlanetLoader
 
+logger = logging.getLogger(__name__)
+
 
 async def load_template(file):
 	return Template(file)
 
 
+def get_bytecode_cache():
+	"""
+	Get the bytecode cache of the compiled templates. The cache is stored on disk, so the templates don't have to be
+	compiled again after a restart. The cached bytecode is invalidated when the source of the template changes.
+
+	:return: Bytecode cache or None when disabled with the ``TEMPLATE_CACHE`` setting.
+	"""
+	if not settings.TEMPLATE_CACHE:
+		return None
+
+	directory = settings.TEMPLATE_CACHE_PATH or os.path.join(settings.TMP_PATH or tempfile.gettempdir(), 'templates')
+	try:
+		os.makedirs(directory, exist_ok=True)
+	except OSError as e:
+		logger.warning('Can\'t create the template cache directory \'{}\': {}'.format(directory, str(e)))
+		return None
+	return FileSystemBytecodeCache(directory)
+
+
 class _EnvironmentManager:
 	def __init__(self):
 		self._environment = None
@@ -20,9 +46,66 @@ class _EnvironmentManager:
 				loader=PyPlanetLoader.get_loader(),
 				autoescape=select_autoescape(['html', 'xml', 'Txt', 'txt', 'ml', 'ms', 'script.txt', 'Script.Txt']),
 				auto_reload=bool(settings.DEBUG),
+				bytecode_cache=get_bytecode_cache(),
 			)
 		return self._environment
 
+	def list_templates(self):
+		"""
+		List the names of all the templates of the core views and the apps.
+
+		:return: List of template names.
+		"""
+		return self.environment.list_templates()
+
+	def compile_template(self, name):
+		"""
+		Load and compile the template, the compiled template is kept in the environment and the bytecode cache.
+
+		:param name: Template name.
+		:return: Exception when the template can't be compiled, None otherwise.
+		"""
+		try:
+			self.environment.get_template(name)
+		except Exception as e:
+			return e
+		return None
+
+	def compile_templates(self, names=None):
+		"""
+		Compile the templates.
+
+		:param names: Template names, defaults to all the templates.
+		:return: Tuple with the number of compiled templates and a dictionary with the errors by template name.
+		"""
+		errors = dict()
+		compiled = 0
+		for name in names if names is not None else self.list_templates():
+			error = self.compile_template(name)
+			if error:
+				errors[name] = error
+			else:
+				compiled += 1
+		return compiled, errors
+
+	async def warmup(self, names=None, loop=None):
+		"""
+		Compile the templates in the executor threads, so the templates are ready before they are displayed for the first
+		time and the event loop isn't blocked by compiling.
+
+		:param names: Template names, defaults to all the templates.
+		:param loop: Event loop.
+		:return: Number of compiled templates.
+		"""
+		loop = loop or asyncio.get_event_loop()
+		names = names if names is not None else await loop.run_in_executor(None, self.list_templates)
+
+		errors = await asyncio.gather(*[loop.run_in_executor(None, self.compile_template, name) for name in names])
+		for name, error in zip(names, errors):
+			if error:
+				logger.debug('Can\'t compile template \'{}\': {}'.format(name, str(error)))
+		return len([error for error in errors if not error])
+
 EnvironmentManager = _EnvironmentManager()
 
 
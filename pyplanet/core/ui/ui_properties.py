@@ -1,6 +1,7 @@
 """
 The UI Properties will be set and hold in the class definition bellow.
 """
+import asyncio
 import json
 import logging
 import xmltodict as xd
@@ -29,6 +30,10 @@ class UIProperties:  # pragma: no cover
 	.. code-block:: python
 
 		self.instance.ui_manager.properties
+
+	The properties are parsed once, the changed elements are tracked and only those are sent with ``send_properties()``.
+	The changes of all apps calling ``send_properties()`` at the same time are sent with one call. When the script
+	(re)starts, the server resets the properties and all changes of the apps are sent again.
 	"""
 	specials = ('_properties', '_instance')
 
@@ -41,6 +46,9 @@ class UIProperties:  # pragma: no cover
 		self._raw = None
 		self._properties = dict()
 		self._update_properties = dict()
+		self._dirty = set()
+		self._customized = dict()
+		self._send_future = None
 
 	@property
 	def properties(self):
@@ -56,6 +64,7 @@ class UIProperties:  # pragma: no cover
 		await self.reset()
 		await self.refresh_properties()
 		self._instance.signals.listen(pyplanet_start_after, self.send_properties)
+		self._instance.signals.listen('maniaplanet:server_start', self.reapply_properties)
 
 	async def reset(self):
 		"""
@@ -85,11 +94,13 @@ class UIProperties:  # pragma: no cover
 			if self._instance.game.game == 'tm' or self._instance.game.game == 'sm':
 				self._raw = await self._instance.gbx(method, timeout=2)
 				self._properties = xd.parse(self._raw['raw_1'])
+				self._dirty.clear()
 			else:
 				self._raw = await self._instance.gbx(method, timeout=2)
 				self._properties = dict()
 				for entry in self._raw['uimodules']:
 					self._properties[entry['id']] = entry
+				self._dirty.clear()
 		except Exception as e:
 			self._properties = dict()
 			self._raw = None
@@ -134,24 +145,50 @@ class UIProperties:  # pragma: no cover
 		:param value: New value of the attribute.
 		:return: Boolean if it's set correctly.
 		"""
-		if not self._properties:
+		if not self._has_attribute(element, attribute):
+			return False
+
+		# Remember the change, to apply it again when the server resets the properties.
+		self._customized.setdefault(element, dict())[attribute] = value
+		if self._get_value(element, attribute) == value:
+			return True
+		self._apply(element, attribute, value)
+		return True
+
+	def _has_attribute(self, element, attribute):
+		if not self._properties or element not in self.properties:
 			return False
 		if self._instance.game.game in ['tm', 'sm']:
-			if element not in self.properties:
-				return False
-			if '@{}'.format(attribute) not in self.properties[element]:
-				return False
+			return '@{}'.format(attribute) in self.properties[element]
+		return True
+
+	def _get_value(self, element, attribute):
+		if self._instance.game.game in ['tm', 'sm']:
+			return self.properties[element]['@{}'.format(attribute)]
+		return self.properties[element].get(attribute, empty)
+
+	def _apply(self, element, attribute, value):
+		if self._instance.game.game in ['tm', 'sm']:
 			self.properties[element]['@{}'.format(attribute)] = value
 		else:
-			if element not in self.properties:
-				return False
-
 			self.properties[element][attribute] = value
 			if element not in self._update_properties:
 				self._update_properties[element] = dict(id=element)
 			self._update_properties[element][attribute] = value
 			self._update_properties[element]['{}_update'.format(attribute)] = True
-		return True
+		self._dirty.add(element)
+
+	async def reapply_properties(self, *args, **kwargs):
+		"""
+		Fetch the properties again and send all the changes of the apps. Called when the script (re)starts, as the server
+		resets the properties to the defaults of the script.
+		"""
+		await self.refresh_properties()
+		for element, attributes in self._customized.items():
+			for attribute, value in attributes.items():
+				if self._has_attribute(element, attribute):
+					self._apply(element, attribute, value)
+		await self.send_properties()
 
 	def get_attribute(self, element: str, attribute: str, default=empty):
 		"""
@@ -174,7 +211,7 @@ class UIProperties:  # pragma: no cover
 			if default is not empty:
 				return default
 			raise UIPropertyDoesNotExist('UI Properties has no attribute with name \'{}\''.format(attribute))
-		elif attribute not in self.properties[element]:
+		elif self._instance.game.game not in ['tm', 'sm'] and attribute not in self.properties[element]:
 			if default is not empty:
 				return default
 			raise UIPropertyDoesNotExist('UI Properties has no attribute with name \'{}\''.format(attribute))
@@ -184,8 +221,24 @@ class UIProperties:  # pragma: no cover
 		return self.properties[element][attribute]
 
 	async def send_properties(self, **kwargs):
+		"""
+		Send the changed elements to the server. The changes of all callers within the same loop iteration are sent with
+		one call.
+		"""
+		if self._send_future is None:
+			self._send_future = asyncio.ensure_future(self._send())
+		await asyncio.shield(self._send_future)
+
+	async def _send(self):
+		# Give the other callers of this loop iteration the chance to add their changes.
+		await asyncio.sleep(0)
+		self._send_future = None
+
 		if not self._properties or (self._instance.game.game in ['tm', 'sm'] and 'ui_properties' not in self._properties):
 			return
+		if not self._dirty:
+			return
+		dirty, self._dirty = self._dirty, set()
 
 		# Decide the method to use.
 		if self._instance.game.game == 'tm':
@@ -196,9 +249,11 @@ class UIProperties:  # pragma: no cover
 			method = 'Common.UIModules.SetProperties'
 
 		if self._instance.game.game in ['tm', 'sm']:
-			# Create XML document
+			# Create XML document with the changed elements only, the other elements are left untouched by the server.
 			try:
-				xml = xd.unparse(self._properties, full_document=False, short_empty_elements=True)
+				xml = xd.unparse(dict(ui_properties={
+					element: value for element, value in self.properties.items() if element in dirty
+				}), full_document=False, short_empty_elements=True)
 			except Exception as e:
 				logger.warning('Can\'t convert UI Properties to XML document! Error: {}'.format(str(e)))
 				return
@@ -207,16 +262,20 @@ class UIProperties:  # pragma: no cover
 				await self._instance.gbx(method, xml, encode_json=False, response_id=False)
 			except Exception as e:
 				logger.warning('Can\'t send UI Properties! Error: {}'.format(str(e)))
+				self._dirty.update(dirty)
 				return
 		else:
 			# Update TM2020 properties.
 			try:
 				await self._instance.gbx(
 					method,
-					json.dumps(dict(uimodules=list(self._update_properties.values()))),
+					json.dumps(dict(uimodules=[
+						module for element, module in self._update_properties.items() if element in dirty
+					])),
 					encode_json=False, response_id=False
 				)
 				logger.debug('UI Properties send and reloaded')
 			except Exception as e:
 				logger.warning('Can\'t send UI Properties! Error: {}'.format(str(e)))
+				self._dirty.update(dirty)
 				return
@@ -13,19 +13,12 @@ def _run(name, queue, options):
 	:param options: Custom Options
 	:type name: str
 	"""
+	from pyplanet.conf import settings
 	from pyplanet.core.instance import Controller
+	from pyplanet.core.loop import install_loop_policy
 	from pyplanet.utils.log import initiate_logger, QueueHandler
 	import logging
 
-	# Tokio Asyncio (EXPERIMENTAL).
-	if 'tokio' in options and options['tokio'] is True:
-		import asyncio
-		import tokio
-		policy = tokio.TokioLoopPolicy()
-		asyncio.set_event_loop_policy(policy)
-		asyncio.set_event_loop(tokio.new_event_loop())
-		logging.warning('Using experimental Tokio Asyncio Loop!')
-
 	# Logging to queue.
 	if multiprocessing.get_start_method() != 'fork':  # pragma: no cover
 		initiate_logger()
@@ -39,6 +32,10 @@ def _run(name, queue, options):
 
 	logging.getLogger(__name__).info('Starting pool process for \'{}\'...'.format(name))
 
+	# Install the event loop policy before the instance (and the loop) is created.
+	loop_policy = install_loop_policy(options.get('loop') or settings.EVENT_LOOP_POLICY)
+	logging.getLogger(__name__).debug('Using the {} event loop.'.format(loop_policy))
+
 	# Setting thread name to our process name.
 	threading.main_thread().setName(name)
 
@@ -0,0 +1,215 @@
+"""
+In-memory indexes of the checkpoint (sector) times of the current map, to answer the questions asked on every waypoint
+callback (what is the record and split of the player, what is the best split at this checkpoint) in constant time.
+"""
+import bisect
+
+
+def parse_checkpoints(checkpoints):
+	"""
+	Parse the checkpoint times of a record.
+
+	:param checkpoints: Comma separated string (local records) or list with the times (dedimania).
+	:return: Tuple with the times as integers.
+	"""
+	if not checkpoints:
+		return tuple()
+	if isinstance(checkpoints, str):
+		return tuple(int(cp) for cp in checkpoints.split(',') if cp.strip())
+	return tuple(int(cp) for cp in checkpoints)
+
+
+class IndexedRecord:
+	"""
+	Record of a player in the checkpoint index.
+	"""
+	__slots__ = ('login', 'score', 'checkpoints', 'record')
+
+	def __init__(self, login, score, checkpoints, record=None):
+		self.login = login
+		self.score = score
+		self.checkpoints = checkpoints
+		self.record = record
+
+	def get_split(self, index):
+		"""
+		Get the time at the checkpoint.
+
+		:param index: Checkpoint index (0 is the first checkpoint).
+		:return: Time or None when the record has no time for the checkpoint.
+		"""
+		if 0 <= index < len(self.checkpoints):
+			return self.checkpoints[index]
+		return None
+
+
+class CheckpointIndex:
+	"""
+	Index of the records (and the checkpoint times) of one map, by login. Keeps the best time of the server per checkpoint
+	index, so the comparison with the record and the best split are lookups instead of scans over the record list.
+
+	The index is loaded once at the map begin, and updated with every new or improved record.
+	"""
+
+	def __init__(self):
+		self.map_uid = None
+		self.records = dict()
+		self.best_splits = list()
+		self.best_logins = list()
+
+	def load(self, map_uid, records):
+		"""
+		(Re)load the index for the map.
+
+		:param map_uid: Uid of the map.
+		:param records: Iterable with tuples (login, score, checkpoints, record instance).
+		"""
+		self.clear()
+		self.map_uid = map_uid
+		for login, score, checkpoints, record in records:
+			self.update(login, score, checkpoints, record=record, only_improved=True)
+
+	def clear(self):
+		self.map_uid = None
+		self.records.clear()
+		self.best_splits.clear()
+		self.best_logins.clear()
+
+	def update(self, login, score, checkpoints, record=None, only_improved=False):
+		"""
+		Set the record of the player.
+
+		:param login: Login of the player.
+		:param score: Score (time) of the record.
+		:param checkpoints: Checkpoint times, comma separated string or list.
+		:param record: Record instance of the app (optional).
+		:param only_improved: Ignore the record when the player already has a better one.
+		:return: Indexed record of the player.
+		"""
+		current = self.records.get(login)
+		if only_improved and current is not None and current.score <= score:
+			return current
+
+		entry = IndexedRecord(login, score, parse_checkpoints(checkpoints), record)
+		self.records[login] = entry
+
+		if current is not None and login in self.best_logins:
+			# The new splits of the player can be slower than the replaced best splits, rebuild (only for the best players).
+			self.rebuild_best_splits()
+			return entry
+
+		self._add_best_splits(entry)
+		return entry
+
+	def remove(self, login):
+		if self.records.pop(login, None) is not None and login in self.best_logins:
+			self.rebuild_best_splits()
+
+	def rebuild_best_splits(self):
+		self.best_splits.clear()
+		self.best_logins.clear()
+		for entry in self.records.values():
+			self._add_best_splits(entry)
+
+	def _add_best_splits(self, entry):
+		for index, split in enumerate(entry.checkpoints):
+			if index >= len(self.best_splits):
+				self.best_splits.append(split)
+				self.best_logins.append(entry.login)
+			elif split < self.best_splits[index]:
+				self.best_splits[index] = split
+				self.best_logins[index] = entry.login
+
+	def get(self, login):
+		"""
+		Get the record of the player.
+
+		:param login: Login of the player.
+		:return: Indexed record or None.
+		"""
+		return self.records.get(login)
+
+	def get_split(self, login, index):
+		"""
+		Get the checkpoint time of the record of the player.
+
+		:param login: Login of the player.
+		:param index: Checkpoint index (0 is the first checkpoint).
+		:return: Time or None.
+		"""
+		entry = self.records.get(login)
+		return entry.get_split(index) if entry else None
+
+	def get_best_split(self, index):
+		"""
+		Get the best time of the server at the checkpoint.
+
+		:param index: Checkpoint index (0 is the first checkpoint).
+		:return: Tuple with the time and the login, or (None, None).
+		"""
+		if 0 <= index < len(self.best_splits):
+			return self.best_splits[index], self.best_logins[index]
+		return None, None
+
+	def __len__(self):
+		return len(self.records)
+
+	def __contains__(self, login):
+		return login in self.records
+
+
+class CheckpointTable:
+	"""
+	Live table of checkpoint entries, ordered by a sort key. The entries are kept by key (login or checkpoint number) and the
+	order is maintained with binary search, so an update doesn't sort the whole table.
+	"""
+
+	def __init__(self, sort_key):
+		"""
+		:param sort_key: Function returning the sort key of an entry. The key is taken when the entry is set, set the entry
+						 again after changing it.
+		"""
+		self.sort_key = sort_key
+		self._entries = dict()
+		self._order = list()
+
+	def __setitem__(self, key, entry):
+		self.pop(key, None)
+		position = (self.sort_key(entry), key)
+		bisect.insort(self._order, position)
+		self._entries[key] = (position, entry)
+
+	def __getitem__(self, key):
+		return self._entries[key][1]
+
+	def __contains__(self, key):
+		return key in self._entries
+
+	def __len__(self):
+		return len(self._entries)
+
+	def __iter__(self):
+		for _, key in self._order:
+			yield self._entries[key][1]
+
+	def get(self, key, default=None):
+		if key in self._entries:
+			return self._entries[key][1]
+		return default
+
+	def pop(self, key, *default):
+		if key not in self._entries:
+			if default:
+				return default[0]
+			raise KeyError(key)
+		position, entry = self._entries.pop(key)
+		index = bisect.bisect_left(self._order, position)
+		del self._order[index]
+		return entry
+
+	def keys(self):
+		return [key for _, key in self._order]
+
+	def clear(self):
+		self._entries.clear()
+		self._order.clear()
@@ -1,11 +1,14 @@
+import atexit
 import logging
 import logging.config
 import os
+import queue
 import sys
-import traceback
+import threading
+import time
 
 from raven import Client
-from logging.handlers import QueueHandler as BaseQueueHandler
+from logging.handlers import QueueHandler as BaseQueueHandler, QueueListener
 
 from pyplanet import __version__ as version
 from pyplanet.conf import settings
@@ -20,6 +23,93 @@ IGNORED_TEXT = [
 	'Lost connection to',
 	'MemoryError',
 ]
+_IGNORED_TEXT_LOWER = tuple(text.lower() for text in IGNORED_TEXT)
+
+
+class RateLimiter:
+	"""
+	Rate limiter per signature (the origin of a log message or exception). Allows a burst of events per signature within
+	the interval and counts the suppressed events, to summarize them when the interval has passed.
+	"""
+
+	def __init__(self, burst=10, interval=60):
+		"""
+		:param burst: Events allowed per signature within the interval.
+		:param interval: Interval in seconds.
+		"""
+		self.burst = burst
+		self.interval = interval
+		self.windows = dict()
+		self.expired = dict()
+		self._next_sweep = 0
+		self._lock = threading.Lock()
+
+	def hit(self, signature, now=None):
+		"""
+		Register an event of the signature.
+
+		:param signature: Hashable signature.
+		:param now: Current time, defaults to the monotonic clock.
+		:return: True when the event is allowed, False when it's suppressed.
+		"""
+		now = time.monotonic() if now is None else now
+		with self._lock:
+			window = self.windows.get(signature)
+			if window is None or now - window[0] >= self.interval:
+				if window is not None and window[2]:
+					self.expired[signature] = self.expired.get(signature, 0) + window[2]
+				self.windows[signature] = [now, 1, 0]
+				return True
+			if window[1] < self.burst:
+				window[1] += 1
+				return True
+			window[2] += 1
+			return False
+
+	def collect(self, now=None):
+		"""
+		Collect the number of suppressed events of the passed intervals. Sweeps the windows at most once per interval.
+
+		:param now: Current time, defaults to the monotonic clock.
+		:return: List with tuples (signature, suppressed events).
+		"""
+		now = time.monotonic() if now is None else now
+		with self._lock:
+			if now >= self._next_sweep:
+				self._next_sweep = now + self.interval
+				for signature, window in list(self.windows.items()):
+					if now - window[0] >= self.interval:
+						del self.windows[signature]
+						if window[2]:
+							self.expired[signature] = self.expired.get(signature, 0) + window[2]
+			if not self.expired:
+				return list()
+			summaries, self.expired = list(self.expired.items()), dict()
+		return summaries
+
+
+_log_limiter = None
+_exception_limiter = None
+
+
+def get_log_limiter():
+	"""
+	Get the rate limiter of the log messages, None when disabled (``LOGGING_RATE_LIMIT`` is 0).
+	"""
+	global _log_limiter
+	if _log_limiter is None and settings.LOGGING_RATE_LIMIT:
+		_log_limiter = RateLimiter(settings.LOGGING_RATE_LIMIT, settings.LOGGING_RATE_LIMIT_INTERVAL)
+	return _log_limiter
+
+
+def get_exception_limiter():
+	"""
+	Get the rate limiter of the reported exceptions, None when disabled (``LOGGING_RATE_LIMIT`` is 0).
+	"""
+	global _exception_limiter
+	if _exception_limiter is None and settings.LOGGING_RATE_LIMIT:
+		_exception_limiter = RateLimiter(settings.LOGGING_RATE_LIMIT, settings.LOGGING_RATE_LIMIT_INTERVAL)
+	return _exception_limiter
 
 
 class Raven:  # pragma: no cover
@@ -72,9 +162,29 @@ def initiate_logger():  # pragma: no cover
 		handler.setFormatter(
 			logging.Formatter('[%(asctime)s][%(levelname)s][%(threadName)s] %(name)s: %(message)s (%(filename)s:%(lineno)d)')
 		)
+		handler.addFilter(RateLimitFilter())
 
-		# Add to the root handler.
-		logging.root.addHandler(handler)
+		# Add to the root handler. The file is written by a separate thread, the event loop doesn't wait for the disk.
+		logging.root.addHandler(BackgroundHandler(handler))
+
+
+def _is_ignored_path(exception):
+	"""
+	Check if the current stack or the traceback of the exception passes an ignored path. Walks the frames instead of
+	extracting the stack, that reads the source lines of every frame.
+	"""
+	frame = sys._getframe(1)
+	while frame is not None:
+		if any(ig in frame.f_code.co_filename for ig in IGNORED_PATHS):
+			return True
+		frame = frame.f_back
+
+	tb = getattr(exception, '__traceback__', None)
+	while tb is not None:
+		if any(ig in tb.tb_frame.f_code.co_filename for ig in IGNORED_PATHS):
+			return True
+		tb = tb.tb_next
+	return False
 
 
 def handle_exception(exception=None, module_name=None, func_name=None, extra_data=None, force=False):  # pragma: no cover
@@ -82,6 +192,19 @@ def handle_exception(exception=None, module_name=None, func_name=None, extra_dat
 	if exception and isinstance(exception, (ImproperlyConfigured,)):
 		return
 
+	# Rate limit the same exception from the same origin (error storms).
+	limiter = get_exception_limiter()
+	if limiter and not force:
+		allowed = limiter.hit((type(exception), module_name, func_name))
+		for (exc_type, exc_module, exc_func), count in limiter.collect():
+			logging.getLogger(exc_module or __name__).warning(
+				'Exception {} in {} repeated {} more times in the last {} seconds.'.format(
+					getattr(exc_type, '__name__', exc_type), exc_func, count, limiter.interval
+				), extra=dict(rate_limit_summary=True)
+			)
+		if not allowed:
+			return
+
 	from pyplanet.core import Controller
 	if settings.DEBUG or settings.LOGGING_REPORTING == 0:
 		if exception:
@@ -89,25 +212,19 @@ def handle_exception(exception=None, module_name=None, func_name=None, extra_dat
 		return
 
 	# Filter out exceptions.
-	ignore = False
 	try:
-		stack = traceback.extract_stack()
-		for frame in stack:
-			if any(ig in frame.filename for ig in IGNORED_PATHS):
-				ignore = True
-				break
+		if _is_ignored_path(exception):
+			return
 	except:
 		pass
 	try:
 		if not force:
-			if any(ig.lower() in str(exception).lower() for ig in IGNORED_TEXT):
-				ignore = True
+			text = str(exception).lower()
+			if any(ig in text for ig in _IGNORED_TEXT_LOWER):
+				return
 	except:
 		pass
 
-	if ignore:
-		return
-
 	# Extra Data.
 	if not extra_data:
 		extra_data = dict()
@@ -151,6 +268,75 @@ class RequireException(logging.Filter):
 		return bool(record.exc_info)
 
 
+class RateLimitFilter(logging.Filter):
+	"""
+	Rate limit the log records per signature (logger, level, origin and message). The suppressed records are summarized
+	with a 'repeated N times' message when the interval (``LOGGING_RATE_LIMIT_INTERVAL``) has passed. The decision is stored
+	on the record, so a record passing multiple handlers is only counted once.
+	"""
+
+	def __init__(self, name='', limiter=None):
+		super().__init__(name)
+		self._limiter = limiter
+
+	@property
+	def limiter(self):
+		return self._limiter or get_log_limiter()
+
+	def filter(self, record):
+		passed = getattr(record, 'rate_limit_passed', None)
+		if passed is not None:
+			return passed
+		limiter = self.limiter
+		if limiter is None or getattr(record, 'rate_limit_summary', False):
+			return True
+
+		message = record.msg if isinstance(record.msg, str) else type(record.msg).__name__
+		signature = (
+			record.name, record.levelno, record.pathname, record.lineno, message,
+			record.exc_info[0] if record.exc_info else None,
+		)
+		record.rate_limit_passed = passed = limiter.hit(signature)
+
+		for (name, level, _, _, message, _), count in limiter.collect():
+			logging.getLogger(name).log(
+				level, 'Message \'{}\' repeated {} more times in the last {} seconds.'.format(
+					message, count, limiter.interval
+				), extra=dict(rate_limit_summary=True)
+			)
+		return passed
+
+
+class BackgroundHandler(BaseQueueHandler):  # pragma: no cover
+	"""
+	Handler passing the records to a queue, the wrapped (file) handlers are called from a separate thread. Writing and
+	formatting the records (including the tracebacks) doesn't block the event loop.
+	"""
+
+	def __init__(self, *handlers):
+		super().__init__(queue.Queue(-1))
+		self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+		self.listener.start()
+		atexit.register(self.stop)
+
+	def prepare(self, record):
+		# Merge the arguments, the traceback is formatted by the listener thread.
+		record.msg = record.getMessage()
+		record.args = None
+		return record
+
+	def stop(self):
+		"""
+		Stop the thread, after writing the records in the queue.
+		"""
+		if self.listener._thread is not None:
+			self.listener.stop()
+
+	def close(self):
+		self.stop()
+		super().close()
+
+
 class QueueHandler(BaseQueueHandler):  # pragma: no cover
 	def prepare(self, record):
 		# Override due to bug
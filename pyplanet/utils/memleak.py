@@ -1,11 +1,72 @@
 import asyncio
 import gc
 import logging
+import os
 
+from pyplanet.core import metrics
 from pyplanet.utils import log
 
 logger = logging.getLogger(__name__)
 
+PROCESS_MEMORY = metrics.registry.gauge(
+	'pyplanet_process_resident_memory_bytes', 'Resident memory size of the pool process in bytes.'
+)
+GC_OBJECTS = metrics.registry.gauge('pyplanet_gc_objects', 'Number of objects tracked by the garbage collector.')
+GC_GARBAGE = metrics.registry.gauge('pyplanet_gc_garbage', 'Number of uncollectable objects (possible memory leaks).')
+PLAYER_CACHE = metrics.registry.gauge(
+	'pyplanet_player_cache', 'Statistics of the player cache (size, pinned, hits, misses and evictions).', labelnames=('stat',)
+)
+MAP_CACHE = metrics.registry.gauge('pyplanet_map_cache_size', 'Number of maps in the map cache.')
+
+
+def get_resident_memory():
+	"""
+	Get the resident memory size (RSS) of the current process.
+
+	:return: Size in bytes, or None when unknown on the platform.
+	"""
+	try:
+		with open('/proc/self/statm', 'r') as fh:
+			return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+	except (IOError, OSError, ValueError, IndexError, AttributeError):
+		pass
+	try:
+		import resource
+		# Not the current but the maximum resident size, in kilobytes on Linux and in bytes on macOS.
+		return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+	except ImportError:
+		return None
+
+
+def memory_report():
+	"""
+	Create a report of the memory usage of the process.
+
+	:return: Dictionary with the resident memory size, the number of objects tracked by the garbage collector, the number
+			 of uncollectable objects and the statistics of the player and map caches.
+	"""
+	from pyplanet.apps.core.maniaplanet.models import Map, Player
+
+	return dict(
+		resident_memory=get_resident_memory(),
+		gc_objects=len(gc.get_objects()),
+		gc_garbage=len(gc.garbage),
+		player_cache=Player.CACHE.stats,
+		map_cache=len(Map.CACHE),
+	)
+
+
+def update_metrics():
+	report = memory_report()
+	if report['resident_memory'] is not None:
+		PROCESS_MEMORY.set(report['resident_memory'])
+	GC_OBJECTS.set(report['gc_objects'])
+	GC_GARBAGE.set(report['gc_garbage'])
+	for stat, value in report['player_cache'].items():
+		if value is not None:
+			PLAYER_CACHE.set(value, labels=(stat,))
+	MAP_CACHE.set(report['map_cache'])
+
 
 class _LeakChecker:
 	def __init__(self):
@@ -17,6 +78,8 @@ class _LeakChecker:
 	def check_memory_leak(self):
 		asyncio.get_event_loop().call_later(30, self.check_memory_leak)
 		logger.debug('Checking for memory leaks...')
+		if metrics.registry.enabled:
+			update_metrics()
 		if 0 < len(gc.garbage) < 20:
 			logger.warning('Found possible memory leaks: {}'.format(gc.garbage))
 		elif len(gc.garbage) >= 20:
@@ -105,6 +105,10 @@ class AlertView(TemplateView):
 		"""
 		return await self.response_future
 
+	def cancel_pending(self):
+		if not self.response_future.done():
+			self.response_future.cancel()
+
 	async def handle(self, player, action, values, **kwargs):  # pragma: no cover
 		await self.close(player)
 
@@ -283,7 +287,7 @@ async def ask_confirmation(player, message, size='md', buttons=None):  # pragma:
 		# To ensure no action is taken without confirmation, 1 (= No) should be returned if the casting causes an exception.
 		# If custom buttons are used, None will be returned.
 		reaction = 1 if default_buttons_displayed else None
-	del view
+	await view.destroy(player_logins=[player])
 	return reaction
 
 
@@ -305,7 +309,7 @@ async def ask_input(player, message, size='md', buttons=None, default=None, vali
 		player = player.login
 	await view.display(player_logins=[player])
 	output = await view.wait_for_input()
-	del view
+	await view.destroy(player_logins=[player])
 	return output
 
 
@@ -329,5 +333,5 @@ async def show_alert(player, message, size='md', buttons=None):  # pragma: no co
 		reaction = int(reaction)
 	except:
 		reaction = None
-	del view
+	await view.destroy(player_logins=[player])
 	return reaction
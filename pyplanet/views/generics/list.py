@@ -70,7 +70,7 @@ class ListView(TemplateView):
 	"""Change this to False to have multiple lists open at the same time."""
 
 	def __init__(self, *args, **kwargs):
-		self.id = 'pyplanet.views.generics.list.ListView'
+		# Every list instance has an unique id, the answers of the players are routed to the list shown to them.
 		super().__init__(*args, **kwargs)
 		self.disable_alt_menu = True
 		self.search_text = None
@@ -214,6 +214,9 @@ class ListView(TemplateView):
 			del self.player_data[player.login]
 		await self.hide(player_logins=[player.login])
 
+		# The player doesn't own the list anymore, it's removed from the managers when no other player has it open.
+		await self.manager.instance.ui_manager.release_views(player.login, [self], hide=False, reason='close')
+
 		if self.single_list:
 			# Clear the lock on the player list display.
 			player.attributes.set('pyplanet.views.list_displayed', None)
@@ -248,7 +251,7 @@ class ListView(TemplateView):
 				other_manialink = self.manager.instance.ui_manager.get_manialink_by_id(other_list)
 
 				# Close other list and clear lock.
-				if isinstance(other_manialink, ListView):
+				if isinstance(other_manialink, ListView) and other_manialink is not self:
 					await other_manialink.close(player)
 
 			# Set lock on player.
@@ -418,6 +421,10 @@ class ListView(TemplateView):
 class ManualListView(ListView):
 	"""
 	The ManualListView will act as a ListView, but not based on a model or query.
+
+	Fields can contain a ``search_index`` with the key of a precomputed lowercase (and optionally style stripped) column
+	that will be used for searching, and a ``sort_index`` with the key of the column to sort on instead of the displayed
+	``index``.
 	"""
 
 	def __init__(self, data=None, *args, **kwargs):
@@ -450,15 +457,20 @@ class ManualListView(ListView):
 		if not self.search_text:
 			return frame
 		query = list()
+		search_text = self.search_text.lower()
 		for field in await self.get_fields():
 			if 'searching' in field and field['searching']:
-				if 'search_strip_styles' in field and field['search_strip_styles']:
+				if 'search_index' in field:
+					query.append(
+						[search_text in x if x else False for x in (x[field['search_index']] for x in frame)]
+					)
+				elif 'search_strip_styles' in field and field['search_strip_styles']:
 					query.append(
-						[self.search_text.lower() in style.style_strip(str(x).lower()) if x else False for x in (x[field['index']] for x in frame)]
+						[search_text in style.style_strip(str(x).lower()) if x else False for x in (x[field['index']] for x in frame)]
 					)
 				else:
 					query.append(
-						[self.search_text.lower() in str(x).lower() if x else False for x in (x[field['index']] for x in frame)]
+						[search_text in str(x).lower() if x else False for x in (x[field['index']] for x in frame)]
 					)
 		if query:
 			query = [any(e) for e in zip(*query)]
@@ -467,7 +479,8 @@ class ManualListView(ListView):
 
 	async def apply_ordering(self, frame):
 		if self.sort_field:
-			frame = sorted(frame, key=lambda e: (e[self.sort_field['index']] is None, e[self.sort_field['index']]), reverse=not bool(self.sort_order))
+			index = self.sort_field.get('sort_index', self.sort_field['index'])
+			frame = sorted(frame, key=lambda e: (e[index] is None, e[index]), reverse=not bool(self.sort_order))
 		return frame
 
 	async def apply_pagination(self, frame):
@@ -111,13 +111,20 @@ class TemplateView(View):
 		kwargs['template'] = await self.get_template()
 		return await super().render(*args, **kwargs)
 
-	async def display(self, player_logins=None, **kwargs):
+	async def display(self, player_logins=None, audience=None, **kwargs):
 		"""
 		Display the manialink. Will also render if no body is given. Will show per player or global. depending on
 		the data given and stored!
 
 		:param player_logins: Only display to the list of player logins given.
+		:param audience: Only display to the audience, list of logins (for example
+						 :func:`pyplanet.core.ui.audience.player_and_spectators`). Nothing is displayed when it's empty.
 		"""
+		if audience is not None:
+			player_logins = list(audience)
+			if not player_logins:
+				return
+
 		# Get player data (old way). Deprecated since 0.4.0.
 		# Added warning since 0.8.0.
 		self.player_data = deprecated_data = await self.get_player_data()
@@ -129,7 +136,7 @@ class TemplateView(View):
 			# self.player_data = deprecated_data
 
 		self.player_data.update(await self.get_all_player_data(
-			player_logins or [p.login for p in Controller.instance.player_manager.online]
+			player_logins or list(Controller.instance.player_manager.online_logins)
 		))
 
 		# Get player data (new way).
@@ -46,7 +46,9 @@ setup(
 	},
 	install_requires=read_requirements('requirements.txt'),
 	tests_require=read_requirements('requirements-dev.txt'),
-	extras_require={},
+	extras_require={
+		'uvloop': ['uvloop'],
+	},
 	test_suite='tests',
 	include_package_data=True,
 
@@ -0,0 +1,47 @@
+import asyncio
+import asynctest
+
+from pyplanet.contrib.mode.manager import ModeScriptValues
+
+
+class FakeInstance:
+	def __init__(self):
+		self.settings = dict(S_TimeLimit=300, S_WarmUpNb=0)
+		self.calls = list()
+
+	async def gbx(self, method, *args):
+		self.calls.append((method,) + args)
+		await asyncio.sleep(0)
+		if method == 'GetModeScriptSettings':
+			return dict(self.settings)
+		self.settings.update(args[0])
+		return True
+
+
+class TestModeScriptValues(asynctest.TestCase):
+	async def test_shadow_copy(self):
+		instance = FakeInstance()
+		settings = ModeScriptValues(instance, 'GetModeScriptSettings', 'SetModeScriptSettings')
+
+		# Concurrent reads retrieve the settings once, later reads are served from the copy.
+		first, second = await asyncio.gather(settings.get(), settings.get())
+		assert first == second == dict(S_TimeLimit=300, S_WarmUpNb=0)
+		first['S_TimeLimit'] = 1
+		assert (await settings.get())['S_TimeLimit'] == 300
+		assert instance.calls == [('GetModeScriptSettings',)]
+
+		# Updates at the same time are merged, only the changed keys are sent.
+		await asyncio.gather(
+			settings.update(dict(S_TimeLimit=600, S_WarmUpNb=0)),
+			settings.update(dict(S_WarmUpNb=1)),
+		)
+		assert instance.calls[1:] == [('SetModeScriptSettings', dict(S_TimeLimit=600, S_WarmUpNb=1))]
+		assert await settings.get() == dict(S_TimeLimit=600, S_WarmUpNb=1)
+
+		# No changes, no call.
+		await settings.update(dict(S_TimeLimit=600))
+		assert len(instance.calls) == 2
+
+		settings.invalidate()
+		await settings.get()
+		assert instance.calls[-1] == ('GetModeScriptSettings',)
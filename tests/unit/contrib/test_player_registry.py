@@ -0,0 +1,58 @@
+import asynctest
+
+from pyplanet.apps.core.maniaplanet.models import Player
+from pyplanet.contrib.player.registry import OnlineRegistry
+
+
+class TestOnlineRegistry(asynctest.TestCase):
+	def create_player(self, login, player_id, team_id=0, is_spectator=False):
+		player = Player(login=login)
+		player.flow.player_id = player_id
+		player.flow.team_id = team_id
+		player.flow.is_spectator = is_spectator
+		return player
+
+	def test_indexes(self):
+		registry = OnlineRegistry()
+		a = self.create_player('a', 1)
+		b = self.create_player('b', 2, team_id=1, is_spectator=True)
+		registry.add(a)
+		registry.add(b)
+
+		assert len(registry) == 2 and 'a' in registry
+		assert registry.get_by_id(2) is b
+		assert registry.spectator_logins == {'b'}
+		assert registry.player_logins == {'a'}
+		assert registry.get_team_logins(0) == {'a'}
+		assert registry.count_players == 1 and registry.count_spectators == 1
+
+		# State changes are re-indexed.
+		b.flow.is_spectator = False
+		b.flow.team_id = 0
+		registry.update(b)
+		assert registry.count_spectators == 0
+		assert registry.get_team_logins(0) == {'a', 'b'}
+		assert not registry.get_team_logins(1)
+
+		assert registry.remove('a') is a
+		assert registry.remove('a') is None
+		assert registry.get_by_id(1) is None
+		assert registry.logins == {'b'}
+
+	def test_snapshots(self):
+		registry = OnlineRegistry()
+		a = self.create_player('a', 1)
+		registry.add(a)
+
+		# The snapshots are shared until the players change.
+		players, logins = registry.players, registry.logins
+		assert registry.players is players
+		a.flow.is_spectator = True
+		registry.update(a)
+		assert registry.logins is logins
+		assert registry.spectator_logins == {'a'}
+
+		registry.add(self.create_player('b', 2))
+		assert registry.logins is not logins
+		assert registry.logins == {'a', 'b'}
+		assert logins == {'a'}
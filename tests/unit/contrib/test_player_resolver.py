@@ -0,0 +1,81 @@
+import asyncio
+import asynctest
+
+from pyplanet.apps.core.maniaplanet.models import Player
+from pyplanet.contrib.player.resolver import PlayerResolver
+
+
+class TestPlayerResolver(asynctest.TestCase):
+	def setUp(self):
+		self.queries = list()
+		self.known = dict(a=Player(login='a'), b=Player(login='b'))
+		for login in ('a', 'b', 'c', 'bot'):
+			if login in Player.CACHE:
+				del Player.CACHE[login]
+
+	async def get_by_login(self, login, default=None):
+		self.queries.append([login])
+		await asyncio.sleep(0.01)
+		return self.known.get(login, default)
+
+	async def execute(self, query):
+		self.queries.append(sorted(query.logins))
+		return [self.known[login] for login in query.logins if login in self.known]
+
+	def select(self):
+		class Query:
+			def where(self, expression):
+				self.logins = expression.rhs
+				return self
+		return Query()
+
+	async def test_single_flight(self):
+		resolver = PlayerResolver(missing_ttl=10, connect_timeout=0)
+		with asynctest.patch.object(Player, 'get_by_login', self.get_by_login):
+			players = await asyncio.gather(*[resolver.get('a') for _ in range(5)])
+			assert all(player is self.known['a'] for player in players)
+			assert self.queries == [['a']]
+			assert not resolver.pending
+
+			# The unknown login is remembered, no query for the next lookups.
+			assert await resolver.get('bot') is None
+			assert await resolver.get('bot') is None
+			assert self.queries == [['a'], ['bot']]
+			assert resolver.is_missing('bot')
+
+	async def test_wait_connect(self):
+		resolver = PlayerResolver(missing_ttl=10, connect_timeout=1)
+		player = Player(login='c')
+		with asynctest.patch.object(Player, 'get_by_login', self.get_by_login):
+			lookup = asyncio.ensure_future(resolver.get('c'))
+			await asyncio.sleep(0.02)
+			assert not lookup.done()
+
+			resolver.connected('c', player)
+			assert await lookup is player
+			assert not resolver.is_missing('c')
+			assert not resolver.waiters
+
+			resolver.connect_timeout = 0.01
+			assert await resolver.get('bot') is None
+
+	async def test_get_many(self):
+		resolver = PlayerResolver(missing_ttl=10, connect_timeout=0)
+		Player.CACHE['b'] = self.known['b']
+		with asynctest.patch.object(Player, 'select', self.select), asynctest.patch.object(Player, 'execute', self.execute):
+			players = await resolver.get_many(['a', 'b', 'bot', 'c'])
+		assert players == dict(a=self.known['a'], b=self.known['b'])
+		assert self.queries == [['a', 'bot', 'c']]
+		assert resolver.is_missing('bot') and resolver.is_missing('c')
+
+	async def test_missing_no_wait(self):
+		resolver = PlayerResolver(missing_ttl=10, connect_timeout=4)
+		with asynctest.patch.object(Player, 'get_by_login', self.get_by_login):
+			assert await resolver.get('bot', wait=False) is None
+
+			# The known missing logins don't wait for the connect timeout.
+			started_at = self.loop.time()
+			assert await resolver.get('bot') is None
+			assert await resolver.get_many(['bot']) == dict()
+			assert self.loop.time() - started_at < 1
+		assert self.queries == [['bot']]
@@ -0,0 +1,115 @@
+import asyncio
+import shutil
+import tempfile
+
+import asyncssh
+import asynctest
+
+from pyplanet.core.storage.drivers.asyncssh import SFTPDriver
+from pyplanet.core.storage.exceptions import StorageException
+
+
+class StandInServer(asyncssh.SSHServer):
+	def begin_auth(self, username):
+		return True
+
+	def password_auth_supported(self):
+		return True
+
+	def validate_password(self, username, password):
+		return username == 'pyplanet' and password == 'pyplanet'
+
+
+class TestSFTPDriver(asynctest.TestCase):
+	async def setUp(self):
+		self.root = tempfile.mkdtemp()
+		self.server = await asyncssh.listen(
+			'127.0.0.1', 0, server_factory=StandInServer,
+			server_host_keys=[asyncssh.generate_private_key('ssh-rsa')],
+			sftp_factory=lambda conn: asyncssh.SFTPServer(conn, chroot=self.root),
+		)
+		self.driver = SFTPDriver(None, dict(
+			HOST='127.0.0.1', PORT=self.server.sockets[0].getsockname()[1], USERNAME='pyplanet', PASSWORD='pyplanet',
+			POOL_SIZE=2, MAX_TRANSFERS=2, CHUNK_SIZE=1024, KWARGS=dict(known_hosts=None),
+		))
+
+	async def tearDown(self):
+		await self.driver.close()
+		self.server.close()
+		await self.server.wait_closed()
+		shutil.rmtree(self.root)
+
+	async def test_persistent_connection(self):
+		await self.driver.touch('file.txt')
+		assert await self.driver.exists('file.txt') is True
+		assert await self.driver.is_file('file.txt') is True
+		assert await self.driver.is_dir('file.txt') is False
+		assert 'file.txt' in await self.driver.listdir('.')
+
+		# All sequential operations should have been executed over a single connection.
+		assert self.driver._connections == 1
+		assert len(self.driver._idle) == 1
+
+	async def test_open_read_write(self):
+		content = b'PyPlanet' * 1024
+
+		async with self.driver.open('map.Map.Gbx', 'wb') as fh:
+			await fh.write(content)
+		async with self.driver.open('map.Map.Gbx', 'rb') as fh:
+			assert await fh.read() == content
+
+	async def test_stat_cache(self):
+		assert await self.driver.exists('cached.txt') is False
+
+		# Writing through the driver invalidates the cached result.
+		await self.driver.touch('cached.txt')
+		assert await self.driver.exists('cached.txt') is True
+
+		await self.driver.remove('cached.txt')
+		assert await self.driver.exists('cached.txt') is False
+
+	async def test_broken_connection(self):
+		await self.driver.touch('file.txt')
+		connection = self.driver._idle[0]
+		connection.ssh.close()
+		await connection.ssh.wait_closed()
+
+		# The closed connection should be replaced by a new one.
+		assert await self.driver.exists('file.txt') is True
+		assert self.driver._idle[0] is not connection
+		assert self.driver._connections == 1
+
+	async def test_nested_open(self):
+		driver = SFTPDriver(None, dict(self.driver.config, POOL_SIZE=1, MAX_TRANSFERS=1))
+		try:
+			await driver.touch('a.txt')
+
+			# A nested operation of the same task shares the connection and transfer slot, instead of waiting for them.
+			async with driver.open('a.txt', 'rb'):
+				async with driver.open('b.txt', 'wb') as fh:
+					await fh.write(b'PyPlanet')
+				assert await driver.exists('b.txt') is True
+			assert driver._connections == 1
+			assert not driver._held and not driver._transferring
+		finally:
+			await driver.close()
+
+	async def test_close(self):
+		driver = SFTPDriver(None, dict(self.driver.config, POOL_SIZE=1))
+		await driver.touch('file.txt')
+
+		async with driver.connect_sftp():
+			connection = next(iter(driver._all))
+			waiter = asyncio.ensure_future(driver.exists('file.txt'))
+			await asyncio.sleep(0.01)
+
+			# The connections in use are closed, the waiting operations fail.
+			await driver.close()
+			assert connection.closed
+			with self.assertRaises(StorageException):
+				await waiter
+		assert driver._connections == 0 and not driver._idle
+
+		# The pool can be used again.
+		assert await driver.exists('file.txt') is True
+		await driver.close()
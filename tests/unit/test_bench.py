@@ -0,0 +1,34 @@
+import io
+
+import asynctest
+
+from pyplanet.conf import settings
+from pyplanet.core.management.commands.bench import Command
+
+
+class TestBenchCommand(asynctest.TestCase):
+	def setUp(self):
+		settings._setup()
+		self.dedicated = dict(settings.DEDICATED)
+		self.databases = dict(settings.DATABASES)
+
+	def tearDown(self):
+		settings.DEDICATED.clear()
+		settings.DEDICATED.update(self.dedicated)
+		settings.DATABASES.clear()
+		settings.DATABASES.update(self.databases)
+
+	def test_default_options(self):
+		# Runs on the database of the pool.
+		stdout, stderr = io.StringIO(), io.StringIO()
+		command = Command(stdout=stdout, stderr=stderr, no_color=True)
+		command.run_from_argv([
+			'manage.py', 'bench', '--pool', 'default', '--players', '3', '--rounds', '1', '--checkpoints', '2',
+			'--maps', '3', '--timeout', '30',
+		])
+
+		assert settings.DATABASES['default'] == self.databases['default']
+		output = stdout.getvalue()
+		assert 'Benchmark results:' in output
+		assert 'Callbacks handled:' in output
+		assert 'Not all callbacks have been handled' not in stderr.getvalue()
@@ -58,3 +58,19 @@ class TestMigrations(asynctest.TestCase):
 		with instance.db.allow_sync():
 			await instance.db.migrator.migrate()
 		assert len(instance.db.migrator.pass_migrations) == 0
+
+	async def test_db_migration_fingerprint(self):
+		instance = Controller.prepare(name='default').instance
+		await instance.db.connect()
+		await instance.apps.discover()
+		await instance.db.initiate()
+
+		with instance.db.allow_sync():
+			fingerprints = [row.fingerprint for row in migration.MigrationFingerprint.select()]
+		assert fingerprints == [instance.db.migrator.get_fingerprint()]
+
+		# Nothing changed, the next migrate shouldn't check the tables or the migrations.
+		with asynctest.patch.object(instance.db.migrator, 'create_tables') as create_tables:
+			with instance.db.allow_sync():
+				await instance.db.migrator.migrate()
+			assert not create_tables.called
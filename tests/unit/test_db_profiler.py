@@ -0,0 +1,55 @@
+import asyncio
+
+import asynctest
+
+from pyplanet.core.db.profiler import QueryProfiler
+
+
+class FakeQuery:
+	model_class = None
+
+	def __init__(self, sql):
+		self._sql = sql
+
+	def sql(self):
+		return self._sql, []
+
+
+class TestQueryProfiler(asynctest.TestCase):
+	async def setUp(self):
+		self.profiler = QueryProfiler()
+
+	async def execute(self, sql, result=None, delay=0):
+		async def coro():
+			await asyncio.sleep(delay)
+			return result
+		return await self.profiler.profile(FakeQuery(sql), coro())
+
+	async def test_n_plus_one(self):
+		self.profiler.configure(n_plus_one_threshold=3)
+
+		async def receiver():
+			for nr in range(5):
+				await self.execute('SELECT * FROM player WHERE id = ?', nr)
+			await self.execute('SELECT * FROM map')
+
+		scope = self.profiler.enter(receiver)
+		with self.assertLogs('pyplanet.core.db.profiler', level='WARNING') as logs:
+			await receiver()
+		self.profiler.leave(scope)
+
+		assert len(logs.output) == 1
+		assert 'Possible N+1' in logs.output[0]
+		assert scope.counts['SELECT * FROM player WHERE id = ?'] == 5
+		assert not self.profiler.scopes
+
+	async def test_disabled(self):
+		assert self.profiler.enter(self.test_disabled) is None
+		assert await self.execute('SELECT 1', result=1) == 1
+
+	async def test_slow_query(self):
+		self.profiler.configure(slow_query_threshold=0.01)
+		with self.assertLogs('pyplanet.core.db.profiler', level='WARNING') as logs:
+			await self.execute('SELECT * FROM localrecord', delay=0.02)
+		assert 'Slow query' in logs.output[0]
+		assert 'SELECT * FROM localrecord' in logs.output[0]
@@ -0,0 +1,67 @@
+import asyncio
+import os
+import tempfile
+
+import asynctest
+
+from pyplanet.core.gbx.dedicated import FakeDedicated
+from pyplanet.core.gbx.recorder import read_recording, DIRECTION_IN, DIRECTION_OUT
+from pyplanet.core.gbx.remote import GbxRemote
+
+
+class TestFakeDedicated(asynctest.TestCase):
+	async def setUp(self):
+		self.recording = os.path.join(tempfile.mkdtemp(), 'traffic.gbxrec')
+		self.dedicated = FakeDedicated(maps=3)
+		await self.dedicated.start()
+		self.remote = GbxRemote(
+			'127.0.0.1', self.dedicated.port, user='SuperAdmin', password='SuperAdmin', record_traffic=self.recording
+		)
+
+		self.callbacks = list()
+
+		async def handle_callback(handle_nr, method, data):
+			self.callbacks.append((method, data))
+		self.remote.handle_callback = handle_callback
+
+	async def tearDown(self):
+		await self.remote.disconnect()
+		await self.dedicated.close()
+		os.remove(self.recording)
+
+	async def test_connect(self):
+		await self.remote.connect()
+		assert 'GetMapList' in self.remote.gbx_methods
+		assert self.remote.dedicated_build is not None
+
+		maps, info = await asyncio.gather(
+			self.remote.execute('GetMapList', -1, 0),
+			self.remote.execute('GetCurrentMapInfo'),
+		)
+		assert len(maps) == 3
+		assert info['UId'] == maps[0]['UId']
+
+		results = await self.remote.execute('system.multicall', [
+			{'methodName': 'GetMaxPlayers', 'params': []}, {'methodName': 'GetHideServer', 'params': []}
+		])
+		assert results == [[dict(CurrentValue=255, NextValue=255)], [0]]
+
+	async def test_record_and_replay(self):
+		await self.remote.connect()
+		await self.dedicated.connect_players(5)
+		for _ in range(50):
+			if len(self.callbacks) == 5:
+				break
+			await asyncio.sleep(0.01)
+		assert [data[0] for method, data in self.callbacks] == list(self.dedicated.players)
+		self.remote.recorder.close()
+
+		frames = list(read_recording(self.recording))
+		assert any(f.direction == DIRECTION_OUT for f in frames)
+		assert len([f for f in frames if f.direction == DIRECTION_IN and f.handle < 0x80000000]) == 5
+
+		# The recording should give the callbacks to replay and the responses to reuse.
+		replayed = FakeDedicated()
+		callbacks = replayed.load_recording(self.recording)
+		assert len(callbacks) == 5
+		assert 'GetVersion' in replayed.recorded_responses
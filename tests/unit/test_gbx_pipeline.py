@@ -0,0 +1,109 @@
+import asyncio
+import asynctest
+
+from pyplanet.core.gbx.dedicated import FakeDedicated
+from pyplanet.core.gbx.pipeline import CallbackPipeline, get_callback_key
+from pyplanet.core.gbx.remote import GbxRemote
+
+
+class TestCallbackPipeline(asynctest.TestCase):
+	async def test_order(self):
+		pipeline = CallbackPipeline(concurrency=2, loop=self.loop)
+		handled = list()
+		running = list()
+
+		async def handler(login, nr):
+			running.append(login)
+			assert len(running) <= 2
+			await asyncio.sleep(0.01 if nr == 0 else 0)
+			handled.append((login, nr))
+			running.remove(login)
+
+		for nr in range(3):
+			for login in ('a', 'b', 'c'):
+				await pipeline.put(('player', login), 'Test', handler, login, nr)
+		while pipeline.depth or pipeline.running:
+			await asyncio.sleep(0.01)
+
+		# The callbacks of each player are handled in order.
+		for login in ('a', 'b', 'c'):
+			assert [nr for l, nr in handled if l == login] == [0, 1, 2]
+		assert not pipeline.queues
+
+	async def test_policies(self):
+		pipeline = CallbackPipeline(max_size=2, concurrency=1, loop=self.loop, policies={
+			'Drop': 'drop', 'Coalesce': 'coalesce',
+		})
+		handled = list()
+		blocker = asyncio.Event()
+
+		async def handler(nr):
+			await blocker.wait()
+			handled.append(nr)
+
+		await pipeline.put('running', 'Test', handler, 0)
+		await pipeline.put('family', 'Coalesce', handler, 1)
+		await pipeline.put('family', 'Coalesce', handler, 2)
+		assert pipeline.depth == 1
+
+		await pipeline.put('other', 'Test', handler, 3)
+		assert pipeline.full
+		assert await pipeline.put('other', 'Drop', handler, 4) is False
+
+		# The reader waits for space when the queue is full (backpressure).
+		put = asyncio.ensure_future(pipeline.put('other', 'Test', handler, 5))
+		await asyncio.sleep(0.01)
+		assert not put.done()
+		blocker.set()
+		await put
+		while pipeline.depth or pipeline.running:
+			await asyncio.sleep(0.01)
+		assert handled == [0, 2, 3, 5]
+
+	async def test_shared_future(self):
+		dedicated = FakeDedicated(maps=3)
+		await dedicated.start()
+		remote = GbxRemote(
+			'127.0.0.1', dedicated.port, user='SuperAdmin', password='SuperAdmin', callback_queue_size=1,
+			callback_concurrency=1
+		)
+		handled = list()
+
+		async def load():
+			# Started outside of the callback handlers, queries when the reader waits for space in the queue.
+			while remote.pipeline._space is None:
+				await asyncio.sleep(0.01)
+			return await remote.execute('GetMaxPlayers', timeout=5)
+		shared = None
+
+		async def handle_callback(handle_nr, method, data):
+			await shared
+			handled.append(data[0])
+		remote.handle_callback = handle_callback
+
+		try:
+			await remote.connect()
+			shared = asyncio.ensure_future(load())
+			await dedicated.connect_players(5)
+
+			# The reader keeps reading the responses while the handlers wait for the shared future.
+			assert await asyncio.wait_for(asyncio.shield(shared), 5) == dict(CurrentValue=255, NextValue=255)
+			for _ in range(100):
+				if len(handled) == 5:
+					break
+				await asyncio.sleep(0.01)
+			assert handled == list(dedicated.players)
+		finally:
+			await remote.disconnect()
+			await dedicated.close()
+
+	def test_key(self):
+		assert get_callback_key('ManiaPlanet.PlayerConnect', ['test', False]) == ('player', 'test')
+		assert get_callback_key('ManiaPlanet.PlayerInfoChanged', dict(Login='test')) == ('player', 'test')
+		assert get_callback_key('Script.Trackmania.Event.WayPoint', [
+			'Trackmania.Event.WayPoint', '{"time": 1, "login": "test", "racetime": 1000}'
+		]) == ('player', 'test')
+		assert get_callback_key('Script.Trackmania.Scores', [
+			'Trackmania.Scores', '{"players": [{"login": "test"}]}'
+		]) == 'Script.Trackmania.Scores'
+		assert get_callback_key('ManiaPlanet.BeginMap', [dict(UId='x')]) == 'ManiaPlanet.BeginMap'
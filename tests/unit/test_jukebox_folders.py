@@ -0,0 +1,70 @@
+import asynctest
+import datetime
+
+from pyplanet.apps.contrib.jukebox.folders import FolderManager
+from pyplanet.apps.core.maniaplanet.models import Map
+
+
+class FakeApp:
+	def __init__(self, maps):
+		self.instance = asynctest.Mock()
+		self.instance.map_manager.maps = maps
+		self.instance.apps.apps = dict(local_records=object(), karma=object())
+		self.setting_newest_days_range = asynctest.Mock()
+		self.setting_newest_days_range.get_value = asynctest.CoroutineMock(return_value=14)
+
+
+class TestFolderIndex(asynctest.TestCase):
+	def create_map(self, map_id, record=None, karma=0, votes=0, days_ago=30):
+		map = Map(
+			id=map_id, uid='uid-{}'.format(map_id), name='Map {}'.format(map_id), author_login='author',
+			created_at=datetime.datetime.now() - datetime.timedelta(days=days_ago)
+		)
+		map.local = dict(
+			first_record=asynctest.Mock(score=record) if record is not None else None,
+			record_count=1 if record is not None else 0,
+		)
+		map.karma = dict(map_karma=karma, vote_count=votes)
+		return map
+
+	async def setUp(self):
+		self.maps = [
+			self.create_map(1, record=20000, karma=2, votes=2, days_ago=1),
+			self.create_map(2, record=70000, karma=-1, votes=1),
+			self.create_map(3),
+		]
+		self.app = FakeApp(self.maps)
+		self.manager = FolderManager(self.app)
+		await self.manager.update_folders()
+
+	async def get_folder_map_ids(self, folder_id):
+		_, maps, _, _ = await self.manager.get_folder_code_contents(dict(id=folder_id))
+		return [m.id for m in maps]
+
+	async def test_index(self):
+		assert await self.get_folder_map_ids('newest') == [1]
+		assert await self.get_folder_map_ids('local_none') == [3]
+		assert await self.get_folder_map_ids('length_shorter_30s') == [1]
+		assert await self.get_folder_map_ids('length_longer_60s') == [2]
+		assert await self.get_folder_map_ids('karma_none') == [3]
+		assert await self.get_folder_map_ids('karma_positive') == [1]
+		assert await self.get_folder_map_ids('karma_negative') == [2]
+		assert await self.get_folder_map_ids('karma_undecided') == [3]
+
+	async def test_update_map(self):
+		# Only the folders of the updated map change.
+		self.maps[2].karma = dict(map_karma=1, vote_count=1)
+		self.manager.update_map_index(self.maps[2])
+		assert await self.get_folder_map_ids('karma_positive') == [1, 3]
+		assert await self.get_folder_map_ids('karma_none') == []
+		assert await self.get_folder_map_ids('karma_undecided') == []
+
+	async def test_map_list_changed(self):
+		# Replacing a map keeps the length of the list, the index is only rebuilt when invalidated.
+		self.maps[1] = self.create_map(4, days_ago=2)
+		assert await self.get_folder_map_ids('newest') == [1]
+
+		self.manager.invalidate_index()
+		assert await self.get_folder_map_ids('newest') == [1, 4]
+		assert await self.get_folder_map_ids('length_longer_60s') == []
+		assert await self.get_folder_map_ids('local_none') == [4, 3]
@@ -0,0 +1,91 @@
+import asynctest
+
+from pyplanet.apps.contrib.jukebox.rows import MapRowStore
+from pyplanet.apps.core.maniaplanet.models import Map, Player
+
+
+class FakeLocalRecords:
+	def __init__(self):
+		self.ranks = dict()
+		self.calls = list()
+
+	async def get_player_records_and_ranks(self, player, maps=None):
+		self.calls.append((player.login, sorted(maps) if maps is not None else None))
+		return {
+			map_id: record for map_id, record in self.ranks.get(player.login, dict()).items()
+			if maps is None or map_id in maps
+		}
+
+
+class FakeApp:
+	def __init__(self, maps):
+		self.local_records = FakeLocalRecords()
+		self.instance = asynctest.Mock()
+		self.instance.map_manager.maps = maps
+		self.instance.apps.apps = dict(local_records=self.local_records)
+		self.folder_manager = asynctest.Mock()
+		self.folder_manager.maps_by_id = dict()
+
+
+class TestMapRowStore(asynctest.TestCase):
+	def setUp(self):
+		self.maps = [
+			Map(id=map_id, uid='uid-{}'.format(map_id), name='$fffMap {}'.format(map_id), author_login='author')
+			for map_id in range(1, 4)
+		]
+		self.app = FakeApp(self.maps)
+		self.store = MapRowStore(self.app)
+		self.player_a = Player(login='a')
+		self.player_b = Player(login='b')
+
+	def test_rows(self):
+		rows = self.store.get_rows()
+		assert [row['id'] for row in rows] == [1, 2, 3]
+		assert rows[0]['search_name'] == 'map 1'
+		assert rows[0]['local_record_rank'] is None
+
+		# The rows are shared until the map list changes.
+		self.maps.append(Map(id=4, uid='uid-4', name='Map 4', author_login='author'))
+		assert self.store.get_rows() is rows
+		self.store.invalidate()
+		assert [row['id'] for row in self.store.get_rows()] == [1, 2, 3, 4]
+
+	async def test_player_rows(self):
+		self.app.local_records.ranks = dict(a={1: (1, 1000)}, b={1: (2, 1200), 2: (1, 3000)})
+		self.maps[0].local = dict(first_record=asynctest.Mock(score=1000))
+		self.store.refresh()
+
+		rows_a = await self.store.get_player_rows(self.player_a)
+		rows_b = await self.store.get_player_rows(self.player_b)
+		assert rows_a[0]['local_record_rank'] == 1 and rows_a[1]['local_record_rank'] is None
+		assert rows_b[0]['local_record_rank'] == 2 and rows_b[0]['local_record_diff'] == 200
+		assert self.store.get_rows()[0]['local_record_rank'] is None
+
+		# Cached per player.
+		assert await self.store.get_player_rows(self.player_a) is rows_a
+		assert len(self.app.local_records.calls) == 2
+
+	async def test_update_map(self):
+		self.app.local_records.ranks = dict(a={1: (1, 1000), 2: (1, 2000)}, b={1: (2, 1200)})
+		rows_a = await self.store.get_player_rows(self.player_a)
+		await self.store.get_player_rows(self.player_b)
+		self.app.local_records.calls.clear()
+
+		# Player b beats player a on the first map, only the row of the updated map is fetched again.
+		self.app.local_records.ranks = dict(a={1: (2, 1000), 2: (1, 2000)}, b={1: (1, 900)})
+		self.maps[0].local = dict(first_record=asynctest.Mock(score=900))
+		self.store.update_map(self.maps[0])
+
+		assert await self.store.get_player_rows(self.player_a) is rows_a
+		assert rows_a[0]['local_record_rank'] == 2 and rows_a[0]['local_record_diff'] == 100
+		assert rows_a[1]['local_record_rank'] == 1
+		rows_b = await self.store.get_player_rows(self.player_b)
+		assert rows_b[0]['local_record_rank'] == 1
+		assert self.app.local_records.calls == [('a', [1]), ('b', [1])]
+
+		# Nothing is fetched when nothing changed.
+		await self.store.get_player_rows(self.player_a)
+		assert len(self.app.local_records.calls) == 2
+
+		self.store.forget_player('a')
+		assert 'a' not in self.store.player_rows
@@ -0,0 +1,67 @@
+import asynctest
+
+from pyplanet.apps.contrib.karma.stats import MapKarma
+from pyplanet.core import Controller
+
+
+class TestMapKarma(asynctest.TestCase):
+	def test_distribution(self):
+		stats = MapKarma({1: 3, -1: 1, 0.5: 2})
+		assert stats.vote_count == 6
+		assert stats.map_karma == 3
+		assert stats.positive_count == 5 and stats.negative_count == 1
+		assert stats.positive == 4 and stats.negative == 1
+		assert stats.percentage == 0.8
+
+		# A changed vote moves between the scores, the removed scores disappear.
+		stats.change(-1, 1)
+		assert stats.distribution == {1.0: 4, 0.5: 2}
+		assert stats.map_karma == 5
+		assert stats.as_dict()['negative_count'] == 0
+
+		assert MapKarma().percentage == 0
+		assert MapKarma().as_dict()['vote_count'] == 0
+
+
+class TestKarmaAggregation(asynctest.TestCase):
+	async def test_aggregate(self):
+		instance = Controller.prepare(name='default').instance
+		await instance.db.connect()
+		await instance.apps.discover()
+		await instance.db.initiate()
+
+		from pyplanet.apps.core.maniaplanet.models import Player, Map
+		from pyplanet.apps.contrib.karma.models import Karma
+
+		players = list()
+		for login in ('karma-1', 'karma-2', 'karma-3'):
+			try:
+				players.append(await Player.get(login=login))
+			except:
+				players.append(await Player.create(login=login, nickname=login))
+		maps = list()
+		for uid in ('karma-map-1', 'karma-map-2', 'karma-map-3'):
+			try:
+				maps.append(await Map.get(uid=uid))
+			except:
+				maps.append(await Map.create(uid=uid, name=uid, file='', author_login='karma-1'))
+		await Karma.execute(Karma.delete().where(Karma.map << [m.get_id() for m in maps]))
+
+		votes = [
+			(maps[0], players[0], 1, None), (maps[0], players[1], 1, None), (maps[0], players[2], -1, None),
+			(maps[1], players[0], 1, 0.5), (maps[1], players[1], -1, -0.5), (maps[1], players[2], 1, 0.5),
+		]
+		for map, player, score, expanded_score in votes:
+			await Karma.create(map=map, player=player, score=score, expanded_score=expanded_score)
+
+		# The grouped query gives the same statistics as adding the votes one by one.
+		stats = await instance.apps.apps['karma'].aggregate_map_stats([m.get_id() for m in maps])
+		for map in maps:
+			expected = MapKarma()
+			for vote in await Karma.execute(Karma.select().where(Karma.map == map.get_id())):
+				expected.add(MapKarma.vote_score(vote))
+			assert stats[map.get_id()].as_dict() == expected.as_dict()
+
+		assert stats[maps[0].get_id()].map_karma == 1
+		assert stats[maps[1].get_id()].distribution == {0.5: 2, -0.5: 1}
+		assert stats[maps[2].get_id()].vote_count == 0
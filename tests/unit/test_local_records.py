@@ -0,0 +1,50 @@
+import asynctest
+
+from pyplanet.core import Controller
+
+
+class TestLocalRecordRanks(asynctest.TestCase):
+	async def test_ranks(self):
+		instance = Controller.prepare(name='default').instance
+		await instance.db.connect()
+		await instance.apps.discover()
+		await instance.db.initiate()
+
+		from pyplanet.apps.core.maniaplanet.models import Player, Map
+		from pyplanet.apps.contrib.local_records.models import LocalRecord
+
+		players = list()
+		for login in ('rank-1', 'rank-2', 'rank-3', 'rank-4'):
+			try:
+				players.append(await Player.get(login=login))
+			except:
+				players.append(await Player.create(login=login, nickname=login))
+		maps = list()
+		for uid in ('rank-map-1', 'rank-map-2'):
+			try:
+				maps.append(await Map.get(uid=uid))
+			except:
+				maps.append(await Map.create(uid=uid, name=uid, file='', author_login='rank-1'))
+		await LocalRecord.execute(LocalRecord.delete().where(LocalRecord.map << [m.get_id() for m in maps]))
+
+		# Equal scores are ranked like the record list, the first record first.
+		for player, score in zip(players, (1000, 1200, 1000, 1500)):
+			await LocalRecord.create(map=maps[0], player=player, score=score)
+		await LocalRecord.create(map=maps[1], player=players[2], score=500)
+
+		app = instance.apps.apps['local_records']
+		ranks = [await app.get_player_records_and_ranks(player) for player in players]
+		assert ranks[0][maps[0].get_id()] == (1, 1000)
+		assert ranks[1][maps[0].get_id()] == (3, 1200)
+		assert ranks[2] == {maps[0].get_id(): (2, 1000), maps[1].get_id(): (1, 500)}
+		assert ranks[3][maps[0].get_id()] == (4, 1500)
+		assert maps[1].get_id() not in ranks[3]
+
+		for player in players:
+			rank, record = await app.get_player_record_and_rank_for_map(maps[0], player)
+			assert ranks[players.index(player)][maps[0].get_id()] == (rank, record.score)
+
+		# Only the given maps.
+		assert await app.get_player_records_and_ranks(players[2], maps=[maps[1].get_id()]) == {
+			maps[1].get_id(): (1, 500)
+		}
@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+import asynctest
+
+from pyplanet.core.exceptions import ImproperlyConfigured
+from pyplanet.core.loop import LagMonitor, install_loop_policy
+
+
+class TestLagMonitor(asynctest.TestCase):
+	async def test_lag_samples(self):
+		monitor = LagMonitor(interval=0.01, threshold=None)
+		monitor.start()
+		await asyncio.sleep(0.1)
+		monitor.stop()
+
+		assert monitor.stats['samples'] > 0
+		assert monitor.blocked_count == 0
+
+	async def test_blocked_loop(self):
+		monitor = LagMonitor(interval=0.01, threshold=0.05)
+		monitor.start()
+		await asyncio.sleep(0.02)
+
+		with self.assertLogs('pyplanet.core.loop', level='WARNING') as logs:
+			# Block the event loop, the watchdog should report the stack of this test while it's blocking.
+			time.sleep(0.3)
+			await asyncio.sleep(0.05)
+		monitor.stop()
+
+		assert monitor.blocked_count == 1
+		assert monitor.max_lag >= 0.2
+		assert any('test_blocked_loop' in line for line in logs.output)
+
+	async def test_policy(self):
+		assert install_loop_policy('asyncio') == 'asyncio'
+		with self.assertRaises(ImproperlyConfigured):
+			install_loop_policy('tokio')
@@ -0,0 +1,61 @@
+import os
+import tempfile
+
+import asynctest
+
+from pyplanet.core.metrics import MetricsRegistry
+from pyplanet.core.metrics.exposition import render, write_snapshot, read_snapshots
+
+
+class TestMetrics(asynctest.TestCase):
+	def setUp(self):
+		self.registry = MetricsRegistry()
+		self.calls = self.registry.counter('test_calls_total', 'Calls.', labelnames=('method',))
+		self.depth = self.registry.gauge('test_queue_depth', 'Depth.')
+		self.duration = self.registry.histogram('test_duration_seconds', 'Duration.', buckets=(0.1, 1.0))
+
+	async def test_disabled(self):
+		self.calls.inc(labels=('GetVersion',))
+		self.depth.set(10)
+		self.duration.observe(0.5)
+		assert all(not m['samples'] for m in self.registry.collect().values())
+
+	async def test_collect(self):
+		self.registry.enabled = True
+		self.calls.inc(labels=('GetVersion',))
+		self.calls.inc(2, labels=('GetVersion',))
+		self.depth.set(10)
+		self.depth.dec(3)
+		for value in (0.05, 0.5, 0.5, 5):
+			self.duration.observe(value)
+
+		# Registering the same metric again gives the existing metric.
+		assert self.registry.counter('test_calls_total', 'Calls.', labelnames=('method',)) is self.calls
+
+		collected = self.registry.collect()
+		assert collected['test_calls_total']['samples'] == [[['GetVersion'], 3]]
+		assert collected['test_queue_depth']['samples'] == [[[], 7]]
+		assert collected['test_duration_seconds']['samples'][0][1] == [1, 2, 1, 6.05]
+
+	async def test_exposition(self):
+		self.registry.enabled = True
+		self.calls.inc(labels=('GetVersion',))
+		for value in (0.05, 0.5, 5):
+			self.duration.observe(value)
+
+		path = tempfile.mkdtemp()
+		write_snapshot(self.registry, 'default', path=path)
+		write_snapshot(self.registry, 'second', path=path)
+		snapshots = read_snapshots(pools=['default', 'second', 'offline'], path=path)
+		assert list(sorted(snapshots.keys())) == ['default', 'second']
+
+		text = render(snapshots)
+		assert text.count('# TYPE test_calls_total counter') == 1
+		assert 'test_calls_total{pool="default",method="GetVersion"} 1' in text
+		assert 'test_calls_total{pool="second",method="GetVersion"} 1' in text
+		assert 'test_duration_seconds_bucket{pool="default",le="1"} 2' in text
+		assert 'test_duration_seconds_bucket{pool="default",le="+Inf"} 3' in text
+		assert 'test_duration_seconds_count{pool="default"} 3' in text
+
+		for pool in snapshots:
+			os.remove(os.path.join(path, '{}.json'.format(pool)))
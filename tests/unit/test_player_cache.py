@@ -0,0 +1,57 @@
+import asynctest
+
+from pyplanet.apps.core.maniaplanet.models.player import PlayerCache, PlayerFlow, PlayerAttributes
+
+
+class TestPlayerCache(asynctest.TestCase):
+	def test_eviction(self):
+		cache = PlayerCache(max_size=3)
+		for login in ('a', 'b', 'c'):
+			cache[login] = login.upper()
+
+		# Using 'a' makes 'b' the least recently used player.
+		assert cache.get('a') == 'A'
+		cache['d'] = 'D'
+		assert 'b' not in cache
+		assert list(cache) == ['c', 'a', 'd']
+		assert cache.stats['evictions'] == 1
+
+	def test_pinned(self):
+		cache = PlayerCache(max_size=2)
+		cache['a'] = 'A'
+		cache.pin('a')
+		cache.pin('b', 'B')
+
+		# Online (pinned) players are never evicted, even when the cache is full.
+		cache['c'] = 'C'
+		assert 'a' in cache and 'b' in cache
+		assert 'c' not in cache
+
+		cache.unpin('a')
+		assert len(cache) == 2
+		cache['d'] = 'D'
+		assert 'a' not in cache
+		assert cache['b'] == 'B' and cache['d'] == 'D'
+
+	def test_unbounded(self):
+		cache = PlayerCache(max_size=None)
+		for nr in range(100):
+			cache[str(nr)] = nr
+		assert len(cache) == 100
+		assert cache.get('unknown') is None
+		assert cache.stats['misses'] == 1
+
+	def test_slots(self):
+		flow = PlayerFlow()
+		flow.update_state(is_spectator=True, target=None, team_id=1, player=object(), flags=101, custom_field=5)
+		assert flow.is_player is False
+		assert flow.flags == 101
+		assert flow.custom_field == 5
+		assert 'player' not in flow.other
+		with self.assertRaises(AttributeError):
+			flow.unknown_attribute = True
+
+		attributes = PlayerAttributes()
+		attributes.set('key', 'value')
+		assert attributes.get('key') == 'value'
+		assert not hasattr(attributes, '__dict__')
@@ -0,0 +1,78 @@
+import asyncio
+import asynctest
+
+from pyplanet.core.scheduler import Scheduler
+
+
+class TestScheduler(asynctest.TestCase):
+	async def test_call_later(self):
+		scheduler = Scheduler(self.loop)
+		calls = list()
+
+		async def job(name):
+			calls.append(name)
+
+		scheduler.call_later(0.02, job, 'second')
+		scheduler.call_later(0.01, lambda: calls.append('first'))
+		cancelled = scheduler.call_later(0.01, job, 'cancelled')
+		cancelled.cancel()
+
+		assert len(scheduler.get_jobs()) == 2
+		await asyncio.sleep(0.05)
+		assert calls == ['first', 'second']
+		assert not scheduler.jobs
+		assert scheduler._timer is None
+
+	async def test_call_every(self):
+		scheduler = Scheduler(self.loop)
+		calls = list()
+
+		job = scheduler.call_every(0.01, lambda: calls.append(1), delay=0)
+		await asyncio.sleep(0.045)
+		assert 3 <= len(calls) <= 5
+		assert job.pending
+
+		job.cancel()
+		count = len(calls)
+		await asyncio.sleep(0.03)
+		assert len(calls) == count
+		assert not job.pending
+
+		with self.assertRaises(ValueError):
+			scheduler.call_every(0, lambda: None)
+
+	async def test_exception(self):
+		scheduler = Scheduler(self.loop)
+		calls = list()
+
+		def failing():
+			calls.append(1)
+			raise Exception('Test')
+
+		# Recurring jobs keep running after an exception.
+		job = scheduler.call_every(0.01, failing, delay=0)
+		await asyncio.sleep(0.025)
+		job.cancel()
+		assert len(calls) >= 2
+
+	async def test_cancel_owner(self):
+		scheduler = Scheduler(self.loop)
+		started = asyncio.Event()
+
+		async def long_job():
+			started.set()
+			await asyncio.sleep(10)
+
+		running = scheduler.call_later(0, long_job, owner='app')
+		scheduler.call_every(1, lambda: None, owner='app')
+		other = scheduler.call_later(1, lambda: None, owner='other')
+		await started.wait()
+
+		# Both the pending and the running jobs are cancelled.
+		assert scheduler.cancel_owner('app') == 2
+		await asyncio.sleep(0)
+		assert running.cancelled
+		assert scheduler.get_jobs() == [other]
+
+		scheduler.stop()
+		assert not scheduler.jobs
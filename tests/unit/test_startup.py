@@ -0,0 +1,71 @@
+import asyncio
+import asynctest
+
+from collections import OrderedDict
+
+from pyplanet.core.startup import StartupTimeline, run_graph
+
+
+class TestStartupGraph(asynctest.TestCase):
+	async def test_dependencies_order(self):
+		graph = OrderedDict([
+			('root', []),
+			('node_1', ['root', 'node_2']),
+			('node_2', ['root']),
+			('node_3', ['root', 'not_in_graph']),
+		])
+		events = list()
+
+		async def target(node):
+			events.append(('start', node))
+			await asyncio.sleep(0.01)
+			events.append(('end', node))
+
+		await run_graph(graph, target)
+
+		assert events[0] == ('start', 'root')
+		assert events.index(('end', 'node_2')) < events.index(('start', 'node_1'))
+
+		# Independent nodes should run concurrently.
+		assert events.index(('start', 'node_3')) < events.index(('end', 'node_2'))
+
+	async def test_sequential(self):
+		graph = OrderedDict([('node_1', []), ('node_2', []), ('node_3', [])])
+		events = list()
+
+		async def target(node):
+			events.append(('start', node))
+			await asyncio.sleep(0)
+			events.append(('end', node))
+
+		await run_graph(graph, target, concurrent=False)
+		assert events == [
+			('start', 'node_1'), ('end', 'node_1'), ('start', 'node_2'), ('end', 'node_2'),
+			('start', 'node_3'), ('end', 'node_3'),
+		]
+
+	async def test_failure(self):
+		graph = OrderedDict([('root', []), ('child', ['root'])])
+		started = list()
+
+		async def target(node):
+			started.append(node)
+			if node == 'root':
+				raise ValueError('Failed to start')
+
+		with self.assertRaises(ValueError):
+			await run_graph(graph, target)
+		assert 'child' not in started
+
+	async def test_timeline(self):
+		timeline = StartupTimeline()
+		timeline.start()
+
+		async def target(node):
+			await asyncio.sleep(0.01 if node == 'slow' else 0)
+
+		await run_graph(OrderedDict([('fast', []), ('slow', [])]), target, timeline=timeline, prefix='apps.')
+		timeline.finish()
+
+		assert [p['name'] for p in timeline.phases] == ['apps.fast', 'apps.slow']
+		assert 'apps.slow' in timeline.report(limit=1)[1]
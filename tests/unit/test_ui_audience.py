@@ -0,0 +1,73 @@
+import asynctest
+
+from pyplanet.apps.contrib.sector_times import SectorTimes
+from pyplanet.core.ui import GlobalUIManager
+from pyplanet.core.ui.audience import SpectatorMap
+from pyplanet.core.ui.signals import spectator_target_changed
+
+
+def test_spectator_map():
+	spectators = SpectatorMap()
+	assert spectators.update('spec1', 'player1')
+	assert not spectators.update('spec1', 'player1')
+	spectators.update('spec2', 'player1')
+	spectators.update('spec3', 'player2')
+	assert spectators.get_spectators('player1') == {'spec1', 'spec2'}
+	assert spectators.get_target('spec3') == 'player2'
+
+	# Switching the target moves the spectator.
+	spectators.update('spec2', 'player2')
+	assert spectators.get_spectators('player1') == {'spec1'}
+	assert spectators.get_spectators('player2') == {'spec2', 'spec3'}
+
+	# Stop spectating (or spectating yourself).
+	spectators.update('spec1', None)
+	assert spectators.update('spec3', 'spec3')
+	assert not spectators.update('spec3', None)
+	assert spectators.get_spectators('player1') == set()
+	assert 'player1' not in spectators.spectators
+	assert spectators.get_target('spec3') is None
+
+	# Disconnect of the spectated player.
+	spectators.remove('player2')
+	assert spectators.get_target('spec2') is None
+	assert spectators.get_spectators('player2') == set()
+
+	spectators.update('spec1', 'player1')
+	spectators.clear()
+	assert not spectators.targets and not spectators.spectators
+
+
+class TestSpectatorTargetChange(asynctest.TestCase):
+	async def test_target_switch(self):
+		manager = asynctest.Mock(spectators=SpectatorMap())
+		app = asynctest.Mock()
+		app.instance.ui_manager = manager
+		app.sector_widget.display = asynctest.CoroutineMock()
+		app.cp_widget.display = asynctest.CoroutineMock()
+
+		changes = list()
+
+		async def listener(player_login, target_login, **kwargs):
+			changes.append((player_login, target_login))
+			await SectorTimes.spectator_target_changed(app, player_login, target_login)
+		spectator_target_changed.register(listener, weak=False)
+
+		try:
+			await GlobalUIManager.handle_spectator_change(manager, 'spec', True, asynctest.Mock(login='player1'))
+			await GlobalUIManager.handle_spectator_change(manager, 'spec', True, asynctest.Mock(login='player1'))
+			assert changes == [('spec', 'player1')]
+
+			# The widgets of the spectator are displayed again, comparing with the record of the new target.
+			app.sector_widget.display.reset_mock()
+			await GlobalUIManager.handle_spectator_change(manager, 'spec', True, asynctest.Mock(login='player2'))
+			assert changes[-1] == ('spec', 'player2')
+			assert SectorTimes.get_record_login(app, 'spec') == 'player2'
+			app.sector_widget.display.assert_called_once_with(audience=['spec'])
+			app.cp_widget.display.assert_called_with(audience=['spec'])
+
+			await GlobalUIManager.handle_spectator_change(manager, 'spec', False, None)
+			assert changes[-1] == ('spec', None)
+			assert SectorTimes.get_record_login(app, 'spec') == 'spec'
+		finally:
+			spectator_target_changed.unregister(listener)
@@ -0,0 +1,85 @@
+import asyncio
+import asynctest
+
+from pyplanet.core.ui.ui_properties import UIProperties
+
+RAW = (
+	'<ui_properties>'
+	'<chat visible="true" offset="0. 0." />'
+	'<map_info visible="true" pos="-160. 80. 150." />'
+	'<countdown visible="true" pos="153. -7. 5." />'
+	'</ui_properties>'
+)
+
+
+class FakeGame:
+	game = 'tm'
+
+
+class FakeInstance:
+	def __init__(self):
+		self.game = FakeGame()
+		self.calls = list()
+		self.fail = False
+
+	async def gbx(self, method, *args, **kwargs):
+		if method == 'Trackmania.UI.GetProperties':
+			return dict(raw_1=RAW)
+		self.calls.append((method, args))
+		if self.fail:
+			raise Exception('Connection lost')
+
+
+class TestUIProperties(asynctest.TestCase):
+	async def setUp(self):
+		self.instance = FakeInstance()
+		self.properties = UIProperties(self.instance)
+		await self.properties.refresh_properties()
+
+	async def test_dirty(self):
+		# Setting the current value doesn't send anything.
+		assert self.properties.set_visibility('chat', True)
+		assert not self.properties.set_visibility('unknown', False)
+		await self.properties.send_properties()
+		assert not self.instance.calls
+
+		assert self.properties.set_visibility('map_info', False)
+		await self.properties.send_properties()
+		assert len(self.instance.calls) == 1
+		xml = self.instance.calls[0][1][0]
+		assert 'map_info' in xml and 'chat' not in xml and 'countdown' not in xml
+		assert self.properties.get_visibility('map_info') is False
+
+	async def test_coalesce(self):
+		self.properties.set_visibility('map_info', False)
+		self.properties.set_visibility('countdown', False)
+		await asyncio.gather(*[self.properties.send_properties() for _ in range(3)])
+		assert len(self.instance.calls) == 1
+		xml = self.instance.calls[0][1][0]
+		assert 'map_info' in xml and 'countdown' in xml
+
+	async def test_failed_send(self):
+		self.instance.fail = True
+		self.properties.set_visibility('map_info', False)
+		await self.properties.send_properties()
+		assert self.properties._dirty == {'map_info'}
+
+		# The changes are sent with the next call.
+		self.instance.fail = False
+		self.properties.set_visibility('countdown', False)
+		await self.properties.send_properties()
+		xml = self.instance.calls[-1][1][0]
+		assert 'map_info' in xml and 'countdown' in xml
+		assert not self.properties._dirty
+
+	async def test_reapply(self):
+		self.properties.set_visibility('map_info', False)
+		self.properties.set_visibility('chat', True)
+		await self.properties.send_properties()
+
+		# The server resets the properties when the script restarts.
+		await self.properties.reapply_properties()
+		assert len(self.instance.calls) == 2
+		xml = self.instance.calls[-1][1][0]
+		assert 'map_info' in xml and 'chat' in xml and 'countdown' not in xml
+		assert self.properties.get_visibility('map_info') is False
@@ -2,7 +2,7 @@ import asynctest
 from jinja2 import Template
 
 from pyplanet.core import Controller
-from pyplanet.core.ui.template import load_template
+from pyplanet.core.ui.template import load_template, EnvironmentManager
 
 
 class TestTemplate(asynctest.TestCase):
@@ -23,3 +23,14 @@ class TestTemplate(asynctest.TestCase):
 			title='TRY_TO_SEARCH_THIS'
 		)
 		assert 'TRY_TO_SEARCH_THIS' in body
+
+	async def test_template_warmup(self):
+		instance = Controller.prepare(name='default').instance
+		await instance.db.connect()
+		await instance.apps.discover()
+		names = EnvironmentManager.list_templates()
+		assert 'core.views/generics/list.xml' in names
+
+		compiled = await EnvironmentManager.warmup(['core.views/generics/list.xml', 'core.views/generics/widget.xml'])
+		assert compiled == 2
+		assert EnvironmentManager.environment.bytecode_cache is not None
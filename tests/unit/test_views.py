@@ -3,6 +3,7 @@ import asynctest
 from pyplanet.core import Controller
 from pyplanet.views.generics import AlertView
 from pyplanet.views.generics.alert import PromptView
+from pyplanet.views.generics.list import ManualListView
 
 
 class TestGenericViews(asynctest.TestCase):
@@ -40,3 +41,109 @@ class TestGenericViews(asynctest.TestCase):
 		view = PromptView(message='TestMessage', size='lg')
 		body = await view.render()
 		assert 'TestMessage' in body
+
+	async def test_action_routing(self):
+		ui_manager = self.instance.ui_manager
+		view = AlertView(message='TestMessage', size='sm')
+		view.id = 'test__routing'
+		other = AlertView(message='TestMessage', size='sm')
+
+		ui_manager.register_route(view)
+		ui_manager.register_route(other)
+		assert ui_manager.get_manialink_by_id('test__routing') is view
+		assert ui_manager.get_manialink_by_id(other.id) is other
+
+		# Ids can contain double underscores, the answers are routed to the owner only.
+		assert ui_manager.resolve_action('test__routing__button_ok') == [view]
+		assert ui_manager.resolve_action('{}__button_ok'.format(other.id)) == [other]
+		assert ui_manager.resolve_action('test__unknown__button_ok') == []
+
+		ui_manager.unregister_route(view)
+		assert ui_manager.get_manialink_by_id('test__routing') is None
+		ui_manager.unregister_route(other)
+
+	async def test_list_routing(self):
+		ui_manager = self.instance.ui_manager
+		answers = list()
+		lists = dict()
+
+		# Every player has an own list instance, the answers go to the list shown to the player.
+		for login in ('player1', 'player2'):
+			view = lists[login] = ManualListView(data=[dict(name='test')])
+			view.subscribe('test_action', lambda player, action, values, view=view: answers.append((player.login, view)))
+			view._is_player_shown[login] = True
+			ui_manager.register_route(view)
+		assert lists['player1'].id != lists['player2'].id
+
+		for login in ('player1', 'player2'):
+			player = type('Player', (), dict(login=login))()
+			await ui_manager.handle_answer(player, '{}__test_action'.format(lists[login].id), dict())
+		assert answers == [('player1', lists['player1']), ('player2', lists['player2'])]
+
+		for view in lists.values():
+			ui_manager.unregister_route(view)
+
+	async def test_view_reaping(self):
+		ui_manager = self.instance.ui_manager
+		alert = AlertView(message='TestMessage', size='sm')
+		prompt = PromptView(message='TestMessage', size='sm')
+		widget = AlertView(message='TestMessage', size='sm')
+		widget.id = 'test__widget'
+
+		for view in (alert, prompt, widget):
+			ui_manager.register_route(view)
+			await ui_manager.track_view('player1', view)
+		await ui_manager.track_view('player2', prompt)
+
+		# Only the views with an unique id are owned by the players.
+		assert ui_manager.views.get_views('player1') == [alert, prompt]
+		assert ui_manager.views.get_idle(0) == [('player1', alert), ('player1', prompt), ('player2', prompt)]
+
+		# The views of the player are released on disconnect, the shared prompt is kept for the other player.
+		player = type('Player', (), dict(login='player1'))()
+		await ui_manager.handle_disconnect(player)
+		assert alert.response_future.cancelled()
+		assert not prompt.response_future.done()
+		assert ui_manager.get_manialink_by_id(alert.id) is None
+		assert ui_manager.get_manialink_by_id(prompt.id) is prompt
+		assert ui_manager.views.get_views('player1') == []
+
+		await ui_manager.release_views('player2', [prompt], hide=False)
+		assert prompt.response_future.cancelled()
+		assert len(ui_manager.views) == 0
+		ui_manager.unregister_route(widget)
+
+	async def test_list_reaping(self):
+		ui_manager = self.instance.ui_manager
+		view = ManualListView(data=[dict(name='test')])
+		ui_manager.register_route(view)
+		await ui_manager.track_view('player1', view)
+		assert ui_manager.views.get_views('player1') == [view]
+
+		# Lists are owned by the player, and released on disconnect.
+		player = type('Player', (), dict(login='player1'))()
+		await ui_manager.handle_disconnect(player)
+		assert ui_manager.get_manialink_by_id(view.id) is None
+		assert ui_manager.views.get_views('player1') == []
+
+	async def test_ui_batch(self):
+		ui_manager = self.instance.ui_manager
+		with asynctest.patch.object(self.instance.gbx, 'multicall') as multicall:
+			async with ui_manager.batch(logins=['player1'], deadline=5) as batch:
+				assert ui_manager.add_to_batch(['query1'], ['player1'])
+				assert not ui_manager.add_to_batch(['query2'], ['player1', 'player2'])
+				assert not ui_manager.add_to_batch(['query3'])
+
+				# The batch of the player is used before a global batch.
+				async with ui_manager.batch(deadline=5):
+					assert ui_manager.add_to_batch(['query4'], ['player2'])
+					assert ui_manager.add_to_batch(['query5'], ['player1'])
+				assert batch.queries == ['query1', 'query5']
+
+			assert multicall.call_count == 2
+			multicall.assert_called_with('query1', 'query5')
+			assert ui_manager.get_batch(['player1']) is None
+
+			# Batching disabled.
+			async with ui_manager.batch(deadline=0):
+				assert not ui_manager.add_to_batch(['query6'])
@@ -0,0 +1,65 @@
+from pyplanet.utils.checkpoints import CheckpointIndex, CheckpointTable, parse_checkpoints
+
+
+def test_parse_checkpoints():
+	assert parse_checkpoints('1000,2000,3000') == (1000, 2000, 3000)
+	assert parse_checkpoints([1000, '2000']) == (1000, 2000)
+	assert parse_checkpoints('') == tuple()
+	assert parse_checkpoints(None) == tuple()
+
+
+def test_checkpoint_index():
+	index = CheckpointIndex()
+	index.load('uid', [
+		('a', 3000, '1000,2000,3000', None),
+		('b', 3100, '900,2100,3100', None),
+		('a', 3500, '1100,2200,3500', None),
+	])
+
+	# The best record of the player is kept.
+	assert len(index) == 2
+	assert index.get('a').score == 3000
+	assert index.get_split('b', 1) == 2100
+	assert index.get_split('b', 5) is None
+	assert index.get_split('c', 0) is None
+
+	# Best split per checkpoint, over all records.
+	assert index.get_best_split(0) == (900, 'b')
+	assert index.get_best_split(1) == (2000, 'a')
+	assert index.get_best_split(3) == (None, None)
+
+	# The improved record of 'b' has a slower first split, the best split of the other players is used again.
+	index.update('b', 2900, [950, 1900, 2900])
+	assert index.get_best_split(0) == (950, 'b')
+	assert index.get_best_split(1) == (1900, 'b')
+	index.update('a', 2800, [940, 1950, 2800])
+	assert index.get_best_split(0) == (940, 'a')
+	assert index.get_best_split(1) == (1900, 'b')
+
+	index.remove('b')
+	assert index.get_best_split(1) == (1950, 'a')
+
+	index.clear()
+	assert 'a' not in index
+	assert index.map_uid is None
+
+
+def test_checkpoint_table():
+	table = CheckpointTable(sort_key=lambda entry: (-entry[0], entry[1]))
+	table['a'] = (1, 1000)
+	table['b'] = (2, 2500)
+	table['c'] = (2, 2000)
+	assert table.keys() == ['c', 'b', 'a']
+
+	# Setting the entry again moves it.
+	table['a'] = (3, 3000)
+	assert list(table) == [(3, 3000), (2, 2000), (2, 2500)]
+	assert table['a'] == (3, 3000)
+
+	assert table.pop('c') == (2, 2000)
+	assert table.pop('c', None) is None
+	assert table.keys() == ['a', 'b']
+	assert 'c' not in table and len(table) == 2
+
+	table.clear()
+	assert list(table) == []
@@ -0,0 +1,35 @@
+import logging
+
+from pyplanet.utils.log import RateLimiter, RateLimitFilter
+
+
+def test_rate_limiter():
+	limiter = RateLimiter(burst=2, interval=10)
+	assert limiter.hit('a', now=0)
+	assert limiter.hit('a', now=1)
+	assert not limiter.hit('a', now=2)
+	assert not limiter.hit('a', now=3)
+	assert limiter.hit('b', now=3)
+
+	# The suppressed events are summarized when the interval has passed.
+	assert limiter.collect(now=5) == []
+	assert limiter.collect(now=16) == [('a', 2)]
+	assert 'a' not in limiter.windows
+	assert limiter.hit('a', now=17)
+
+
+def test_rate_limit_filter():
+	limiter = RateLimiter(burst=1, interval=10)
+	log_filter = RateLimitFilter(limiter=limiter)
+
+	def record(message):
+		return logging.LogRecord('pyplanet.test', logging.ERROR, __file__, 10, message, None, None)
+
+	first = record('Error')
+	assert log_filter.filter(first)
+	assert not log_filter.filter(record('Error'))
+	assert log_filter.filter(record('Other error'))
+
+	# The decision is stored on the record, for the other handlers.
+	assert log_filter.filter(first)
+	assert len(limiter.windows) == 2